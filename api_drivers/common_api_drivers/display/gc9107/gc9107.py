@@ -44,4 +44,5 @@ class GC9107(display_driver_framework.DisplayDriver):
             y1 += 2
             y2 += 2
 
-        return display_driver_framework.DisplayDriver(self, x1, y1, x2, y2)
+        return display_driver_framework.DisplayDriver._set_memory_location(
+            self, x1, y1, x2, y2)
@@ -22,43 +22,27 @@ STATE_PWM = display_driver_framework.STATE_PWM
 BYTE_ORDER_RGB = 0x00
 BYTE_ORDER_BGR = 0x10
 
+_X1 = display_driver_framework.ADDR_X1
+_Y1 = display_driver_framework.ADDR_Y1
+_X2 = display_driver_framework.ADDR_X2
+_Y2 = display_driver_framework.ADDR_Y2
 
-class ILI9225(display_driver_framework.DisplayDriver):
 
-    def _set_memory_location(self, x1, y1, x2, y2):
-        # if self._rotation & 0x01:
-        #     x1, y1 = y1, x1
-        #     x2, y2 = y2, x2
+class ILI9225(display_driver_framework.DisplayDriver):
 
+    _ADDRESS_WINDOW = (
         # Column addresses
-        param_buf = self._param_buf
-
-        param_buf[0] = (x1 >> 8) & 0xFF
-        param_buf[1] = x1 & 0xFF
-        self._data_bus.tx_param(_HWINADDR1, self._param_mv[:2])
-
-        param_buf[0] = (x2 >> 8) & 0xFF
-        param_buf[1] = x2 & 0xFF
-        self._data_bus.tx_param(_HWINADDR2, self._param_mv[:2])
-
+        (_HWINADDR1, ((_X1, 8), (_X1, 0)), True),
+        (_HWINADDR2, ((_X2, 8), (_X2, 0)), True),
         # Page addresses
-        param_buf[0] = (y1 >> 8) & 0xFF
-        param_buf[1] = y1 & 0xFF
-        self._data_bus.tx_param(_VWINADDR1, self._param_mv[:2])
-
-        param_buf[0] = (y2 >> 8) & 0xFF
-        param_buf[1] = y2 & 0xFF
-        self._data_bus.tx_param(_VWINADDR2, self._param_mv[:2])
-
-        param_buf[0] = (x1 >> 8) & 0xFF
-        param_buf[1] = x1 & 0xFF
-        self._data_bus.tx_param(_RAMADDRSET1, self._param_mv[:2])
-
-        param_buf[0] = (y1 >> 8) & 0xFF
-        param_buf[1] = y1 & 0xFF
-        self._data_bus.tx_param(_RAMADDRSET2, self._param_mv[:2])
-
-        return _RAMWR
+        (_VWINADDR1, ((_Y1, 8), (_Y1, 0)), True),
+        (_VWINADDR2, ((_Y2, 8), (_Y2, 0)), True),
+        # the GRAM address counter moves when writing so it has to be
+        # set every time
+        (_RAMADDRSET1, ((_X1, 8), (_X1, 0)), False),
+        (_RAMADDRSET2, ((_Y1, 8), (_Y1, 0)), False),
+    )
+    _WRITE_CMD = _RAMWR
 
     def _on_size_change(self, _):
         rotation = self._disp_drv.get_rotation()
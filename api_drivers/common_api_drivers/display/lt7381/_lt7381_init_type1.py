@@ -1194,31 +1194,31 @@ def get_backlight(self):
 
 
 def init(self):
-    self._set_reg(_PPLLC1, 0x8A)
-    self._set_reg(_PPLLC2, 0x3C)
+    self._write_reg(_PPLLC1, 0x8A)
+    self._write_reg(_PPLLC2, 0x3C)
 
-    self._set_reg(_MPLLC1, 0x8A)
-    self._set_reg(_MPLLC2, 0x84)
+    self._write_reg(_MPLLC1, 0x8A)
+    self._write_reg(_MPLLC2, 0x84)
 
-    self._set_reg(_CPLLC1, 0x8A)
-    self._set_reg(_CPLLC2, 0x84)
+    self._write_reg(_CPLLC1, 0x8A)
+    self._write_reg(_CPLLC2, 0x84)
 
-    self._set_reg(_SRR, _SSR_PLL)
+    self._write_reg(_SRR, _SSR_PLL)
     time.sleep_ms(1)  # NOQA
 
     self._pmuxr = _PMUXR_PWM1_TIMER1 | _PMUXR_PWM0_TIMER0
-    self._set_reg(_PMUXR, self._pmuxr)
+    self._write_reg(_PMUXR, self._pmuxr)
 
     self._pcfgr = _PCFGR_TIMER1_RESTART_AUTO | _PCFGR_TIMER0_RESTART_AUTO
-    self._set_reg(_PCFGR, self._pcfgr)
+    self._write_reg(_PCFGR, self._pcfgr)
 
     # SDRAM
-    self._set_reg(_SDRAR, _SDRAR_4BANKS | 0x09)
-    self._set_reg(_SDRMD, _SDRMD_CASLAT_3)
+    self._write_reg(_SDRAR, _SDRAR_4BANKS | 0x09)
+    self._write_reg(_SDRMD, _SDRMD_CASLAT_3)
 
-    self._set_reg(_SDR_REF_L, 0xE6)
-    self._set_reg(_SDR_REF_H, 0x01)
-    self._set_reg(_SDRCR, _SDRCR_INITDONE)
+    self._write_reg(_SDR_REF_L, 0xE6)
+    self._write_reg(_SDR_REF_H, 0x01)
+    self._write_reg(_SDRCR, _SDRCR_INITDONE)
 
     while self._wait_pin.value():
         time.sleep_ms(1)  # NOQA
@@ -1249,56 +1249,56 @@ def init(self):
                 'only 8 or 16 lanes is supported when using the I80Bus'
             )
 
-    self._set_reg(_CCR, ccr_flag)
+    self._write_reg(_CCR, ccr_flag)
 
     self._macr = 0x00
-    self._set_reg(_MACR, self._macr)
-    self._set_reg(_ICR, 0x00)
+    self._write_reg(_MACR, self._macr)
+    self._write_reg(_ICR, 0x00)
 
     self._dpcr = _DPCR_PCLK_INV | _DPCR_DISP_PWR | self._color_byte_order
 
-    self._set_reg(_DPCR, self._dpcr)
+    self._write_reg(_DPCR, self._dpcr)
 
-    self._set_reg(_PCSR, _PCSR_HSYNC_IDLE_HIGH | _PCSR_HSYNC_IDLE_HIGH)
+    self._write_reg(_PCSR, _PCSR_HSYNC_IDLE_HIGH | _PCSR_HSYNC_IDLE_HIGH)
 
     if self.display_width < 8:
-        self._set_reg(_HDWR, 0x00)
-        self._set_reg(_HDWFTR, self.display_width)
+        self._write_reg(_HDWR, 0x00)
+        self._write_reg(_HDWFTR, self.display_width)
     else:
-        self._set_reg(_HDWR, int(self.display_width / 8) - 1)
-        self._set_reg(_HDWFTR, (self.display_width % 8) & 0xFF)
+        self._write_reg(_HDWR, int(self.display_width / 8) - 1)
+        self._write_reg(_HDWFTR, (self.display_width % 8) & 0xFF)
 
-    self._set_reg(_VDHR_L, (self.display_height - 1) & 0xFF)
-    self._set_reg(_VDHR_H, ((self.display_height - 1) >> 8) & 0x07)
+    self._write_reg(_VDHR_L, (self.display_height - 1) & 0xFF)
+    self._write_reg(_VDHR_H, ((self.display_height - 1) >> 8) & 0x07)
 
     if _H_BACK_PORCH < 8:
-        self._set_reg(_HNDR, 0x00)
-        self._set_reg(_HNDFTR, _H_BACK_PORCH & 0xFF)
+        self._write_reg(_HNDR, 0x00)
+        self._write_reg(_HNDFTR, _H_BACK_PORCH & 0xFF)
     else:
-        self._set_reg(_HNDR, int(_H_BACK_PORCH / 8) - 1)
-        self._set_reg(_HNDFTR, (_H_BACK_PORCH % 8) & 0xFF)
+        self._write_reg(_HNDR, int(_H_BACK_PORCH / 8) - 1)
+        self._write_reg(_HNDFTR, (_H_BACK_PORCH % 8) & 0xFF)
 
     if _H_FRONT_PORCH < 8:
-        self._set_reg(_HSTR, 0x00)
+        self._write_reg(_HSTR, 0x00)
     else:
-        self._set_reg(_HSTR, int(_H_FRONT_PORCH / 8) - 1)
+        self._write_reg(_HSTR, int(_H_FRONT_PORCH / 8) - 1)
 
     if _H_PULSE_WIDTH < 8:
-        self._set_reg(_HPWR, 0x00)
+        self._write_reg(_HPWR, 0x00)
     else:
-        self._set_reg(_HPWR, int(_H_PULSE_WIDTH / 8) - 1)
+        self._write_reg(_HPWR, int(_H_PULSE_WIDTH / 8) - 1)
 
-    self._set_reg(_VNDR_L, (_V_BACK_PORCH - 1) & 0xFF)
-    self._set_reg(0x1D, ((_V_BACK_PORCH - 1) >> 8) & 0x03)
+    self._write_reg(_VNDR_L, (_V_BACK_PORCH - 1) & 0xFF)
+    self._write_reg(0x1D, ((_V_BACK_PORCH - 1) >> 8) & 0x03)
 
-    self._set_reg(_VSTR, (_V_FRONT_PORCH - 1) & 0xFF)
-    self._set_reg(_VPWR, (_V_PULSE_WIDTH - 1) & 0xFF)
+    self._write_reg(_VSTR, (_V_FRONT_PORCH - 1) & 0xFF)
+    self._write_reg(_VPWR, (_V_PULSE_WIDTH - 1) & 0xFF)
 
     if color_size == 2:
-        self._set_reg(_MPWCTR, _MPWCTR_MAIN_COLOR_16BPP)
-        self._set_reg(_AW_COLOR, _AW_COLOR_CANVAS_16BPP)
-        self._set_reg(_MPWCTR, _MPWCTR_MAIN_COLOR_16BPP)
+        self._write_reg(_MPWCTR, _MPWCTR_MAIN_COLOR_16BPP)
+        self._write_reg(_AW_COLOR, _AW_COLOR_CANVAS_16BPP)
+        self._write_reg(_MPWCTR, _MPWCTR_MAIN_COLOR_16BPP)
     else:
-        self._set_reg(_MPWCTR, _MPWCTR_MAIN_COLOR_24BPP)
-        self._set_reg(_AW_COLOR, _AW_COLOR_CANVAS_24BPP)
-        self._set_reg(_MPWCTR, _MPWCTR_MAIN_COLOR_24BPP)
+        self._write_reg(_MPWCTR, _MPWCTR_MAIN_COLOR_24BPP)
+        self._write_reg(_AW_COLOR, _AW_COLOR_CANVAS_24BPP)
+        self._write_reg(_MPWCTR, _MPWCTR_MAIN_COLOR_24BPP)
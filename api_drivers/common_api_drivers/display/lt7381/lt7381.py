@@ -19,6 +19,13 @@ STATE_HIGH = display_driver_framework.STATE_HIGH
 STATE_LOW = display_driver_framework.STATE_LOW
 STATE_PWM = display_driver_framework.STATE_PWM
 
+_X1 = display_driver_framework.ADDR_X1
+_Y1 = display_driver_framework.ADDR_Y1
+_X2 = display_driver_framework.ADDR_X2
+_Y2 = display_driver_framework.ADDR_Y2
+_WIDTH = display_driver_framework.ADDR_WIDTH
+_HEIGHT = display_driver_framework.ADDR_HEIGHT
+
 _SRR = const(0x00)
 _SSR_RST = const(0x40)
 
@@ -77,6 +84,25 @@ TYPE_ER_TFTMC050_3 = 0x01
 class LT7381(display_driver_framework.DisplayDriver):
     WAIT_TIMEOUT = 100
 
+    _ADDRESS_WINDOW = (
+        # active window start X/Y
+        (_AWUL_X_L, ((_X1, 0),), True),
+        (_AWUL_X_H, ((_X1, 8),), True),
+        (_AWUL_Y_L, ((_Y1, 0),), True),
+        (_AWUL_Y_H, ((_Y1, 8),), True),
+        # active window width and height
+        (_AW_WTH_L, ((_WIDTH, 0),), True),
+        (_AW_WTH_H, ((_WIDTH, 8),), True),
+        (_AW_HT_L, ((_HEIGHT, 0),), True),
+        (_AW_HT_H, ((_HEIGHT, 8),), True),
+        # the cursor moves when writing so it has to be set every time
+        (_CURH_L, ((_X1, 0),), False),
+        (_CURH_H, ((_X1, 8),), False),
+        (_CURV_L, ((_Y1, 0),), False),
+        (_CURV_H, ((_Y1, 8),), False),
+    )
+    _WRITE_CMD = _MRWDP
+
     def __init__(
         self,
         data_bus,
@@ -185,34 +211,12 @@ class LT7381(display_driver_framework.DisplayDriver):
         if self._reset_pin is None:
             self._write_reg(_SRR, _SSR_RST)
             time.sleep_ms(20)  # NOQA
+            # the soft reset puts the registers back to their defaults
+            self.invalidate_address_window()
         else:
             display_driver_framework.DisplayDriver.reset(self)
             time.sleep_ms(50)  # NOQA
 
-    def _set_memory_location(self, x_start, y_start, x_end, y_end):
-
-        # set active window start X/Y
-        self._write_reg(_AWUL_X_L, x_start & 0xFF)
-        self._write_reg(_AWUL_X_H, (x_start >> 8) & 0x0F)
-        self._write_reg(_AWUL_Y_L, y_start & 0xFF)
-        self._write_reg(_AWUL_Y_H, (y_start >> 8) & 0x0F)
-
-        # set active window width and height
-        width = x_end - x_start + 1
-        height = y_end - y_start + 1
-        self.set_params(_AW_WTH_L, width & 0xFF)
-        self.set_params(_AW_WTH_H, (width >> 8) & 0xFF)
-        self.set_params(_AW_HT_L, height & 0xFF)
-        self.set_params(_AW_HT_H, (height >> 8) & 0xFF)
-
-        # set cursor
-        self.set_params(_CURH_L, x_start & 0xff)
-        self.set_params(_CURH_H, (x_start >> 8) & 0xFF)
-        self.set_params(_CURV_L, y_start & 0xFF)
-        self.set_params(_CURV_H, (y_start >> 8) & 0xFF)
-
-        return _MRWDP
-
     def _flush_cb(self, _, area, color_p):
         x1 = area.x1 + self._offset_x
         x2 = area.x2 + self._offset_x
@@ -233,7 +237,8 @@ class LT7381(display_driver_framework.DisplayDriver):
         # we have to use the __dereference__ method because this method is
         # what converts from the C_Array object the binding passes into a
         # memoryview object that can be passed to the bus drivers
-        data_view = color_p.__dereference__(size)
+        data_view = color_p.__dereference__(size, self._flush_view)
+        self._flush_view = data_view
 
         self._data_bus.tx_color(cmd, data_view, x1, y1, x2, y2, self._rotation,
                                 self._disp_drv.flush_is_last())
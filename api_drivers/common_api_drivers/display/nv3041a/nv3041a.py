@@ -197,7 +197,8 @@ class NV3041A(display_driver_framework.DisplayDriver):
         height = y2 - y1 + 1
         size = width * height * lv.color_format_get_size(self._color_space)
 
-        data_view = color_p.__dereference__(size)
+        data_view = color_p.__dereference__(size, self._flush_view)
+        self._flush_view = data_view
 
         # Divide buffer in 2 chunks:
         first_chunk = int(size / 2)
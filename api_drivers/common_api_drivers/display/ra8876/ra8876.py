@@ -146,6 +146,13 @@ STATE_PWM = display_driver_framework.STATE_PWM
 BYTE_ORDER_RGB = display_driver_framework.BYTE_ORDER_RGB
 BYTE_ORDER_BGR = display_driver_framework.BYTE_ORDER_BGR
 
+_X1 = display_driver_framework.ADDR_X1
+_Y1 = display_driver_framework.ADDR_Y1
+_X2 = display_driver_framework.ADDR_X2
+_Y2 = display_driver_framework.ADDR_Y2
+_WIDTH = display_driver_framework.ADDR_WIDTH
+_HEIGHT = display_driver_framework.ADDR_HEIGHT
+
 IS42SM16160D = 0x00  # integrated silicon solution dram IC
 IS42S16320B = 0x01  # integrated silicon solution dram IC
 IS42S16400F = 0x02  # integrated silicon solution dram IC
@@ -162,6 +169,25 @@ class RA8876(display_driver_framework.DisplayDriver):
     display_name = 'RA8876'
     WAIT_TIMEOUT = 100
 
+    _ADDRESS_WINDOW = (
+        # active window start X/Y
+        (_AWUL_X0, ((_X1, 0),), True),
+        (_AWUL_X1, ((_X1, 8),), True),
+        (_AWUL_Y0, ((_Y1, 0),), True),
+        (_AWUL_Y1, ((_Y1, 8),), True),
+        # active window width and height
+        (_AW_WTH0, ((_WIDTH, 0),), True),
+        (_AW_WTH1, ((_WIDTH, 8),), True),
+        (_AW_HT0, ((_HEIGHT, 0),), True),
+        (_AW_HT1, ((_HEIGHT, 8),), True),
+        # the cursor moves when writing so it has to be set every time
+        (_CURH0, ((_X1, 0),), False),
+        (_CURH1, ((_X1, 8),), False),
+        (_CURV0, ((_Y1, 0),), False),
+        (_CURV1, ((_Y1, 8),), False),
+    )
+    _WRITE_CMD = _MRWDP
+
     def __init__(
         self,
         data_bus,
@@ -547,41 +573,3 @@ class RA8876(display_driver_framework.DisplayDriver):
         self.set_params(_DPCR, mv)
 
         display_driver_framework.DisplayDriver.init(self)
-
-    def _set_memory_location(self, x_start, y_start, x_end, y_end):
-
-        print(x_start, y_start, x_end, y_end)
-        buf = self._param_buf
-        mv = self._param_mv[:1]
-
-        # set active window start X/Y
-        buf[0] = x_start & 0xFF
-        self.set_params(_AWUL_X0, mv)
-        buf[0] = (x_start >> 8) & 0xFF
-        self.set_params(_AWUL_X1, mv)
-        buf[0] = y_start & 0xFF
-        self.set_params(_AWUL_Y0, mv)
-        buf[0] = (y_start >> 8) & 0xFF
-        self.set_params(_AWUL_Y1, mv)
-
-        # set active window width and height
-        buf[0] = (x_end - x_start) & 0xFF
-        self.set_params(_AW_WTH0, mv)
-        buf[0] = ((x_end - x_start) >> 8) & 0xFF
-        self.set_params(_AW_WTH1, mv)
-        buf[0] = (y_end - y_start) & 0xFF
-        self.set_params(_AW_HT0, mv)
-        buf[0] = ((y_end - y_start) >> 8) & 0xFF
-        self.set_params(_AW_HT1, mv)
-
-        # set cursor
-        buf[0] = x_start & 0xff
-        self.set_params(_CURH0, mv)
-        buf[0] = (x_start >> 8) & 0xFF
-        self.set_params(_CURH1, mv)
-        buf[0] = y_start & 0xFF
-        self.set_params(_CURV0, mv)
-        buf[0] = (y_start >> 8) & 0xFF
-        self.set_params(_CURV1, mv)
-
-        return _MRWDP
@@ -181,6 +181,9 @@ class SDLDisplay(display_driver_framework.DisplayDriver):
             len(frame_buffer1),
             lv.DISPLAY_RENDER_MODE.DIRECT  # NOQA
         )
+        # the bus needs to know the buffers are the size of the display to
+        # find the areas that get flushed in them
+        data_bus.set_full_frame(True)
 
         self._ignore_size_chg = False
 
@@ -226,6 +229,7 @@ class SDLDisplay(display_driver_framework.DisplayDriver):
             len(self._frame_buffer1),
             lv.DISPLAY_RENDER_MODE.DIRECT  # NOQA
         )
+        self._data_bus.set_full_frame(True)
 
         self._data_bus.set_window_size(
             hor_res, ver_res, self._cf, self._ignore_size_chg)
@@ -281,6 +285,11 @@ class SDLDisplay(display_driver_framework.DisplayDriver):
     def invert_colors(self):
         pass
 
+    def set_render_mode(self, render_mode, buffer_size=None, buffer_count=None):
+        super().set_render_mode(render_mode, buffer_size, buffer_count)
+        self._data_bus.set_full_frame(
+            render_mode != lv.DISPLAY_RENDER_MODE.PARTIAL)  # NOQA
+
     def set_rotation(self, value):
         self._disp_drv.set_rotation(value)
         self._rotation = value
@@ -198,5 +198,6 @@ class SPD2010(display_driver_framework.DisplayDriver):
         height = y2 - y1 + 1
         size = width * height * lv.color_format_get_size(self._color_space)
 
-        data_view = color_p.__dereference__(size)
+        data_view = color_p.__dereference__(size, self._flush_view)
+        self._flush_view = data_view
         self._data_bus.tx_color(self.__ramwr, data_view, x1, y1, x2, y2, self._rotation, False)
@@ -24,7 +24,7 @@ _SET_CHARGE_PUMP = const(0x8D)
 
 def init(self):
     param_buf = bytearray(1)
-    param_mv = bytearray(param_buf)
+    param_mv = memoryview(param_buf)
 
     self.set_params(_DISP_OFF)
 
@@ -149,5 +149,6 @@ class SSD1306(display_driver_framework.DisplayDriver):
         # we have to use the __dereference__ method because this method is
         # what converts from the C_Array object the binding passes into a
         # memoryview object that can be passed to the bus drivers
-        data_view = color_p.__dereference__(size)
+        data_view = color_p.__dereference__(size, self._flush_view)
+        self._flush_view = data_view
         self._data_bus.tx_color(-1, data_view, x1, y1, x2, y2, self._rotation, self._disp_drv.flush_is_last())
@@ -46,57 +46,57 @@ def init(self):
     buf = bytearray(16)
     mv = memoryview(buf)
 
-    self._reset()
+    self.reset()
 
-    self._writecommand(_SWRESET)
+    self.set_params(_SWRESET)
     time.sleep_ms(50)  # NOQA
 
-    self._writecommand(_SLPOUT)
+    self.set_params(_SLPOUT)
     time.sleep_ms(255)  # NOQA
 
     buf[:3] = bytearray([0x01, 0x2C, 0x2D])
-    self._writecommand(_FRMCTR1, mv[:3])
+    self.set_params(_FRMCTR1, mv[:3])
     time.sleep_us(10)  # NOQA
 
-    self._writecommand(_FRMCTR2, mv[:3])
+    self.set_params(_FRMCTR2, mv[:3])
     time.sleep_us(10)  # NOQA
 
-    self._writecommand(_FRMCTR3, mv[:3])
+    self.set_params(_FRMCTR3, mv[:3])
     time.sleep_us(10)  # NOQA
 
     buf[0] = 0x07
-    self._writecommand(_INVCTR, mv[:1])
+    self.set_params(_INVCTR, mv[:1])
 
     buf[:3] = bytearray([0xA2, 0x02, 0x84])
-    self._writecommand(_PWCTR1, mv[:3])
+    self.set_params(_PWCTR1, mv[:3])
     time.sleep_us(10)  # NOQA
 
     buf[0] = 0xC5
-    self._writecommand(_PWCTR2, mv[:1])
+    self.set_params(_PWCTR2, mv[:1])
 
     buf[:2] = bytearray([0x0A, 0x00])
-    self._writecommand(_PWCTR3, mv[:2])
+    self.set_params(_PWCTR3, mv[:2])
 
     buf[:2] = bytearray([0x8A, 0x2A])
-    self._writecommand(_PWCTR4, mv[:2])
+    self.set_params(_PWCTR4, mv[:2])
 
     buf[:2] = bytearray([0x8A, 0xEE])
-    self._writecommand(_PWCTR5, mv[:2])
+    self.set_params(_PWCTR5, mv[:2])
 
     buf[0] = 0x0E
-    self._writecommand(_VMCTR1, mv[:1])
+    self.set_params(_VMCTR1, mv[:1])
     time.sleep_us(10)  # NOQA
 
-    self._writecommand(_MADCTL, mv[:1])
+    self.set_params(_MADCTL, mv[:1])
     buf[0] = 0xC8
 
     buf[:16] = bytearray([0x02, 0x1c, 0x07, 0x12, 0x37, 0x32, 0x29, 0x2d,
                           0x29, 0x25, 0x2b, 0x39, 0x00, 0x01, 0x03, 0x10])
-    self._writecommand(_GMCTRP1, mv[:16])
+    self.set_params(_GMCTRP1, mv[:16])
 
     buf[:16] = bytearray([0x03, 0x1d, 0x07, 0x06, 0x2e, 0x2c, 0x29, 0x2d,
                           0x2e, 0x2e, 0x37, 0x3f, 0x00, 0x00, 0x02, 0x10])
-    self._writecommand(_GMCTRN1, mv[:16])
+    self.set_params(_GMCTRN1, mv[:16])
     time.sleep_us(10)  # NOQA
 
     color_size = lv.color_format_get_size(self._color_space)
@@ -115,8 +115,8 @@ def init(self):
 
     time.sleep_us(10)  # NOQA
 
-    self._writecommand(_NORON)
+    self.set_params(_NORON)
     time.sleep_us(10)  # NOQA
 
-    self._writecommand(_DISPON)
+    self.set_params(_DISPON)
     time.sleep_us(500)  # NOQA
@@ -1,6 +1,14 @@
 # Copyright (c) 2024 - 2025 Kevin G. Schlosser
 
 import lvgl as lv
+from micropython import const  # NOQA
+
+# from build/lv_const.py, these get looked up every time the timer fires
+_DISPLAY_ROTATION_0 = const(0)
+_DISPLAY_ROTATION_90 = const(1)
+_DISPLAY_ROTATION_180 = const(2)
+_DISPLAY_ROTATION_270 = const(3)
+_PART_ANY = const(0x0F0000)
 
 
 class AutoRotation:
@@ -67,16 +75,16 @@ class AutoRotation:
         if self._lock_rotation:
 
             if 45 <= roll < 135:
-                new_rotation = lv.DISPLAY_ROTATION._90
+                new_rotation = _DISPLAY_ROTATION_90
 
             elif 135 <= roll < 225:
-                new_rotation = lv.DISPLAY_ROTATION._180
+                new_rotation = _DISPLAY_ROTATION_180
 
             elif 225 <= roll < 315:
-                new_rotation = lv.DISPLAY_ROTATION._270
+                new_rotation = _DISPLAY_ROTATION_270
 
             else:
-                new_rotation = lv.DISPLAY_ROTATION._0
+                new_rotation = _DISPLAY_ROTATION_0
 
             if new_rotation != self._last_rotation:
                 self._last_rotation = new_rotation
@@ -84,9 +92,9 @@ class AutoRotation:
         else:
             roll = int(roll * 10.0)
 
-            if self._last_rotation != lv.DISPLAY_ROTATION._0:
-                self._last_rotation = lv.DISPLAY_ROTATION._0
-                disp.set_rotation(lv.DISPLAY_ROTATION._0)
+            if self._last_rotation != _DISPLAY_ROTATION_0:
+                self._last_rotation = _DISPLAY_ROTATION_0
+                disp.set_rotation(_DISPLAY_ROTATION_0)
 
             if roll != self._last_free_rotation:
                 self._last_free_rotation = roll
@@ -96,24 +104,24 @@ class AutoRotation:
 
                 top_layer_pivot_x = int(top_layer.get_width() / 2)
                 top_layer_pivot_y = int(top_layer.get_height() / 2)
-                top_layer.set_style_transform_pivot_x(top_layer_pivot_x, lv.PART.ANY)
-                top_layer.set_style_transform_pivot_y(top_layer_pivot_y, lv.PART.ANY)
-                top_layer.set_style_transform_rotation(roll, lv.PART.ANY)
+                top_layer.set_style_transform_pivot_x(top_layer_pivot_x, _PART_ANY)
+                top_layer.set_style_transform_pivot_y(top_layer_pivot_y, _PART_ANY)
+                top_layer.set_style_transform_rotation(roll, _PART_ANY)
 
                 sys_layer_pivot_x = int(sys_layer.get_width() / 2)
                 sys_layer_pivot_y = int(sys_layer.get_height() / 2)
-                sys_layer.set_style_transform_pivot_x(sys_layer_pivot_x, lv.PART.ANY)
-                sys_layer.set_style_transform_pivot_y(sys_layer_pivot_y, lv.PART.ANY)
-                sys_layer.set_style_transform_rotation(roll, lv.PART.ANY)
+                sys_layer.set_style_transform_pivot_x(sys_layer_pivot_x, _PART_ANY)
+                sys_layer.set_style_transform_pivot_y(sys_layer_pivot_y, _PART_ANY)
+                sys_layer.set_style_transform_rotation(roll, _PART_ANY)
 
                 bottom_layer_pivot_x = int(bottom_layer.get_width() / 2)
                 bottom_layer_pivot_y = int(bottom_layer.get_height() / 2)
-                bottom_layer.set_style_transform_pivot_x(bottom_layer_pivot_x, lv.PART.ANY)
-                bottom_layer.set_style_transform_pivot_y(bottom_layer_pivot_y, lv.PART.ANY)
-                bottom_layer.set_style_transform_rotation(roll, lv.PART.ANY)
+                bottom_layer.set_style_transform_pivot_x(bottom_layer_pivot_x, _PART_ANY)
+                bottom_layer.set_style_transform_pivot_y(bottom_layer_pivot_y, _PART_ANY)
+                bottom_layer.set_style_transform_rotation(roll, _PART_ANY)
 
                 scrn_pivot_x = int(scrn.get_width() / 2)
                 scrn_pivot_y = int(scrn.get_height() / 2)
-                scrn.set_style_transform_pivot_x(scrn_pivot_x, lv.PART.ANY)
-                scrn.set_style_transform_pivot_y(scrn_pivot_y, lv.PART.ANY)
-                scrn.set_style_transform_rotation(roll, lv.PART.ANY)
+                scrn.set_style_transform_pivot_x(scrn_pivot_x, _PART_ANY)
+                scrn.set_style_transform_pivot_y(scrn_pivot_y, _PART_ANY)
+                scrn.set_style_transform_rotation(roll, _PART_ANY)
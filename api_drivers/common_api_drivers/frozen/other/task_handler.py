@@ -6,6 +6,7 @@ import lvgl as lv  # NOQA
 import micropython  # NOQA
 import sys
 import time
+import array
 
 from machine import Timer  # NOQA
 
@@ -19,10 +20,141 @@ if sys.platform in ('pyboard', 'rp2'):
     _default_timer_id = -1
 
 
+_PROFILE_STAGES = ('started', 'render', 'flush', 'finished', 'total')
+
+
 class _DefaultUserData(object):
     pass
 
 
+class _Profiler(object):
+    # Keeps the timings of the last `size` task handler cycles in
+    # microseconds. Preallocated arrays are used so recording a cycle
+    # doesn't allocate any memory.
+
+    def __init__(self, size, overlay):
+        self.size = size
+        self.samples = [array.array('i', [0] * size) for _ in _PROFILE_STAGES]
+        self.index = 0
+        self.count = 0
+        self.dropped = 0
+
+        self.flush_time = 0
+        self._flush_start = 0
+
+        self._FLUSH_START = lv.EVENT.FLUSH_START  # NOQA
+        self._FLUSH_WAIT_START = lv.EVENT.FLUSH_WAIT_START  # NOQA
+
+        self._displays = []
+        self._flush_event_ref = self._on_flush_event
+
+        disp = lv.display_get_next(None)  # NOQA
+        while disp is not None:
+            for event in (
+                lv.EVENT.FLUSH_START,  # NOQA
+                lv.EVENT.FLUSH_FINISH,  # NOQA
+                lv.EVENT.FLUSH_WAIT_START,  # NOQA
+                lv.EVENT.FLUSH_WAIT_FINISH  # NOQA
+            ):
+                disp.add_event_cb(self._flush_event_ref, event, None)
+
+            self._displays.append(disp)
+            disp = lv.display_get_next(disp)  # NOQA
+
+        if overlay:
+            self._label = lv.label(lv.layer_sys())  # NOQA
+            self._label.align(lv.ALIGN.BOTTOM_RIGHT, 0, 0)  # NOQA
+            self._overlay_time = time.ticks_ms()  # NOQA
+        else:
+            self._label = None
+
+    def deinit(self):
+        for disp in self._displays:
+            disp.remove_event_cb_with_user_data(self._flush_event_ref, None)
+
+        self._displays = []
+
+        if self._label is not None:
+            self._label.delete()
+            self._label = None
+
+    def _on_flush_event(self, e):
+        # the flush and the wait for the flush to finish never overlap so
+        # a single start time is able to be used for both of them.
+        code = e.get_code()
+        now = time.ticks_us()  # NOQA
+
+        if code == self._FLUSH_START or code == self._FLUSH_WAIT_START:
+            self._flush_start = now
+        else:
+            self.flush_time += time.ticks_diff(now, self._flush_start)  # NOQA
+
+    def record(self, t0, t1, t2, t3):
+        # t0: cycle start, t1: STARTED callbacks done,
+        # t2: lv.task_handler done, t3: FINISHED callbacks done
+        index = self.index
+        samples = self.samples
+        flush_time = self.flush_time
+        self.flush_time = 0
+
+        samples[0][index] = time.ticks_diff(t1, t0)  # NOQA
+        samples[1][index] = time.ticks_diff(t2, t1) - flush_time  # NOQA
+        samples[2][index] = flush_time
+        samples[3][index] = time.ticks_diff(t3, t2)  # NOQA
+        samples[4][index] = time.ticks_diff(t3, t0)  # NOQA
+
+        index += 1
+        if index == self.size:
+            index = 0
+
+        self.index = index
+        self.count += 1
+
+        if (
+            self._label is not None and
+            time.ticks_diff(time.ticks_ms(), self._overlay_time) >= 1000  # NOQA
+        ):
+            self._overlay_time = time.ticks_ms()  # NOQA
+            self._update_overlay()
+
+    def _update_overlay(self):
+        stats = self.get_stats()
+        lines = []
+        for stage in _PROFILE_STAGES:
+            _, avg, max_, p95 = stats[stage]
+            lines.append('{}: {:.1f}/{:.1f}/{:.1f}ms'.format(
+                stage, avg / 1000, p95 / 1000, max_ / 1000))
+
+        lines.append('dropped: {}'.format(self.dropped))
+        self._label.set_text('\n'.join(lines))
+
+    def get_stats(self):
+        num_samples = min(self.count, self.size)
+        res = dict(cycles=self.count, dropped=self.dropped)
+
+        for i, stage in enumerate(_PROFILE_STAGES):
+            if not num_samples:
+                res[stage] = (0, 0, 0, 0)
+                continue
+
+            values = sorted(self.samples[i][:num_samples])
+            p95 = values[min(num_samples - 1, (num_samples * 95) // 100)]
+            res[stage] = (
+                values[0],
+                sum(values) // num_samples,
+                values[-1],
+                p95
+            )
+
+        return res
+
+    def reset(self):
+        self.index = 0
+        self.count = 0
+        self.dropped = 0
+        self.flush_time = 0
+
+
 def _default_exception_hook(e):
     sys.print_exception(e)  # NOQA
     TaskHandler._current_instance.deinit()  # NOQA
@@ -36,7 +168,9 @@ class TaskHandler(object):
         duration=33,
         timer_id=_default_timer_id,
         max_scheduled=2,
-        exception_hook=_default_exception_hook
+        exception_hook=_default_exception_hook,
+        adaptive=False,
+        max_period=1000
     ):
         if TaskHandler._current_instance is not None:
             self.__dict__.update(TaskHandler._current_instance.__dict__)
@@ -51,6 +185,13 @@ class TaskHandler(object):
             self.duration = duration
             self.exception_hook = exception_hook
 
+            # in adaptive mode the timer period follows the time until the
+            # next LVGL timer is due, it will never be less than `duration`
+            # and never more than `max_period`.
+            self.adaptive = adaptive
+            self.max_period = max_period
+            self._period = duration
+
             self._timer = Timer(timer_id)
 
             # Allocation occurs here
@@ -65,6 +206,7 @@ class TaskHandler(object):
             )
             self._scheduled = 0
             self._running = False
+            self._profiler = None
 
     def add_event_cb(self, callback, event, user_data=_DefaultUserData):
         for i, (cb, evt, data) in enumerate(self._callbacks):
@@ -89,8 +231,57 @@ class TaskHandler(object):
 
     def deinit(self):
         self._timer.deinit()
+        self.disable_profiling()
         TaskHandler._current_instance = None
 
+    def enable_profiling(self, samples=64, overlay=False):
+        # Records how long each part of a task handler cycle takes for the
+        # last `samples` cycles. Stats are returned by `get_profile` and are
+        # able to be shown on the display by setting `overlay` to True.
+        self.disable_profiling()
+        self._profiler = _Profiler(samples, overlay)
+
+    def disable_profiling(self):
+        if self._profiler is not None:
+            self._profiler.deinit()
+            self._profiler = None
+
+    def get_profile(self):
+        # Returns a dict with a (min, avg, max, p95) tuple in microseconds for
+        # each of the stages "started" (TASK_HANDLER_STARTED callbacks),
+        # "render" (lv.task_handler without flushing), "flush" (flushing and
+        # waiting for the bus), "finished" (TASK_HANDLER_FINISHED callbacks)
+        # and "total". "cycles" is the number of cycles that have run and
+        # "dropped" is the number of timer ticks that were unable to schedule
+        # the task handler.
+        if self._profiler is None:
+            return None
+
+        return self._profiler.get_stats()
+
+    def reset_profile(self):
+        if self._profiler is not None:
+            self._profiler.reset()
+
+    def wake(self):
+        # Puts the timer back to running every `duration` milliseconds.
+        # When in adaptive mode this needs to be called if the UI gets
+        # changed from outside of LVGL (the main loop or an interrupt),
+        # otherwise the change is not going to be seen until the next
+        # LVGL timer is due.
+        self._set_period(self.duration)
+
+    def _set_period(self, period):
+        if period == self._period:
+            return
+
+        self._period = period
+        self._timer.init(
+            mode=Timer.PERIODIC,
+            period=period,
+            callback=self._timer_cb
+        )
+
     def disable(self):
         self._scheduled += self.max_scheduled
 
@@ -108,6 +299,10 @@ class TaskHandler(object):
             if lv._nesting.value == 0:  # NOQA
                 self._running = True
 
+                profiler = self._profiler
+                if profiler is not None:
+                    t0 = time.ticks_us()  # NOQA
+
                 run_update = True
                 for cb, evt, data in self._callbacks:
                     if not evt & TASK_HANDLER_STARTED:
@@ -126,6 +321,9 @@ class TaskHandler(object):
                         else:
                             sys.print_exception(err)  # NOQA
 
+                if profiler is not None:
+                    t1 = time.ticks_us()  # NOQA
+
                 stop_time = time.ticks_ms()  # NOQA
 
                 ticks_diff = time.ticks_diff(stop_time, self._start_time)  # NOQA
@@ -133,8 +331,10 @@ class TaskHandler(object):
                 lv.tick_inc(ticks_diff)
 
                 if run_update:
-                    lv.task_handler()
-                    start_time = time.ticks_ms()  # NOQA
+                    next_timer = lv.task_handler()
+
+                    if profiler is not None:
+                        t2 = time.ticks_us()  # NOQA
 
                     for cb, evt, data in self._callbacks:
                         if not evt & TASK_HANDLER_FINISHED:
@@ -151,10 +351,30 @@ class TaskHandler(object):
                             else:
                                 sys.print_exception(err)  # NOQA
 
+                    # LVGL only gets the time that was measured. Every
+                    # millisecond is fed once, counted from the last time
+                    # the tick was increased.
                     stop_time = time.ticks_ms()  # NOQA
-                    ticks_diff = time.ticks_diff(stop_time, start_time)  # NOQA
+                    ticks_diff = time.ticks_diff(stop_time, self._start_time)  # NOQA
+                    self._start_time = stop_time
                     lv.tick_inc(ticks_diff)
 
+                    if profiler is not None:
+                        profiler.record(t0, t1, t2, time.ticks_us())  # NOQA
+
+                    if self.adaptive:
+                        # lv.task_handler returns the number of milliseconds
+                        # until the next LVGL timer needs to run. When there
+                        # are no timers it returns LV_NO_TIMER_READY
+                        # (0xFFFFFFFF) which gets capped at max_period.
+                        if next_timer <= self.duration:
+                            self._set_period(self.duration)
+                        else:
+                            self._set_period(min(next_timer, self.max_period))
+
+                elif profiler is not None:
+                    profiler.record(t0, t1, t1, t1)
+
                 self._running = False
 
         except Exception as e:
@@ -164,8 +384,9 @@ class TaskHandler(object):
                 self.exception_hook(e)
 
     def _timer_cb(self, _):
-        lv.tick_inc(self.duration)
         if self._running:
+            if self._profiler is not None:
+                self._profiler.dropped += 1
             return
 
         if self._scheduled < self.max_scheduled:
@@ -173,4 +394,8 @@ class TaskHandler(object):
                 micropython.schedule(self._task_handler_ref, 0)
                 self._scheduled += 1
             except:  # NOQA
-                pass
+                if self._profiler is not None:
+                    self._profiler.dropped += 1
+
+        elif self._profiler is not None:
+            self._profiler.dropped += 1
@@ -5,6 +5,7 @@ import micropython  # NOQA
 import machine  # NOQA
 import pointer_framework
 import time
+import array
 
 
 _CMD_X_READ = const(0xD0)  # 12 bit resolution
@@ -14,12 +15,24 @@ _CMD_Z2_READ = const(0xC0)
 _MIN_RAW_COORD = const(10)
 _MAX_RAW_COORD = const(4090)
 
+# number of X/Y samples that get read together with Z1 and Z2. Once this
+# many samples have been read, sampling stops as soon as they are within
+# the margin.
+_MIN_SAMPLES = const(3)
+_SAMPLE_TIMEOUT = const(5000)  # microseconds
+
 
 class XPT2046(pointer_framework.PointerDriver):
 
     touch_threshold = 400
     confidence = 5
     margin = 50
+    # use the median of the samples instead of the mean
+    median = False
+    # IIR smoothing of the position while the panel is being touched. This
+    # is how much of the last position is kept in eighths, 0 turns it off
+    # and 7 is the most smoothing
+    smoothing = 0
 
     def _read_reg(self, reg, num_bytes):
         self._tx_buf[0] = reg
@@ -50,56 +63,156 @@ class XPT2046(pointer_framework.PointerDriver):
         self._rx_buf = bytearray(3)
         self._rx_mv = memoryview(self._rx_buf)
 
-        self.__confidence = max(min(self.confidence, 25), 3)
-        self.__points = [[0, 0] for _ in range(self.__confidence)]
+        confidence = max(min(self.confidence, 25), _MIN_SAMPLES)
+        self.__confidence = confidence
+        # x, y, x, y, ...
+        self.__samples = array.array('h', [0] * (confidence * 2))
+        self.__sorted = array.array('h', [0] * confidence)
 
         margin = max(min(self.margin, 100), 1)
         self.__margin = margin * margin
 
+        # The XPT2046 is able to start the next conversion while the result
+        # of the last one is being clocked out. Every command is followed by
+        # the 2 bytes of its result which overlap the next command. This
+        # reads Z1, Z2 and _MIN_SAMPLES X/Y pairs in a single transaction.
+        burst = [_CMD_Z1_READ, 0, _CMD_Z2_READ, 0]
+        for _ in range(_MIN_SAMPLES):
+            burst.extend([_CMD_X_READ, 0, _CMD_Y_READ, 0])
+        burst.append(0)
+
+        self._burst_tx_buf = bytearray(burst)
+        self._burst_tx_mv = memoryview(self._burst_tx_buf)
+        self._pair_tx_buf = bytearray([_CMD_X_READ, 0, _CMD_Y_READ, 0, 0])
+        self._pair_tx_mv = memoryview(self._pair_tx_buf)
+        self._burst_rx_buf = bytearray(len(burst))
+        self._burst_rx_mv = memoryview(self._burst_rx_buf)
+
+        self.__filter_x = -1
+        self.__filter_y = -1
+
         super().__init__(
             touch_cal=touch_cal, startup_rotation=startup_rotation, debug=debug
         )
 
     def _get_coords(self):
-        z1 = self._read_reg(_CMD_Z1_READ, 3)
-        z2 = self._read_reg(_CMD_Z2_READ, 3)
+        rx = self._burst_rx_buf
+        self._device.write_readinto(self._burst_tx_mv, self._burst_rx_mv)
+
+        z1 = ((rx[1] << 8) | rx[2]) >> 3
+        z2 = ((rx[3] << 8) | rx[4]) >> 3
         z = z1 + ((_MAX_RAW_COORD + 6) - z2)
 
         if z < self.touch_threshold:
+            self.__filter_x = -1
             return None
 
-        points = self.__points
+        samples = self.__samples
+        confidence = self.__confidence
+        margin = self.__margin
+
+        # the sums are kept relative to the first sample so the numbers
+        # stay small
         count = 0
-        timeout = 5000
+        ref_x = 0
+        ref_y = 0
+        sum_x = 0
+        sum_y = 0
+        sum_sq = 0
+
+        offset = 5
+        end = 5 + _MIN_SAMPLES * 4
+        timeout = _SAMPLE_TIMEOUT
         start_time = time.ticks_us()  # NOQA
-        while timeout > 0:
-            if count == self.__confidence:
+
+        while count < confidence:
+            if offset == end:
+                if timeout <= 0:
+                    break
+
+                self._device.write_readinto(
+                    self._pair_tx_mv,
+                    self._burst_rx_mv[:5]
+                )
+                offset = 1
+                end = 5
+
+                end_time = time.ticks_us()  # NOQA
+                timeout -= time.ticks_diff(end_time, start_time)  # NOQA
+                start_time = end_time
+
+            x = ((rx[offset] << 8) | rx[offset + 1]) >> 3
+            y = ((rx[offset + 2] << 8) | rx[offset + 3]) >> 3
+            offset += 4
+
+            if x <= _MIN_RAW_COORD or y >= _MAX_RAW_COORD:
+                # not pressed
+                continue
+
+            if not count:
+                ref_x = x
+                ref_y = y
+
+            samples[count * 2] = x
+            samples[count * 2 + 1] = y
+            count += 1
+
+            x -= ref_x
+            y -= ref_y
+            sum_x += x
+            sum_y += y
+            sum_sq += x * x + y * y
+
+            if (
+                count >= _MIN_SAMPLES and
+                count * sum_sq - sum_x * sum_x - sum_y * sum_y <=
+                margin * count * count
+            ):
                 break
 
-            sample = self._get_raw()  # get a touch
-            if sample is not None:
-                points[count][0], points[count][1] = sample  # put in buff
-                count += 1
+        if not count:
+            return None
+
+        # the variance multiplied by count squared
+        dev = count * sum_sq - sum_x * sum_x - sum_y * sum_y
+        if dev > margin * count * count:
+            return None
+
+        if self.median:
+            x = self.__median(0, count)
+            y = self.__median(1, count)
+        else:
+            x = ref_x + sum_x // count
+            y = ref_y + sum_y // count
+
+        smoothing = self.smoothing
+        if smoothing and self.__filter_x != -1:
+            x = (self.__filter_x * smoothing + x * (8 - smoothing)) >> 3
+            y = (self.__filter_y * smoothing + y * (8 - smoothing)) >> 3
 
-            end_time = time.ticks_us()  # NOQA
-            timeout -= time.ticks_diff(end_time, start_time)  # NOQA
-            start_time = end_time
+        self.__filter_x = x
+        self.__filter_y = y
 
-        if count:
-            meanx = sum([points[i][0] for i in range(count)]) // count
-            meany = sum([points[i][1] for i in range(count)]) // count
-            dev = sum([
-                (points[i][0] - meanx) ** 2 + (points[i][1] - meany) ** 2
-                for i in range(count)
-            ]) / count
+        if self._debug:
+            print(f'{self.__class__.__name__}_TP_DATA(x={x}, y={y}, z={z})')  # NOQA
 
-            if dev <= self.__margin:
-                x, y = self._normalize(meanx, meany)
-                if self._debug:
-                    print(f'{self.__class__.__name__}_TP_DATA(x={meanx}, y={meany}, z={z})')  # NOQA
-                return self.PRESSED, x, y
+        x, y = self._normalize(x, y)
+        return self.PRESSED, x, y
 
-        return None
+    def __median(self, axis, count):
+        # insertion sort into a preallocated array so nothing gets allocated
+        samples = self.__samples
+        values = self.__sorted
+
+        for i in range(count):
+            value = samples[i * 2 + axis]
+            j = i
+            while j and values[j - 1] > value:
+                values[j] = values[j - 1]
+                j -= 1
+            values[j] = value
+
+        return values[count // 2]
 
     def _normalize(self, x, y):
         x = pointer_framework.remap(
@@ -112,8 +225,11 @@ class XPT2046(pointer_framework.PointerDriver):
         return x, y
 
     def _get_raw(self):
-        x = self._read_reg(_CMD_X_READ, 3)
-        y = self._read_reg(_CMD_Y_READ, 3)
+        rx = self._burst_rx_buf
+        self._device.write_readinto(self._pair_tx_mv, self._burst_rx_mv[:5])
+
+        x = ((rx[1] << 8) | rx[2]) >> 3
+        y = ((rx[3] << 8) | rx[4]) >> 3
         if x > _MIN_RAW_COORD and y < _MAX_RAW_COORD:  # touch pressed?
             return x, y
         else:
@@ -19,10 +19,6 @@ BITS = 8
 _CH422G_REG_IN = const(0x26)  # 38  00100110
 _CH422G_REG_OUT = const(0x38)  # 56 00111000
 
-_REG_INPUT = const(0)
-_REG_OUTPUT = const(1)
-_REG_DIRECTION = const(2)
-
 
 class Pin(io_expander_framework.Pin):
     _output_states = 0x00
@@ -46,10 +42,6 @@ class Pin(io_expander_framework.Pin):
             dev_id=_CH422G_REG_OUT
         )
 
-    @property
-    def __bit(self):
-        return 1 << self._id
-
     @property
     def _mode(self):
         return 1
@@ -58,62 +50,23 @@ class Pin(io_expander_framework.Pin):
     def _mode(self, value):
         pass
 
-    def _write_reg(self, reg, value):
-        if reg == _REG_OUTPUT:
-            value &= 0xFF
-
-            self._buf[0] = 0x01
-            Pin._device.write(self._mv[:1])
-
-            self._buf[0] = value
-            # _i2c_device.write_mem(_CH422G_REG_OUT, self._mv[:1])
-            Pin._reg_out.write(self._mv[:1])
-            self._output = value
+    @classmethod
+    def _write_outputs(cls, states):
+        cls._port_buf[0] = 0x01
+        cls._device.write(cls._port_mv[:1])
 
-        elif reg == _REG_DIRECTION:
-            value &= 0xFF
-            self._mode = value
+        cls._port_buf[0] = states & 0xFF
+        cls._reg_out.write(cls._port_mv[:1])
 
-    def _read_reg(self, reg):
-        if reg == _REG_INPUT:
-            # _i2c_device.read_mem(_CH422G_REG_IN, buf=self._mv[:1])
-            Pin._reg_in.read(buf=self._mv[:1])
-            return self._buf[0]
-        elif reg == _REG_OUTPUT:
-            return self._output
-        elif reg == _REG_DIRECTION:
-            return self._mode
+    @classmethod
+    def _read_inputs(cls):
+        cls._reg_in.read(buf=cls._port_mv[:1])
+        return ~cls._port_buf[0]
 
     def _set_dir(self, direction):
         if direction == self.OPEN_DRAIN:
             raise ValueError('OPEN_DRAIN is not supported')
 
-    def _set_level(self, level):
-        if self._mode == self.OUT:
-            if level:
-                # 3. High level && Set 0 to output high
-                # 4. Low level && Set 0 to output low
-                states = Pin._output_states | self.__bit
-            else:
-                # 1. High level && Set 1 to output high
-                # 2. Low level && Set 1 to output low
-                states = Pin._output_states & ~ self.__bit
-
-            # Write to reg only when different */
-            if states != Pin._output_states:
-                self._write_reg(_REG_OUTPUT, states)
-                Pin._output_states = states
-
-    def _get_level(self):
-        if self._mode == self.IN:
-            states = ~self._read_reg(_REG_INPUT)
-        elif self._mode == self.OUT:
-            states = Pin._output_states
-        else:
-            raise ValueError('Unsupported pin mode')
-
-        return int(bool(states & self.__bit))
-
     def _set_irq(self, handler, trigger):
         pass
 
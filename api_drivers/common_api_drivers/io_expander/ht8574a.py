@@ -23,45 +23,21 @@ class Pin(io_expander_framework.Pin):
     _output_states = 0xFF
     _reg_int_pins = []
 
-    @property
-    def __bit(self):
-        return 1 << self._id
+    @classmethod
+    def _write_outputs(cls, states):
+        cls._port_buf[0] = states & 0xFF
+        cls._device.write(buf=cls._port_mv[:1])
 
-    def __read_reg(self):
-        self._buf[0] = 0
-        Pin._device.read(buf=self._mv[:1])
-        return self._buf[0]
-
-    def __write_reg(self, value):
-        self._buf[0] = value & 0xFF
-        Pin._device.write(buf=self._mv[:1])
+    @classmethod
+    def _read_inputs(cls):
+        cls._port_buf[0] = 0
+        cls._device.read(buf=cls._port_mv[:1])
+        return cls._port_buf[0]
 
     def _set_dir(self, direction):
         if direction == self.OPEN_DRAIN:
             raise ValueError('OPEN_DRAIN is not supported')
 
-    def _set_level(self, level):
-        if self._mode == self.OUT:
-            if level:
-                states = Pin._output_states | self.__bit
-            else:
-                states = Pin._output_states & ~self.__bit
-
-            # 0nly set if there is an actual change
-            if states != Pin._output_states:
-                self.__write_reg(Pin._output_states)
-                Pin._output_states = states
-
-    def _get_level(self):
-        if self._mode == self.IN:
-            states = self.__read_reg()
-        elif self.mode == self.OUT:
-            states = Pin._output_states
-        else:
-            raise ValueError('Unsupported pin mode')
-
-        return int(bool(states & self.__bit))
-
     def _set_irq(self, handler, trigger):
         pass
 
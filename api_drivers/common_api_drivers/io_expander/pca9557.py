@@ -33,51 +33,39 @@ class Pin(io_expander_framework.Pin):
     _reg_int_pins = []
 
     @property
-    def __bit(self):
+    def _bit(self):
         return 1 << (self._id - 1)
 
-    def __read_reg(self, reg):
-        self._buf[0] = 0
-        self._buf[1] = 0
-        self._device.read_mem(reg, buf=self._mv)
-        return self._buf[0] << 8 | self._buf[1]
+    @classmethod
+    def __read_reg(cls, reg):
+        cls._port_buf[0] = 0
+        cls._port_buf[1] = 0
+        cls._device.read_mem(reg, buf=cls._port_mv)
+        return cls._port_buf[0] << 8 | cls._port_buf[1]
 
-    def __write_reg(self, reg, value):
-        self._buf[0] = value >> 8 & 0xFF
-        self._buf[1] = value & 0xFF
-        self._device.write_mem(reg, buf=self._mv)
+    @classmethod
+    def __write_reg(cls, reg, value):
+        cls._port_buf[0] = value >> 8 & 0xFF
+        cls._port_buf[1] = value & 0xFF
+        cls._device.write_mem(reg, buf=cls._port_mv)
 
     def _set_dir(self, direction):
         if direction == self.OUT:
-            Pin._config_settings &= ~self.__bit
+            Pin._config_settings &= ~self._bit
         elif direction == self.IN:
-            Pin._config_settings |= self.__bit
+            Pin._config_settings |= self._bit
         else:
             raise ValueError('OPEN_DRAIN is not supported')
 
         self.__write_reg(_CONFIGURATION_REG, Pin._config_settings)
 
-    def _set_level(self, level):
-        if self._mode == self.OUT:
-            if level:
-                states = Pin._output_states | self.__bit
-            else:
-                states = Pin._output_states & ~self.__bit
-
-            # 0nly set if there is an actual change
-            if states != Pin._output_states:
-                self.__write_reg(_OUTPUT_PORT_REG, states)
-                Pin._output_states = states
-
-    def _get_level(self):
-        if self._mode == self.IN:
-            states = self.__read_reg(_INPUT_PORT_REG)
-        elif self._mode == self.OUT:
-            states = Pin._output_states
-        else:
-            raise ValueError('Unsupported pin mode')
+    @classmethod
+    def _write_outputs(cls, states):
+        cls.__write_reg(_OUTPUT_PORT_REG, states)
 
-        return int(bool(states & self.__bit))
+    @classmethod
+    def _read_inputs(cls):
+        return cls.__read_reg(_INPUT_PORT_REG)
 
     def _set_irq(self, handler, trigger):
         pass
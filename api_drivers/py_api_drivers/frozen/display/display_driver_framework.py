@@ -35,11 +35,315 @@ _MADCTL_MV = const(0x20)  # 0=Normal, 1=Row/column exchange
 _MADCTL_MX = const(0x40)  # 0=Left to Right, 1=Right to Left
 _MADCTL_MY = const(0x80)  # 0=Top to Bottom, 1=Bottom to Top
 
+# values that can be used when declaring the registers that make up the
+# address window, see `DisplayDriver._ADDRESS_WINDOW`
+ADDR_X1 = const(0)
+ADDR_Y1 = const(1)
+ADDR_X2 = const(2)
+ADDR_Y2 = const(3)
+ADDR_WIDTH = const(4)
+ADDR_HEIGHT = const(5)
+
+# default cost of a single flush transaction (CASET + RASET + RAMWR and the
+# bus setup that goes with them) expressed as a number of bytes of pixel data
+_COALESCE_OVERHEAD = const(256)
+
+# how long in milliseconds a display waits for the buffers of a frame buffer
+# pool to be released by the display that is using them
+_POOL_TIMEOUT = const(100)
+
+# init tables are packed bytes, every entry in the table is laid out as
+#   command (2 bytes big endian), param count (1 byte), params,
+#   delay in milliseconds after the command (2 bytes big endian)
+# an entry that has INIT_TABLE_DELAY as the command only does the delay.
+# builder/init_table.py creates these tables from the _xxx_init.py modules
+# at build time.
+INIT_TABLE_DELAY = const(0xFFFF)
+
 
 STATE_HIGH = 1
 STATE_LOW = 0
 STATE_PWM = -1
 
+# where the frame buffers get allocated, see `FrameBufferStrategy`
+MEMORY_PREFER_INTERNAL = const(0)
+MEMORY_PREFER_SPIRAM = const(1)
+MEMORY_INTERNAL_ONLY = const(2)
+MEMORY_SPIRAM_ONLY = const(3)
+
+
+class FrameBufferLayout(object):
+    # The frame buffers a display ended up with. `flags` is None when the
+    # buffers were passed to the driver instead of being allocated by it.
+
+    def __init__(self, buffers, size, lines, flags):
+        self.buffers = buffers
+        self.size = size
+        self.lines = lines
+        self.flags = flags
+
+    @property
+    def count(self):
+        return len(self.buffers)
+
+    @property
+    def dma(self):
+        return bool(self.flags and self.flags & lcd_bus.MEMORY_DMA)
+
+    @property
+    def spiram(self):
+        return bool(self.flags and self.flags & lcd_bus.MEMORY_SPIRAM)
+
+    def __str__(self):
+        if self.flags is None:
+            memory = 'user'
+        elif self.spiram:
+            memory = 'spiram'
+        else:
+            memory = 'internal'
+
+        if self.dma:
+            memory += '+dma'
+
+        return (
+            f'{self.count} x {self.size} bytes ({self.lines} lines), {memory}'
+        )
+
+
+class FrameBufferStrategy(object):
+    """
+    Decides the size and the memory of the frame buffers that get allocated
+    for a display.
+
+    size: size of a buffer in bytes
+    lines: size of a buffer in lines of the display, used when size is None.
+           When both are None the buffer is 1/10 of the display.
+    memory: MEMORY_PREFER_INTERNAL, MEMORY_PREFER_SPIRAM,
+            MEMORY_INTERNAL_ONLY or MEMORY_SPIRAM_ONLY
+    buffers: 1 or 2. None uses 2 buffers when the memory is DMA capable and
+             1 buffer when it is not.
+    min_size: smallest buffer size in bytes. If the buffers are not able to
+              be allocated the size is made smaller one step at a time
+              until it is. None is 1/4 of the starting size.
+
+    Pass the strategy as `frame_buffer1` when creating the display or set
+    it as the default for all displays with
+    `DisplayDriver.set_frame_buffer_strategy`.
+    """
+
+    def __init__(
+        self,
+        size=None,
+        lines=None,
+        memory=MEMORY_PREFER_INTERNAL,
+        buffers=None,
+        min_size=None
+    ):
+        if buffers not in (None, 1, 2):
+            # LVGL only renders into 2 buffers and the busses only keep
+            # track of 2 buffers.
+            raise ValueError('buffers must be None, 1 or 2')
+
+        self.size = size
+        self.lines = lines
+        self.memory = memory
+        self.buffers = buffers
+        self.min_size = min_size
+
+    def _get_flags(self):
+        internal = (
+            lcd_bus.MEMORY_INTERNAL | lcd_bus.MEMORY_DMA,
+            lcd_bus.MEMORY_INTERNAL
+        )
+        spiram = (
+            lcd_bus.MEMORY_SPIRAM | lcd_bus.MEMORY_DMA,
+            lcd_bus.MEMORY_SPIRAM
+        )
+
+        if self.memory == MEMORY_INTERNAL_ONLY:
+            return internal
+        if self.memory == MEMORY_SPIRAM_ONLY:
+            return spiram
+        if self.memory == MEMORY_PREFER_SPIRAM:
+            return spiram[:1] + internal[:1] + spiram[1:] + internal[1:]
+
+        return internal[:1] + spiram[:1] + internal[1:] + spiram[1:]
+
+    def get_sizes(self, width, height, color_size):
+        # the buffer sizes to try, largest first
+        line_size = width * color_size
+        full_size = line_size * height
+
+        if self.size is not None:
+            size = self.size
+        elif self.lines is not None:
+            size = self.lines * line_size
+        else:
+            size = full_size // 10
+
+        size = min(size, full_size)
+
+        if self.min_size is None:
+            min_size = size // 4
+        else:
+            min_size = min(self.min_size, size)
+
+        min_size = max(min_size, line_size)
+
+        sizes = [size]
+        while True:
+            # shrink by 1/4 and keep the buffer a whole number of lines
+            size = (size * 3 // 4) // line_size * line_size
+            if size < min_size:
+                break
+
+            sizes.append(size)
+
+        return sizes, line_size
+
+    def allocate(self, data_bus, width, height, color_size):
+        """
+        Allocates the frame buffers and returns a `FrameBufferLayout`.
+        Raises MemoryError if the buffers can't be allocated at the smallest
+        size.
+        """
+        sizes, line_size = self.get_sizes(width, height, color_size)
+        flags_list = self._get_flags()
+
+        if self.buffers is None:
+            counts = (2, 1)
+        else:
+            counts = tuple(range(self.buffers, 0, -1))
+
+        gc.collect()
+
+        for size in sizes:
+            for count in counts:
+                for flags in flags_list:
+                    # MEMORY_DMA is 0 on the ports that don't have DMA
+                    # memory so every allocation is able to use 2 buffers
+                    if (
+                        self.buffers is None and
+                        count == 2 and
+                        (flags | lcd_bus.MEMORY_DMA) != flags
+                    ):
+                        continue
+
+                    buffers = []
+                    try:
+                        for _ in range(count):
+                            buffers.append(
+                                data_bus.allocate_framebuffer(size, flags)
+                            )
+                    except MemoryError:
+                        # the buffers have to be freed, the bus doesn't
+                        # allow another buffer to be allocated while they
+                        # are still being held
+                        for buf in buffers:
+                            data_bus.free_framebuffer(buf)
+                        continue
+
+                    return FrameBufferLayout(
+                        buffers,
+                        size,
+                        size // line_size,
+                        flags
+                    )
+
+            gc.collect()
+
+        raise MemoryError(
+            f'Unable to allocate memory for frame buffer ({sizes[-1]})'
+        )
+
+
+class FrameBufferPool(object):
+    """
+    Frame buffers that are shared by more than one display.
+
+    A display owns the buffers from the start of a refresh (REFR_START) until
+    the refresh is done (REFR_READY) and the last flush of it has finished. A
+    display that starts a refresh while another display owns the buffers
+    waits for at most `timeout` milliseconds. If the owner hasn't finished by
+    then its last flush is treated as lost, the display takes the buffers
+    over and both displays redraw their screens on the next refresh. Busses
+    that keep their own frame buffers (RGBBus) are not able to use a pool.
+
+    The buffers are allocated using the data bus of the first display that
+    uses the pool. Some busses (the I80 and RGB busses on the ESP32) free the
+    buffers they allocated when they get deinitialized, so that bus has to
+    stay alive for as long as any display is using the pool.
+
+        pool = FrameBufferPool(FrameBufferStrategy(lines=40))
+        display1 = st7789.ST7789(bus1, 240, 320, frame_buffer1=pool)
+        display2 = st7789.ST7789(bus2, 240, 320, frame_buffer1=pool)
+    """
+
+    def __init__(self, strategy=None, timeout=_POOL_TIMEOUT):
+        if strategy is None:
+            strategy = FrameBufferStrategy()
+
+        self.strategy = strategy
+        self.timeout = timeout
+        self.layout = None
+        self.displays = []
+        self._owner = None
+        self._rendered = False
+        self._flushing = False
+
+    def acquire(self, display, data_bus, width, height, color_size):
+        if self.layout is None:
+            self.layout = self.strategy.allocate(
+                data_bus, width, height, color_size)
+
+        self.displays.append(display)
+        return self.layout
+
+    def release(self, display):
+        if display in self.displays:
+            self.displays.remove(display)
+
+        if self._owner is display:
+            self._owner = None
+
+    def wait(self, display):
+        # called when a display starts a refresh. Returns False if the
+        # buffers had to be taken from a display that didn't finish in time
+        owner = self._owner
+        taken = True
+
+        if owner is not None and owner is not display:
+            start = time.ticks_ms()  # NOQA
+            while self._owner is owner:
+                if time.ticks_diff(time.ticks_ms(), start) >= self.timeout:  # NOQA
+                    if owner in self.displays:
+                        owner.invalidate_screen()
+                    taken = False
+                    break
+
+                time.sleep_ms(1)  # NOQA
+
+        self._owner = display
+        self._rendered = False
+        self._flushing = False
+        return taken
+
+    def flush(self, display, last):
+        if last and self._owner is display:
+            self._flushing = True
+
+    def flushed(self, display):
+        if self._owner is display:
+            self._flushing = False
+            if self._rendered:
+                self._owner = None
+
+    def rendered(self, display):
+        if self._owner is display:
+            self._rendered = True
+            if not self._flushing:
+                self._owner = None
+
 
 class DisplayDriver:
     _INVON = 0x21
@@ -52,8 +356,33 @@ class DisplayDriver:
         _MADCTL_MY | _MADCTL_MX | _MADCTL_MV
     )
 
+    # The registers that get written to in order to set the address window
+    # when flushing. Each entry is (command, bytes, cached). `bytes` is a
+    # tuple of (ADDR_*, shift) pairs, one for every parameter byte sent with
+    # the command. The last value written to each register is remembered and
+    # the command is only sent again if one of its bytes has changed. Set
+    # `cached` to False for registers that the display IC changes on its own
+    # like a write cursor, those get sent with every flush.
+    _ADDRESS_WINDOW = (
+        (
+            _CASET,
+            ((ADDR_X1, 8), (ADDR_X1, 0), (ADDR_X2, 8), (ADDR_X2, 0)),
+            True
+        ),
+        (
+            _RASET,
+            ((ADDR_Y1, 8), (ADDR_Y1, 0), (ADDR_Y2, 8), (ADDR_Y2, 0)),
+            True
+        ),
+    )
+    # command used to write the pixel data
+    _WRITE_CMD = _RAMWR
+
     _displays = []
 
+    # used for the displays that are not given frame buffers
+    _frame_buffer_strategy = None
+
     @staticmethod
     def get_default():
         disp = lv.display_get_default()  # NOQA
@@ -118,6 +447,22 @@ class DisplayDriver:
         self._param_buf = bytearray(4)
         self._param_mv = memoryview(self._param_buf)
 
+        self._addr_values = [0] * 6
+        self._addr_views = []
+        addr_size = 0
+
+        for _, addr_bytes, _ in self._ADDRESS_WINDOW:
+            self._addr_views.append(self._param_mv[:len(addr_bytes)])
+            addr_size += len(addr_bytes)
+
+        self._addr_cache = bytearray(addr_size)
+        self._addr_cache_valid = False
+        # drivers that use the default CASET/RASET window take a straight
+        # line path when flushing
+        self._addr_default = (
+            self._ADDRESS_WINDOW is DisplayDriver._ADDRESS_WINDOW
+        )
+
         self._color_byte_order = color_byte_order
         self._color_space = color_space
 
@@ -129,10 +474,26 @@ class DisplayDriver:
 
         self._rotation = lv.DISPLAY_ROTATION._0  # NOQA
 
+        self._coalesce = False
+        self._coalesce_overhead = 0
+        self._coalesce_areas = None
+
         self._rgb565_byte_swap = rgb565_byte_swap
         self._cmd_bits = _cmd_bits
         self._param_bits = _param_bits
 
+        self._fb_pool = None
+        self._fb_layout = None
+        self._fb_pool_redraw = False
+
+        self._render_mode = None
+        self._buffer_size = 0
+        self._buffer_count = 0
+
+        self._flush_bridge = None
+        # memoryview that gets pointed at the pixel data in `_flush_cb`
+        self._flush_view = None
+
         if data_bus is None:
             self._reset_pin = None
             self._power_pin = None
@@ -188,42 +549,55 @@ class DisplayDriver:
             self._disp_drv.set_color_format(color_space)
             self._disp_drv.set_driver_data(self)
 
-            if frame_buffer1 is None:
-                buf_size = int(
-                    display_width *
-                    display_height *
-                    lv.color_format_get_size(color_space)
-                )
-                buf_size = int(buf_size // 10)
-                gc.collect()
-
-                for flags in (
-                    lcd_bus.MEMORY_INTERNAL | lcd_bus.MEMORY_DMA,
-                    lcd_bus.MEMORY_SPIRAM | lcd_bus.MEMORY_DMA,
-                    lcd_bus.MEMORY_INTERNAL,
-                    lcd_bus.MEMORY_SPIRAM
-                ):
-                    try:
-                        frame_buffer1 = (
-                            data_bus.allocate_framebuffer(buf_size, flags)
-                        )
+            color_size = lv.color_format_get_size(color_space)
 
-                        if (flags | lcd_bus.MEMORY_DMA) == flags:
-                            frame_buffer2 = (
-                                data_bus.allocate_framebuffer(buf_size, flags)
-                            )
+            if isinstance(frame_buffer1, FrameBufferPool):
+                if isinstance(data_bus, lcd_bus.RGBBus):
+                    raise RuntimeError(
+                        'RGBBus is not able to use a frame buffer pool'
+                    )
 
-                        break
-                    except MemoryError:
-                        frame_buffer1 = data_bus.free_framebuffer(frame_buffer1)
+                self._fb_pool = frame_buffer1
+                layout = self._fb_pool.acquire(
+                    self, data_bus, display_width, display_height, color_size)
 
+                full_size = display_width * display_height * color_size
+                buffers = layout.buffers
+                if layout.size > full_size:
+                    buffers = [buf[:full_size] for buf in buffers]
+                    layout = FrameBufferLayout(
+                        buffers, full_size, display_height, layout.flags)
+
+                self._fb_layout = layout
+
+            elif frame_buffer1 is None or isinstance(
+                frame_buffer1,
+                FrameBufferStrategy
+            ):
                 if frame_buffer1 is None:
-                    raise MemoryError(
-                        f'Unable to allocate memory for frame buffer ({buf_size})'  # NOQA
-                    )
+                    strategy = DisplayDriver._frame_buffer_strategy
+                    if strategy is None:
+                        strategy = FrameBufferStrategy()
+                else:
+                    strategy = frame_buffer1
 
-            self._frame_buffer1 = frame_buffer1
-            self._frame_buffer2 = frame_buffer2
+                self._fb_layout = strategy.allocate(
+                    data_bus, display_width, display_height, color_size)
+            else:
+                buffers = [frame_buffer1]
+                if frame_buffer2 is not None:
+                    buffers.append(frame_buffer2)
+
+                self._fb_layout = FrameBufferLayout(
+                    buffers,
+                    len(frame_buffer1),
+                    len(frame_buffer1) // (display_width * color_size),
+                    None
+                )
+
+            buffers = self._fb_layout.buffers
+            self._frame_buffer1 = buffers[0]
+            self._frame_buffer2 = buffers[1] if len(buffers) > 1 else None
 
             self._init_disp_bus = _init_bus
 
@@ -255,6 +629,10 @@ class DisplayDriver:
         else:
             render_mode = lv.DISPLAY_RENDER_MODE.PARTIAL  # NOQA
 
+        self._render_mode = render_mode
+        self._buffer_size = len(self._frame_buffer1)
+        self._buffer_count = 1 if self._frame_buffer2 is None else 2
+
         self._disp_drv.set_buffers(
             self._frame_buffer1,
             self._frame_buffer2,
@@ -282,6 +660,18 @@ class DisplayDriver:
             None
         )
 
+        if self._fb_pool is not None:
+            self._disp_drv.add_event_cb(
+                self._on_refr_start,
+                lv.EVENT.REFR_START,  # NOQA
+                None
+            )
+            self._disp_drv.add_event_cb(
+                self._on_pool_refr_ready,
+                lv.EVENT.REFR_READY,  # NOQA
+                None
+            )
+
         self._displays.append(self)
 
     def _on_size_change(self, _):
@@ -300,6 +690,327 @@ class DisplayDriver:
             ))
             self._data_bus.tx_param(_MADCTL, self._param_mv[:1])
 
+    def set_area_coalescing(self, enable, overhead=_COALESCE_OVERHEAD):
+        # LVGL flushes every invalidated area as its own transaction, each one
+        # costing a CASET/RASET pair and a RAMWR before any pixels get sent.
+        # When a lot of small areas get invalidated in the same refresh cycle
+        # the bus ends up spending most of its time sending commands. Turning
+        # this on merges the areas of a refresh cycle into their bounding box
+        # when sending the extra pixels costs less than the extra transaction.
+        # `overhead` is the cost of a single transaction expressed in bytes.
+        if enable and self._coalesce_areas is None:
+            self._coalesce_areas = []
+            self._disp_drv.add_event_cb(
+                self._on_invalidate_area,
+                lv.EVENT.INVALIDATE_AREA,  # NOQA
+                None
+            )
+            self._disp_drv.add_event_cb(
+                self._on_refr_ready,
+                lv.EVENT.REFR_READY,  # NOQA
+                None
+            )
+
+        pixel_size = lv.color_format_get_size(self._color_space)
+        # the cost model works in pixels so there is no need to multiply
+        # every area size by the pixel size when an area gets invalidated.
+        self._coalesce_overhead = max(1, overhead // pixel_size)
+        self._coalesce = bool(enable)
+
+        if self._coalesce_areas is not None:
+            self._coalesce_areas.clear()
+
+    def get_area_coalescing(self):
+        return self._coalesce
+
+    def _on_refr_ready(self, _):
+        # LVGL has flushed all of the areas for this refresh cycle.
+        self._coalesce_areas.clear()
+
+    def _on_invalidate_area(self, e):
+        if not self._coalesce:
+            return
+
+        area = lv.area_t.__cast__(e.get_param())  # NOQA
+        x1 = area.x1
+        y1 = area.y1
+        x2 = area.x2
+        y2 = area.y2
+
+        areas = self._coalesce_areas
+        overhead = self._coalesce_overhead
+
+        i = 0
+        while i < len(areas):
+            ax1, ay1, ax2, ay2 = areas[i]
+
+            mx1 = min(x1, ax1)
+            my1 = min(y1, ay1)
+            mx2 = max(x2, ax2)
+            my2 = max(y2, ay2)
+
+            # cost of the merged area is only the pixels because it is a
+            # single transaction. The cost of keeping them apart is the
+            # pixels of both areas plus the overhead of one more transaction.
+            if (
+                (mx2 - mx1 + 1) * (my2 - my1 + 1) <=
+                (x2 - x1 + 1) * (y2 - y1 + 1) +
+                (ax2 - ax1 + 1) * (ay2 - ay1 + 1) +
+                overhead
+            ):
+                x1, y1, x2, y2 = mx1, my1, mx2, my2
+                areas.pop(i)
+                # the area got larger so it may now be worth merging with
+                # an area that was checked before.
+                i = 0
+            else:
+                i += 1
+
+        areas.append((x1, y1, x2, y2))
+
+        # LVGL joins the areas it has stored that are covered by the
+        # enlarged area so the flush callback only sees the merged area.
+        area.x1 = x1
+        area.y1 = y1
+        area.x2 = x2
+        area.y2 = y2
+
+    def set_render_mode(self, render_mode, buffer_size=None, buffer_count=None):
+        """
+        Changes how LVGL renders to the display.
+
+        buffer_size is the number of bytes of the frame buffers that get
+        used and buffer_count is 1 or 2. The buffers are not reallocated so
+        the size is only able to be the same or smaller than the frame
+        buffers. FULL and DIRECT need buffers that are the size of the
+        display. In DIRECT mode LVGL only renders the areas that changed
+        into the buffer and the whole buffer gets sent to the display after
+        the last area has been rendered. DIRECT is not able to be used when
+        the bus swaps the bytes of RGB565 colors.
+        """
+        full_screen_size = (
+            self.display_width *
+            self.display_height *
+            lv.color_format_get_size(self._color_space)
+        )
+
+        if buffer_size is None:
+            buffer_size = len(self._frame_buffer1)
+        if buffer_count is None:
+            buffer_count = 1 if self._frame_buffer2 is None else 2
+
+        if buffer_size > len(self._frame_buffer1):
+            raise ValueError('buffer size is larger than the frame buffer')
+
+        if buffer_count == 2 and self._frame_buffer2 is None:
+            raise ValueError('there is only a single frame buffer')
+
+        if (
+            render_mode == lv.DISPLAY_RENDER_MODE.DIRECT and  # NOQA
+            not self._can_render_direct()
+        ):
+            raise ValueError(
+                'DIRECT render mode is not able to be used with '
+                'rgb565_byte_swap or a frame buffer pool'
+            )
+
+        if (
+            render_mode != lv.DISPLAY_RENDER_MODE.PARTIAL and  # NOQA
+            buffer_size < full_screen_size
+        ):
+            raise ValueError(
+                'the buffer needs to be the size of the display '
+                'for FULL and DIRECT render modes'
+            )
+
+        frame_buffer2 = self._frame_buffer2 if buffer_count == 2 else None
+
+        self._disp_drv.set_buffers(
+            self._frame_buffer1,
+            frame_buffer2,
+            buffer_size,
+            render_mode
+        )
+
+        if self.is_native_flush():
+            self._flush_bridge.set_direct(
+                render_mode == lv.DISPLAY_RENDER_MODE.DIRECT)  # NOQA
+        elif render_mode == lv.DISPLAY_RENDER_MODE.DIRECT:  # NOQA
+            self._disp_drv.set_flush_cb(self._flush_direct_cb)
+        else:
+            self._disp_drv.set_flush_cb(self._flush_cb)
+
+        self._render_mode = render_mode
+        self._buffer_size = buffer_size
+        self._buffer_count = buffer_count
+
+        if self._initilized:
+            if render_mode == lv.DISPLAY_RENDER_MODE.PARTIAL:  # NOQA
+                self._unlock_full_window()
+            else:
+                self._lock_full_window()
+
+        self._disp_drv.get_screen_active().invalidate()
+
+    def get_render_mode(self):
+        return self._render_mode, self._buffer_size, self._buffer_count
+
+    def _can_render_direct(self):
+        # the bus swaps the bytes in the frame buffer when it sends them. In
+        # DIRECT mode LVGL keeps drawing into the same buffer and the areas
+        # that didn't change would get swapped again on every flush. The
+        # buffers of a pool get drawn into by the other displays so they don't
+        # keep what was rendered the last time.
+        if self._fb_pool is not None:
+            return False
+
+        return not (
+            self._rgb565_byte_swap and
+            self._color_space == lv.COLOR_FORMAT.RGB565  # NOQA
+        )
+
+    def set_native_flush(self, enable):
+        """
+        Flushes using C code in the bus driver instead of `_flush_cb`.
+
+        The address window in `_ADDRESS_WINDOW` and `_WRITE_CMD` get handed
+        to the bus a single time and no Python code runs when LVGL flushes.
+        Drivers that override `_flush_cb` or `_set_memory_location` and
+        displays that share a frame buffer pool need the Python flush.
+        """
+        if not enable:
+            if not self.is_native_flush():
+                return
+
+            self._flush_bridge.disable()
+
+            if self._render_mode == lv.DISPLAY_RENDER_MODE.DIRECT:  # NOQA
+                self._disp_drv.set_flush_cb(self._flush_direct_cb)
+            else:
+                self._disp_drv.set_flush_cb(self._flush_cb)
+
+            self._data_bus.register_callback(self._flush_ready_cb)
+            # the bridge has been writing to the address window registers
+            self._addr_cache_valid = False
+            return
+
+        cls = type(self)
+        if (
+            cls._flush_cb is not DisplayDriver._flush_cb or
+            cls._set_memory_location is not DisplayDriver._set_memory_location
+        ):
+            raise RuntimeError(
+                f'{cls.__name__} uses its own flush, '
+                'the native flush is not able to be used'
+            )
+
+        if self._fb_pool is not None:
+            raise RuntimeError(
+                'the native flush is not able to be used with a frame buffer pool'
+            )
+
+        if self._flush_bridge is None:
+            if isinstance(self._data_bus, lcd_bus.RGBBus):
+                # the RGB bus doesn't have an address window
+                address_window = ()
+            else:
+                address_window = self._ADDRESS_WINDOW
+
+            self._flush_bridge = lcd_bus.FlushBridge(
+                self._data_bus,
+                self._disp_drv,
+                address_window,
+                self._WRITE_CMD,
+                offset_x=self._offset_x,
+                offset_y=self._offset_y
+            )
+
+        self._flush_bridge.set_direct(
+            self._render_mode == lv.DISPLAY_RENDER_MODE.DIRECT)  # NOQA
+        self._flush_bridge.enable()
+
+    def is_native_flush(self):
+        return (
+            self._flush_bridge is not None and
+            self._flush_bridge.is_active()
+        )
+
+    def _lock_full_window(self):
+        # sets the address window to the whole display a single time and
+        # replaces the function that sets it with one that does nothing
+        if self._backup_set_memory_location is not None:
+            return
+
+        x1 = self._offset_x
+        y1 = self._offset_y
+        x2 = x1 + self.display_width - 1
+        y2 = y1 + self.display_height - 1
+        self._set_memory_location(x1, y1, x2, y2)
+
+        if self._flush_bridge is not None:
+            self._flush_bridge.invalidate()
+
+        self._backup_set_memory_location = self._set_memory_location
+        setattr(
+            self,
+            '_set_memory_location',
+            self._dummy_set_memory_location
+        )
+
+    def _unlock_full_window(self):
+        if self._backup_set_memory_location is None:
+            return
+
+        setattr(
+            self,
+            '_set_memory_location',
+            self._backup_set_memory_location
+        )
+        self._backup_set_memory_location = None
+        self.invalidate_address_window()
+
+    def _on_refr_start(self, _):
+        # the buffers may still be in use by the display that didn't finish,
+        # so what gets rendered now gets redrawn on the next refresh
+        if not self._fb_pool.wait(self):
+            self._fb_pool_redraw = True
+
+    def _on_pool_refr_ready(self, _):
+        self._fb_pool.rendered(self)
+
+        if self._fb_pool_redraw:
+            self._fb_pool_redraw = False
+            self.invalidate_screen()
+
+    def invalidate_screen(self):
+        # marks the active screen as changed so all of it gets redrawn
+        self._disp_drv.get_screen_active().invalidate()
+
+    @staticmethod
+    def set_frame_buffer_strategy(strategy):
+        # the strategy used by the displays that get created after this
+        # has been called when they are not given frame buffers
+        DisplayDriver._frame_buffer_strategy = strategy
+
+    def get_frame_buffer_layout(self):
+        if self._fb_layout is None and self._frame_buffer1 is not None:
+            buffers = [self._frame_buffer1]
+            if self._frame_buffer2 is not None:
+                buffers.append(self._frame_buffer2)
+
+            line_size = (
+                self.display_width *
+                lv.color_format_get_size(self._color_space)
+            )
+            self._fb_layout = FrameBufferLayout(
+                buffers,
+                len(self._frame_buffer1),
+                len(self._frame_buffer1) // line_size,
+                None
+            )
+
+        return self._fb_layout
+
     @staticmethod
     def get_displays():
         return DisplayDriver._displays
@@ -326,6 +1037,9 @@ class DisplayDriver:
     def set_offset(self, x, y):
         self._offset_x, self._offset_y = x, y
 
+        if self._flush_bridge is not None:
+            self._flush_bridge.set_offset(x, y)
+
     def get_offset_x(self):
         return self._disp_drv.get_offset_x()
 
@@ -461,6 +1175,9 @@ class DisplayDriver:
         del sys.modules[mod_name]
         # =======================================
 
+        # the init commands might have changed the address window
+        self.invalidate_address_window()
+
         full_frame_size = (
             self.display_width *
             self.display_height *
@@ -468,21 +1185,41 @@ class DisplayDriver:
         )
 
         if full_frame_size == len(self._frame_buffer1):
-            x1 = self._offset_x
-            y1 = self._offset_y
-            x2 = x1 + self.display_width
-            y2 = y1 + self.display_height
-            self._set_memory_location(x1, y1, x2, y2)
-
-            self._backup_set_memory_location = self._set_memory_location
-            setattr(
-                self,
-                '_set_memory_location',
-                self._dummy_set_memory_location
-            )
+            self._lock_full_window()
 
         self._initilized = True
 
+    def run_init_table(self, table):
+        # the params get copied into RAM before being sent because the table
+        # is normally a frozen bytes object that is stored in flash and
+        # some busses are not able to send directly from flash
+        buf = bytearray(255)
+        mv = memoryview(buf)
+        table_mv = memoryview(table)
+        set_params = self.set_params
+
+        i = 0
+        end = len(table)
+
+        while i < end:
+            cmd = (table[i] << 8) | table[i + 1]
+            size = table[i + 2]
+            i += 3
+
+            if cmd != INIT_TABLE_DELAY:
+                if size:
+                    buf[:size] = table_mv[i:i + size]
+                    set_params(cmd, mv[:size])
+                else:
+                    set_params(cmd)
+
+            i += size
+            delay = (table[i] << 8) | table[i + 1]
+            i += 2
+
+            if delay:
+                time.sleep_ms(delay)  # NOQA
+
     def set_params(self, cmd, params=None):
         self._data_bus.tx_param(cmd, params)
 
@@ -512,6 +1249,12 @@ class DisplayDriver:
         raise NotImplementedError('You must delete the instance by using `del {instance}`')
 
     def __del__(self):
+        if self._flush_bridge is not None:
+            self._flush_bridge.disable()
+
+        if self._fb_pool is not None:
+            self._fb_pool.release(self)
+
         if self in self._displays:
             self._displays.remove(self)
             self._disp_drv.delete()
@@ -519,10 +1262,20 @@ class DisplayDriver:
         if not self._displays and lv.is_initialized():
             lv.deinit()
 
+    def invalidate_address_window(self):
+        # forces all of the address window registers to be sent on the next
+        # flush. This needs to be called if the address window registers get
+        # written to outside of `_set_memory_location`.
+        self._addr_cache_valid = False
+
+        if self._flush_bridge is not None:
+            self._flush_bridge.invalidate()
+
     def reset(self):
         if self._reset_pin is None:
             return
 
+        self.invalidate_address_window()
         self._reset_pin.value(self._reset_state)
         time.sleep_ms(120)  # NOQA
         self._reset_pin.value(not self._reset_state)
@@ -557,25 +1310,78 @@ class DisplayDriver:
         return _RAMWR
 
     def _set_memory_location(self, x1, y1, x2, y2):
-        # Column addresses
-        param_buf = self._param_buf  # NOQA
-
-        param_buf[0] = (x1 >> 8) & 0xFF
-        param_buf[1] = x1 & 0xFF
-        param_buf[2] = (x2 >> 8) & 0xFF
-        param_buf[3] = x2 & 0xFF
-
-        self._data_bus.tx_param(_CASET, self._param_mv)
-
-        # Page addresses
-        param_buf[0] = (y1 >> 8) & 0xFF
-        param_buf[1] = y1 & 0xFF
-        param_buf[2] = (y2 >> 8) & 0xFF
-        param_buf[3] = y2 & 0xFF
-
-        self._data_bus.tx_param(_RASET, self._param_mv)
-
-        return _RAMWR
+        values = self._addr_values
+
+        if self._addr_default:
+            # values holds the window that was sent last
+            param_buf = self._param_buf
+            force = not self._addr_cache_valid
+
+            # Column addresses
+            if force or values[0] != x1 or values[2] != x2:
+                values[0] = x1
+                values[2] = x2
+                param_buf[0] = (x1 >> 8) & 0xFF
+                param_buf[1] = x1 & 0xFF
+                param_buf[2] = (x2 >> 8) & 0xFF
+                param_buf[3] = x2 & 0xFF
+
+                self._data_bus.tx_param(_CASET, self._param_mv)
+
+            # Page addresses
+            if force or values[1] != y1 or values[3] != y2:
+                values[1] = y1
+                values[3] = y2
+                param_buf[0] = (y1 >> 8) & 0xFF
+                param_buf[1] = y1 & 0xFF
+                param_buf[2] = (y2 >> 8) & 0xFF
+                param_buf[3] = y2 & 0xFF
+
+                self._data_bus.tx_param(_RASET, self._param_mv)
+
+            self._addr_cache_valid = True
+
+            return self._WRITE_CMD
+
+        values[0] = x1
+        values[1] = y1
+        values[2] = x2
+        values[3] = y2
+        values[4] = x2 - x1 + 1
+        values[5] = y2 - y1 + 1
+
+        param_buf = self._param_buf
+        cache = self._addr_cache
+        views = self._addr_views
+        data_bus = self._data_bus
+        force = not self._addr_cache_valid
+
+        pos = 0
+        i = 0
+        for cmd, addr_bytes, cached in self._ADDRESS_WINDOW:
+            changed = force or not cached
+            n = 0
+
+            for field, shift in addr_bytes:
+                value = (values[field] >> shift) & 0xFF
+                if cache[pos] != value:
+                    cache[pos] = value
+                    changed = True
+
+                param_buf[n] = value
+                n += 1
+                pos += 1
+
+            # a full width strip that moves down only changes the rows,
+            # there is no need to send the columns again.
+            if changed:
+                data_bus.tx_param(cmd, views[i])
+
+            i += 1
+
+        self._addr_cache_valid = True
+
+        return self._WRITE_CMD
 
     def _flush_cb(self, _, area, color_p):
         x1 = area.x1 + self._offset_x
@@ -594,10 +1400,32 @@ class DisplayDriver:
 
         # we have to use the __dereference__ method because this method is
         # what converts from the C_Array object the binding passes into a
-        # memoryview object that can be passed to the bus drivers
-        data_view = color_p.__dereference__(size)
+        # memoryview object that can be passed to the bus drivers. The same
+        # memoryview gets used for every flush so nothing gets allocated.
+        data_view = color_p.__dereference__(size, self._flush_view)
+        self._flush_view = data_view
+        last = self._disp_drv.flush_is_last()
+
+        if self._fb_pool is not None:
+            self._fb_pool.flush(self, last)
+
         self._data_bus.tx_color(cmd, data_view, x1, y1, x2, y2,
-                                self._rotation, self._disp_drv.flush_is_last())
+                                self._rotation, last)
+
+    def _flush_direct_cb(self, disp_drv, area, color_p):
+        # LVGL has rendered the changed areas into a buffer that is the size
+        # of the display. Nothing is sent until the last area, then the whole
+        # buffer is sent.
+        if not self._disp_drv.flush_is_last():
+            self._disp_drv.flush_ready()
+            return
+
+        area.x1 = 0
+        area.y1 = 0
+        area.x2 = self._disp_drv.get_horizontal_resolution() - 1
+        area.y2 = self._disp_drv.get_vertical_resolution() - 1
+
+        self._flush_cb(disp_drv, area, color_p)
 
     # we always register this callback no matter what. This is what tells LVGL
     # that the buffer is able to be written to. If this callback doesn't get
@@ -606,6 +1434,9 @@ class DisplayDriver:
     # using DMA and double buffer or a single buffer.
 
     def _flush_ready_cb(self, *_):
+        if self._fb_pool is not None:
+            self._fb_pool.flushed(self)
+
         self._disp_drv.flush_ready()
 
     def _madctl(self, colormode, rotations, rotation=None):
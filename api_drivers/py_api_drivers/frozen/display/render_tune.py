@@ -0,0 +1,330 @@
+# Copyright (c) 2024 - 2025 Kevin G. Schlosser
+
+# Finds the render mode and frame buffer size that gives the highest frame
+# rate for a display. A short workload gets rendered using each of the
+# render modes and buffer sizes the frame buffers of the display allow and
+# the best one gets saved so it can be used every time the board starts.
+#
+#     import render_tune
+#
+#     # only needs to be done a single time
+#     render_tune.tune(display)
+#
+#     # create the display using the saved buffer size
+#     display = st7789.ST7789(
+#         ...,
+#         frame_buffer1=render_tune.get_strategy(st7789.ST7789)
+#     )
+#     render_tune.apply(display)
+
+import gc
+import time
+import struct
+
+import lvgl as lv  # NOQA
+import display_driver_framework
+from touch_cal_data import NVS
+
+
+_NVS_NAME = 'render_tune'
+
+# render mode, buffer count, buffer size, frames per second
+_FORMAT = '<BBIf'
+
+# when the frame rates are this close (percent) the configuration that
+# uses less memory is used
+_FPS_TOLERANCE = 5
+
+_PARTIAL_DIVIDERS = (1, 2, 4)
+
+
+class RenderTuneData(object):
+
+    def __init__(self, name):
+        self._config = NVS(_NVS_NAME)
+        # NVS keys are limited to 15 characters
+        self._key = name[:15]
+
+        blob = bytearray(struct.calcsize(_FORMAT))
+        mv = memoryview(blob)
+        try:
+            self._config.get_blob(self._key, mv)
+        except OSError:
+            self.render_mode = None
+            self.buffer_count = None
+            self.buffer_size = None
+            self.fps = None
+        else:
+            (
+                self.render_mode, self.buffer_count,
+                self.buffer_size, self.fps
+            ) = struct.unpack(_FORMAT, blob)
+
+    @property
+    def is_valid(self):
+        return self.render_mode is not None
+
+    def save(self):
+        if self.render_mode is None:
+            try:
+                self._config.erase_key(self._key)
+            except OSError:
+                pass
+        else:
+            blob = bytearray(struct.pack(
+                _FORMAT,
+                self.render_mode,
+                self.buffer_count,
+                self.buffer_size,
+                self.fps
+            ))
+            self._config.set_blob(self._key, memoryview(blob))
+
+        self._config.commit()
+
+
+class TuneResult(object):
+
+    def __init__(self, render_mode, buffer_size, buffer_count):
+        self.render_mode = render_mode
+        self.buffer_size = buffer_size
+        self.buffer_count = buffer_count
+        self.fps = 0.0
+        # the lowest free heap seen after a frame was rendered. Memory that
+        # gets allocated and freed while a frame renders is not seen.
+        self.free_after_frame = 0
+
+    @property
+    def memory(self):
+        return self.buffer_size * self.buffer_count
+
+    def __str__(self):
+        if self.render_mode == lv.DISPLAY_RENDER_MODE.FULL:  # NOQA
+            mode = 'FULL'
+        elif self.render_mode == lv.DISPLAY_RENDER_MODE.DIRECT:  # NOQA
+            mode = 'DIRECT'
+        else:
+            mode = 'PARTIAL'
+
+        return (
+            f'{mode:<8}{self.buffer_count} x {self.buffer_size:>7} bytes  '
+            f'{self.fps:6.1f} fps  free after frame: {self.free_after_frame}'
+        )
+
+
+def _get_name(display):
+    if isinstance(display, type):
+        return display.__name__
+
+    return display.__class__.__name__
+
+
+def _get_candidates(display):
+    fb_size = len(display._frame_buffer1)  # NOQA
+
+    full_size = (
+        display.display_width *
+        display.display_height *
+        lv.color_format_get_size(display._color_space)  # NOQA
+    )
+    line_size = full_size // display.display_height
+
+    if display._frame_buffer2 is None:  # NOQA
+        counts = (1,)
+    else:
+        counts = (2, 1)
+
+    if fb_size >= full_size:
+        partial_size = full_size // 2
+    else:
+        partial_size = fb_size
+
+    sizes = []
+    for divider in _PARTIAL_DIVIDERS:
+        size = partial_size // divider
+        size = size // line_size * line_size
+        if size >= line_size and size not in sizes:
+            sizes.append(size)
+
+    candidates = []
+
+    for count in counts:
+        if fb_size >= full_size:
+            candidates.append(
+                TuneResult(lv.DISPLAY_RENDER_MODE.FULL, full_size, count))  # NOQA
+            if display._can_render_direct():  # NOQA
+                candidates.append(
+                    TuneResult(lv.DISPLAY_RENDER_MODE.DIRECT, full_size, count))  # NOQA
+
+        for size in sizes:
+            candidates.append(
+                TuneResult(lv.DISPLAY_RENDER_MODE.PARTIAL, size, count))  # NOQA
+
+    return candidates
+
+
+def _run_workload(display, scrn, objs, duration):
+    # moves small objects around and every 4th frame changes the whole
+    # screen so both small and large areas get rendered
+    disp = display._disp_drv  # NOQA
+    width = display.display_width
+    height = display.display_height
+
+    frames = 0
+    free_after_frame = gc.mem_free()  # NOQA
+    start = time.ticks_ms()  # NOQA
+
+    while time.ticks_diff(time.ticks_ms(), start) < duration:  # NOQA
+        for i, obj in enumerate(objs):
+            obj.set_pos(
+                (frames * (i + 3) * 7) % (width - 20),
+                (frames * (i + 2) * 5) % (height - 20)
+            )
+
+        if frames % 4 == 0:
+            scrn.set_style_bg_color(
+                lv.color_hex(0x202020 if frames % 8 else 0x404040), 0)
+
+        lv.refr_now(disp)  # NOQA
+        frames += 1
+
+        free = gc.mem_free()  # NOQA
+        if free < free_after_frame:
+            free_after_frame = free
+
+    elapsed = time.ticks_diff(time.ticks_ms(), start)  # NOQA
+
+    return frames * 1000.0 / elapsed, free_after_frame
+
+
+def tune(display, duration=1000, save=True, verbose=True):
+    """
+    Runs the workload for each render mode and buffer size for `duration`
+    milliseconds and sets the one with the highest frame rate. If `save` is
+    True it gets saved so it can be loaded using `apply` and
+    `get_strategy`.
+
+    Returns the results sorted best first.
+    """
+    prev_mode = display.get_render_mode()
+    if prev_mode[0] is None:
+        raise RuntimeError('the render mode of the display is not able to be changed')
+
+    candidates = _get_candidates(display)
+    if not candidates:
+        raise RuntimeError(
+            'there is nothing to tune, the frame buffer '
+            f'({len(display._frame_buffer1)} bytes) is smaller than '  # NOQA
+            'a single line of the display'
+        )
+
+    display.set_default()
+    disp = display._disp_drv  # NOQA
+    prev_scrn = disp.get_screen_active()
+
+    scrn = lv.obj()
+    objs = []
+    for i in range(4):
+        obj = lv.obj(scrn)
+        obj.set_size(20 + i * 10, 20 + i * 10)
+        objs.append(obj)
+
+    lv.screen_load(scrn)
+
+    results = []
+    try:
+        for result in candidates:
+            display.set_render_mode(
+                result.render_mode,
+                result.buffer_size,
+                result.buffer_count
+            )
+            gc.collect()
+
+            result.fps, result.free_after_frame = _run_workload(
+                display, scrn, objs, duration)
+            results.append(result)
+
+            if verbose:
+                print(result)
+    finally:
+        lv.screen_load(prev_scrn)
+        scrn.delete()
+        display.set_render_mode(*prev_mode)
+
+    # every result is compared against the highest frame rate so the order
+    # the candidates ran in doesn't change which one gets picked
+    top_fps = max(result.fps for result in results)
+    min_fps = top_fps * (100 - _FPS_TOLERANCE) / 100
+
+    best = None
+    for result in results:
+        if result.fps < min_fps:
+            continue
+
+        if (
+            best is None or
+            result.memory < best.memory or
+            (result.memory == best.memory and result.fps > best.fps)
+        ):
+            best = result
+
+    results.remove(best)
+    results.sort(key=lambda r: r.fps, reverse=True)
+    results.insert(0, best)
+
+    display.set_render_mode(
+        best.render_mode,
+        best.buffer_size,
+        best.buffer_count
+    )
+
+    if save:
+        data = RenderTuneData(_get_name(display))
+        data.render_mode = best.render_mode
+        data.buffer_count = best.buffer_count
+        data.buffer_size = best.buffer_size
+        data.fps = best.fps
+        data.save()
+
+    if verbose:
+        print('best:', best)
+
+    return results
+
+
+def get_strategy(display_class, memory=display_driver_framework.MEMORY_PREFER_INTERNAL):  # NOQA
+    """
+    Returns a `FrameBufferStrategy` that allocates buffers of the saved size
+    or None if the display has not been tuned.
+    """
+    data = RenderTuneData(_get_name(display_class))
+    if not data.is_valid:
+        return None
+
+    return display_driver_framework.FrameBufferStrategy(
+        size=data.buffer_size,
+        memory=memory,
+        buffers=data.buffer_count
+    )
+
+
+def apply(display):
+    """
+    Sets the saved render mode. Returns False if the display has not been
+    tuned or the frame buffers are too small for the saved configuration.
+    """
+    data = RenderTuneData(_get_name(display))
+    if not data.is_valid:
+        return False
+
+    try:
+        display.set_render_mode(
+            data.render_mode,
+            data.buffer_size,
+            data.buffer_count
+        )
+    except ValueError:
+        return False
+
+    return True
@@ -3,10 +3,18 @@
 import lvgl as lv  # NOQA
 import _indev_base
 import micropython  # NOQA
+import machine  # NOQA
+import task_handler
 from lcd_utils import remap as _remap  # NOQA
+from micropython import const  # NOQA
 
 remap = _remap
 
+# number of fractional bits used for the calibration matrix. This keeps the
+# calculations inside of the small int range with raw values up to 4095
+_CAL_SHIFT = const(14)
+_CAL_ROUND = const(1 << (_CAL_SHIFT - 1))
+
 
 class PointerDriver(_indev_base.IndevBase):
 
@@ -29,6 +37,14 @@ class PointerDriver(_indev_base.IndevBase):
         self._set_type(lv.INDEV_TYPE.POINTER)  # NOQA
         self._startup_rotation = startup_rotation
 
+        self._cal_matrix = None
+        self._cal_version = -1
+        self._update_cal_matrix()
+
+        self._int_pin = None
+        self._int_timer = None
+        self._int_scheduled = False
+
         self._indev_drv.enable(True)
 
     def enable_input_priority(self):
@@ -47,6 +63,85 @@ class PointerDriver(_indev_base.IndevBase):
         if last_state == self.PRESSED:
             lv.refr_now(self._disp_drv)
 
+    def enable_interrupt(self, pin=None, trigger=None, period=33):
+        # Only reads the touch IC after it signals a touch using its
+        # interrupt pin instead of reading it every time the indev timer
+        # runs. While the panel is being touched it gets read every `period`
+        # milliseconds, once released nothing gets read until the next
+        # interrupt. If `pin` is not given the interrupt pin the driver was
+        # constructed with gets used.
+        if pin is None:
+            pin = getattr(self, '_interrupt_pin', None)
+
+            if pin is None:
+                raise ValueError('an interrupt pin needs to be supplied')
+
+        if isinstance(pin, int):
+            pin = machine.Pin(pin, machine.Pin.IN)
+
+        if trigger is None:
+            # touch IC's pull the interrupt pin low to signal
+            trigger = pin.IRQ_FALLING
+
+        self.disable_interrupt()
+
+        # Allocation occurs here
+        self._int_read_ref = self._int_read
+
+        self._int_timer = lv.timer_create(self._int_timer_cb, period, None)  # NOQA
+        self._int_timer.pause()  # NOQA
+        self._int_scheduled = False
+
+        self._set_mode_event()
+
+        self._int_pin = pin
+        pin.irq(handler=self._int_cb, trigger=trigger)
+
+    def disable_interrupt(self):
+        if self._int_pin is None:
+            return
+
+        self._int_pin.irq(handler=None)
+        self._int_pin = None
+
+        self._int_timer.delete()  # NOQA
+        self._int_timer = None
+
+        self._indev_drv.set_mode(lv.INDEV_MODE.TIMER)  # NOQA
+
+    def _int_cb(self, _):
+        # this might get called from an ISR so no LVGL functions are able
+        # to be used here. If the panel is already being polled
+        # there is no need to do anything.
+        if self._int_scheduled or self._last_state == self.PRESSED:
+            return
+
+        try:
+            micropython.schedule(self._int_read_ref, None)
+            self._int_scheduled = True
+        except:  # NOQA
+            pass
+
+    def _int_read(self, _):
+        self._int_scheduled = False
+
+        if self._int_timer is None:
+            return
+
+        # the read gets done from the timer so it happens inside of
+        # lv.task_handler
+        self._int_timer.resume()  # NOQA
+        self._int_timer.ready()  # NOQA
+
+        if task_handler.TaskHandler.is_running():
+            task_handler.TaskHandler._current_instance.wake()  # NOQA
+
+    def _int_timer_cb(self, _):
+        self.read()
+
+        if self._last_state == self.RELEASED:
+            self._int_timer.pause()  # NOQA
+
     def calibrate(self):
         import touch_calibrate
 
@@ -77,34 +172,84 @@ class PointerDriver(_indev_base.IndevBase):
         # of (state, x, y) or None if no touch even has occured
         raise NotImplementedError
 
-    def _calc_coords(self, x, y):
-        if self.is_calibrated:  
-            cal = self._cal
-
-            # save original x value for use in y calculation
-            xt = x
-            x = int(round(x * cal.alphaX + y * cal.betaX + cal.deltaX))
-            y = int(round(xt * cal.alphaY + y * cal.betaY + cal.deltaY))
+    def _update_cal_matrix(self):
+        # The calibration, mirroring and startup rotation all get combined
+        # into a single fixed point affine matrix so calculating the
+        # coordinates only takes a few integer operations.
+        #   x = (a * raw_x + b * raw_y + c) >> _CAL_SHIFT
+        #   y = (d * raw_x + e * raw_y + f) >> _CAL_SHIFT
+        cal = self._cal
+        one = 1 << _CAL_SHIFT
+        max_x = (self._orig_width - 1) << _CAL_SHIFT
+        max_y = (self._orig_height - 1) << _CAL_SHIFT
+
+        if self.is_calibrated:
+            a = int(round(cal.alphaX * one))
+            b = int(round(cal.betaX * one))
+            c = int(round(cal.deltaX * one))
+            d = int(round(cal.alphaY * one))
+            e = int(round(cal.betaY * one))
+            f = int(round(cal.deltaY * one))
 
             if cal.mirrorX:
-                x = self._orig_width - x - 1
+                a, b, c = -a, -b, max_x - c
             if cal.mirrorY:
-                y = self._orig_height - y - 1
+                d, e, f = -d, -e, max_y - f
         else:
+            a, b, c = one, 0, 0
+            d, e, f = 0, one, 0
+
             if (
                 self._startup_rotation == lv.DISPLAY_ROTATION._180 or  # NOQA
                 self._startup_rotation == lv.DISPLAY_ROTATION._270  # NOQA
             ):
-                x = self._orig_width - x - 1
-                y = self._orig_height - y - 1
+                a, c = -one, max_x
+                e, f = -one, max_y
 
             if (
                 self._startup_rotation == lv.DISPLAY_ROTATION._90 or  # NOQA
                 self._startup_rotation == lv.DISPLAY_ROTATION._270  # NOQA
             ):
-                x, y = self._orig_height - y - 1, x
+                # x, y = height - y - 1, x
+                a, b, c, d, e, f = -d, -e, max_y - f, a, b, c
+
+        self._cal_matrix = (
+            a, b, c + _CAL_ROUND,
+            d, e, f + _CAL_ROUND
+        )
+        # calibration objects that don't have a version (a user supplied
+        # one that isn't a TouchCalData) get the matrix made a single time
+        self._cal_version = getattr(cal, 'version', 0)
 
-        return x, y
+    def _calc_coords(self, x, y):
+        if self._cal_version != getattr(self._cal, 'version', 0):
+            self._update_cal_matrix()
+
+        a, b, c, d, e, f = self._cal_matrix
+
+        return (
+            (a * x + b * y + c) >> _CAL_SHIFT,
+            (d * x + e * y + f) >> _CAL_SHIFT
+        )
+
+    def calc_coords(self, points, count=-1):
+        # Converts raw coordinates to display coordinates in place. `points`
+        # holds x and y values one after the other, an array('h') of the
+        # samples from a multi touch read for example. `count` is the number
+        # of points to convert, all of them are converted if it is -1.
+        if self._cal_version != getattr(self._cal, 'version', 0):
+            self._update_cal_matrix()
+
+        a, b, c, d, e, f = self._cal_matrix
+
+        if count == -1:
+            count = len(points) // 2
+
+        for i in range(0, count * 2, 2):
+            x = points[i]
+            y = points[i + 1]
+            points[i] = (a * x + b * y + c) >> _CAL_SHIFT
+            points[i + 1] = (d * x + e * y + f) >> _CAL_SHIFT
 
     def _read(self, drv, data):  # NOQA
         coords = self._get_coords()
@@ -116,12 +261,16 @@ class PointerDriver(_indev_base.IndevBase):
         else:
             state, x, y = coords
 
-        if None in (x, y):
+        if x is None or y is None:
             x, y = self._last_x, self._last_y
 
-        data.point.x, data.point.y = (
-            self._calc_coords(x, y)
-        )
+        if self._cal_version != getattr(self._cal, 'version', 0):
+            self._update_cal_matrix()
+
+        a, b, c, d, e, f = self._cal_matrix
+        point = data.point
+        point.x = (a * x + b * y + c) >> _CAL_SHIFT
+        point.y = (d * x + e * y + f) >> _CAL_SHIFT
 
         data.state = state
 
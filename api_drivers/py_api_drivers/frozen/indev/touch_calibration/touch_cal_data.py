@@ -117,6 +117,9 @@ class TouchCalData(object):
             ) = struct.unpack("<ffffffBB", blob)
 
         self._is_dirty = False
+        # gets incremented every time a value changes so the pointer driver
+        # knows when it needs to recalculate the calibration
+        self.version = 0
 
     def save(self):
         if self._is_dirty:
@@ -161,6 +164,7 @@ class TouchCalData(object):
             self._mirrorX = int(value)
 
         self._is_dirty = True
+        self.version += 1
 
     @property
     def mirrorY(self):
@@ -177,6 +181,7 @@ class TouchCalData(object):
             self._mirrorY = int(value)
 
         self._is_dirty = True
+        self.version += 1
 
     @property
     def alphaX(self):
@@ -190,6 +195,7 @@ class TouchCalData(object):
             self._alphaX = round(value, 7)
 
         self._is_dirty = True
+        self.version += 1
 
     @property
     def betaX(self):
@@ -203,6 +209,7 @@ class TouchCalData(object):
             self._betaX = round(value, 7)
 
         self._is_dirty = True
+        self.version += 1
 
     @property
     def deltaX(self):
@@ -216,6 +223,7 @@ class TouchCalData(object):
             self._deltaX = round(value, 7)
 
         self._is_dirty = True
+        self.version += 1
 
     @property
     def alphaY(self):
@@ -229,6 +237,7 @@ class TouchCalData(object):
             self._alphaY = round(value, 7)
 
         self._is_dirty = True
+        self.version += 1
 
     @property
     def betaY(self):
@@ -242,6 +251,7 @@ class TouchCalData(object):
             self._betaY = round(value, 7)
 
         self._is_dirty = True
+        self.version += 1
 
     @property
     def deltaY(self):
@@ -255,6 +265,7 @@ class TouchCalData(object):
             self._deltaY = round(value, 7)
 
         self._is_dirty = True
+        self.version += 1
 
     def reset(self):
         self.alphaX = None
@@ -267,4 +278,5 @@ class TouchCalData(object):
         self._mirrorY = None
 
         self._is_dirty = True
+        self.version += 1
         self.save()
@@ -1,8 +1,27 @@
 # Copyright (c) 2024 - 2025 Kevin G. Schlosser
+import time
 import machine
 import lcd_utils
 
 
+class _Batch(object):
+
+    def __init__(self, pin_cls):
+        self._pin_cls = pin_cls
+
+    def __enter__(self):
+        self._pin_cls._batch_depth += 1
+        return self._pin_cls
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        cls = self._pin_cls
+        cls._batch_depth -= 1
+
+        if not cls._batch_depth and cls._batch_dirty:
+            cls._batch_dirty = False
+            cls._write_outputs(cls._output_states)
+
+
 class Pin(object):
     IN = 0x00
     OUT = 0x01
@@ -19,8 +38,30 @@ class Pin(object):
 
     _device = None
 
+    # these are shared by all of the pins of an expander. The bits in the
+    # states map to the pins the same way Pin._bit does.
+    _output_states = 0x00
+    _input_states = 0x00
+    _input_valid = False
+    _input_time = 0
+    _input_cache_time = 0
+
+    _batch_depth = 0
+    _batch_dirty = False
+
+    _port_buf = bytearray(2)
+    _port_mv = memoryview(_port_buf)
+
     @classmethod
     def _int_cb(cls, _):
+        # the expander only signals the interrupt when an input changes, so
+        # the inputs get read a single time here for all of the pins and
+        # the cached value is used until the next interrupt.
+        cls._input_valid = False
+
+        if cls._reg_int_pins:
+            cls.read_port()
+
         for ext_pin in cls._reg_int_pins:
             ext_pin._interrupt_cb()  # NOQA
 
@@ -73,6 +114,64 @@ class Pin(object):
 
         cls._device = device
 
+    @classmethod
+    def set_input_cache_time(cls, ms):
+        # how long in milliseconds the input states that have been read
+        # get used for before they are read again. This is only used when
+        # there is no interrupt pin set.
+        cls._input_cache_time = ms
+
+    @classmethod
+    def read_port(cls):
+        if cls._input_valid:
+            if cls._int_pin is not None:
+                return cls._input_states
+
+            if (
+                time.ticks_diff(time.ticks_ms(), cls._input_time) <  # NOQA
+                cls._input_cache_time
+            ):
+                return cls._input_states
+
+        cls._input_states = cls._read_inputs()
+        cls._input_time = time.ticks_ms()  # NOQA
+        cls._input_valid = True
+
+        return cls._input_states
+
+    @classmethod
+    def write_port(cls, set_mask=0, clear_mask=0):
+        states = (cls._output_states | set_mask) & ~clear_mask
+
+        # only write if there is an actual change
+        if states == cls._output_states:
+            return
+
+        cls._output_states = states
+
+        if cls._batch_depth:
+            cls._batch_dirty = True
+        else:
+            cls._write_outputs(states)
+
+    @classmethod
+    def batch(cls):
+        # pin changes made inside of the with block get written all at
+        # once when the block exits.
+        #
+        #   with Pin.batch():
+        #       reset_pin.value(0)
+        #       cs_pin.value(1)
+        return _Batch(cls)
+
+    @classmethod
+    def _write_outputs(cls, states):
+        raise NotImplementedError
+
+    @classmethod
+    def _read_inputs(cls):
+        raise NotImplementedError
+
     def __init__(self, id, mode=-1, pull=-1, value=-1):  # NOQA
         if Pin._device is None:
             raise RuntimeError('The expander device has not been set')
@@ -93,6 +192,7 @@ class Pin(object):
         if mode != -1:
             self._set_dir(mode)
             self._mode = mode
+            self.__class__._input_valid = False
 
         if pull is None or pull != -1:
             self._set_pull(pull)
@@ -151,6 +251,10 @@ class Pin(object):
 
         self.init(mode=mode)
 
+    @property
+    def _bit(self):
+        return 1 << self._id
+
     def _set_irq(self, handler, trigger):
         raise NotImplementedError
 
@@ -161,10 +265,21 @@ class Pin(object):
         raise NotImplementedError
 
     def _set_level(self, level):
-        raise NotImplementedError
+        if self._mode == self.OUT:
+            if level:
+                self.write_port(set_mask=self._bit)
+            else:
+                self.write_port(clear_mask=self._bit)
 
     def _get_level(self):
-        raise NotImplementedError
+        if self._mode == self.IN:
+            states = self.read_port()
+        elif self._mode == self.OUT:
+            states = self._output_states
+        else:
+            raise ValueError('Unsupported pin mode')
+
+        return int(bool(states & self._bit))
 
 
 class PWM:
@@ -23,7 +23,9 @@ def _fs_open_cb(drv, path, mode):
     except OSError as e:
         raise RuntimeError("fs_open_callback(%s) exception: %s" % (path, e))
 
-    return {'file' : f, 'path': path}
+    # the memoryviews get pointed at the buffers LVGL passes to the callbacks
+    # so a new memoryview doesn't get made every time a callback is called
+    return {'file' : f, 'path': path, 'buf_view': None, 'int_view': None}
 
 
 def _fs_close_cb(drv, fs_file):
@@ -36,12 +38,20 @@ def _fs_close_cb(drv, fs_file):
 
 
 def _fs_read_cb(drv, fs_file, buf, btr, br):
+    data = fs_file.__cast__()
     try:
-        tmp_data = fs_file.__cast__()['file'].read(btr)
-        buf.__dereference__(btr)[0:len(tmp_data)] = tmp_data
-        br.__dereference__(4)[0:4] = struct.pack("<L", len(tmp_data))
+        if btr:
+            buf_view = buf.__dereference__(btr, data['buf_view'])
+            data['buf_view'] = buf_view
+            read = data['file'].readinto(buf_view) or 0
+        else:
+            read = 0
+
+        int_view = br.__dereference__(4, data['int_view'])
+        data['int_view'] = int_view
+        struct.pack_into("<L", int_view, 0, read)
     except OSError as e:
-        raise RuntimeError("fs_read_callback(%s) exception %s" % (fs_file.__cast__()['path'], e))
+        raise RuntimeError("fs_read_callback(%s) exception %s" % (data['path'], e))
 
     return lv.FS_RES.OK
 
@@ -56,21 +66,33 @@ def _fs_seek_cb(drv, fs_file, pos, whence):
 
 
 def _fs_tell_cb(drv, fs_file, pos):
+    data = fs_file.__cast__()
     try:
-        tpos = fs_file.__cast__()['file'].tell()
-        pos.__dereference__(4)[0:4] = struct.pack("<L", tpos)
+        tpos = data['file'].tell()
+        int_view = pos.__dereference__(4, data['int_view'])
+        data['int_view'] = int_view
+        struct.pack_into("<L", int_view, 0, tpos)
     except OSError as e:
-        raise RuntimeError("fs_tell_callback(%s) exception %s" % (fs_file.__cast__()['path'], e))
+        raise RuntimeError("fs_tell_callback(%s) exception %s" % (data['path'], e))
 
     return lv.FS_RES.OK
 
 
 def _fs_write_cb(drv, fs_file, buf, btw, bw):
+    data = fs_file.__cast__()
     try:
-        wr = fs_file.__cast__()['file'].write(buf.__dereference__(btw)[0:btw])
-        bw.__dereference__(4)[0:4] = struct.pack("<L", wr)
+        if btw:
+            buf_view = buf.__dereference__(btw, data['buf_view'])
+            data['buf_view'] = buf_view
+            wr = data['file'].write(buf_view) or 0
+        else:
+            wr = 0
+
+        int_view = bw.__dereference__(4, data['int_view'])
+        data['int_view'] = int_view
+        struct.pack_into("<L", int_view, 0, wr)
     except OSError as e:
-        raise RuntimeError("fs_write_callback(%s) exception %s" % (fs_file.__cast__()['path'], e))
+        raise RuntimeError("fs_write_callback(%s) exception %s" % (data['path'], e))
 
     return lv.FS_RES.OK
 
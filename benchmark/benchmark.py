@@ -0,0 +1,343 @@
+# Copyright (c) 2024 - 2025 Kevin G. Schlosser
+
+# Headless benchmark for the unix port.
+#
+# This gets run using the unix firmware and needs no window or hardware. The
+# display driver flushes to `lcd_bus.MemoryBus` which only keeps the data in
+# RAM. Every scene is run for a fixed number of frames using a fixed tick so
+# the amount of rendering that gets done is the same for every run.
+#
+#   build/lvgl_micropy_unix benchmark/benchmark.py [options]
+#
+#   --width <px>          display width (default 320)
+#   --height <px>         display height (default 240)
+#   --frames <n>          frames rendered per scene (default 100)
+#   --buffer-lines <n>    lines in the frame buffer (default height / 10)
+#   --scenes <a,b,...>    only run these scenes
+#   --output <file>       write the results to a file instead of stdout
+#   --baseline <file>     compare the results to a previous run
+#   --tolerance <pct>     allowed regression in percent (default 10)
+#
+# When comparing to a baseline the exit code is 1 if any scene regressed.
+
+import sys
+import gc
+import time
+import json
+
+from micropython import const  # NOQA
+
+import lvgl as lv  # NOQA
+import lcd_bus  # NOQA
+import display_driver_framework
+
+
+_FRAME_PERIOD = const(33)
+
+
+# ================= scenes =================
+# every scene has a setup function that gets passed the screen and returns
+# a function that gets called before each frame is rendered.
+
+def _scene_widgets(scr):
+    # create and delete a screen full of widgets every frame
+    def _frame(frame):
+        scr.clean()
+
+        for i in range(12):
+            btn = lv.button(scr)
+            btn.set_size(90, 30)
+            btn.set_pos((i % 3) * 100 + 5, (i // 3) * 40 + 5)
+            label = lv.label(btn)
+            label.set_text('Button {}'.format(frame + i))
+            label.center()
+
+        slider = lv.slider(scr)
+        slider.set_width(200)
+        slider.set_value(frame % 100, lv.ANIM.OFF)  # NOQA
+        slider.align(lv.ALIGN.BOTTOM_MID, 0, -10)  # NOQA
+
+    return _frame
+
+
+def _scene_list(scr):
+    # scroll a long list
+    lst = lv.list(scr)
+    lst.set_size(lv.pct(100), lv.pct(100))
+
+    for i in range(100):
+        lst.add_button(None, 'Item {}'.format(i))
+
+    def _frame(frame):
+        if (frame // 50) % 2:
+            lst.scroll_by(0, 10, lv.ANIM.OFF)  # NOQA
+        else:
+            lst.scroll_by(0, -10, lv.ANIM.OFF)  # NOQA
+
+    return _frame
+
+
+def _scene_chart(scr):
+    # add a point to every series of a chart
+    chart = lv.chart(scr)
+    chart.set_size(lv.pct(100), lv.pct(100))
+    chart.set_type(lv.chart.TYPE.LINE)  # NOQA
+    chart.set_point_count(50)
+
+    series = [
+        chart.add_series(lv.palette_main(lv.PALETTE.RED), lv.chart.AXIS.PRIMARY_Y),  # NOQA
+        chart.add_series(lv.palette_main(lv.PALETTE.BLUE), lv.chart.AXIS.PRIMARY_Y)  # NOQA
+    ]
+
+    def _frame(frame):
+        # pseudo random values that are the same for every run
+        value = (frame * 37) % 100
+        chart.set_next_value(series[0], value)
+        chart.set_next_value(series[1], 100 - value)
+
+    return _frame
+
+
+def _scene_image(scr):
+    # rotate and scale an RGB565 image, the image gets transformed in
+    # software every frame
+    width = 64
+    height = 64
+    data = bytearray(width * height * 2)
+
+    for y in range(height):
+        for x in range(width):
+            color = ((x * 31 // width) << 11) | ((y * 63 // height) << 5) | 0x0F
+            index = (y * width + x) * 2
+            data[index] = color & 0xFF
+            data[index + 1] = color >> 8
+
+    dsc = lv.image_dsc_t(
+        dict(
+            header=dict(
+                cf=lv.COLOR_FORMAT.RGB565,  # NOQA
+                w=width,
+                h=height,
+                stride=width * 2
+            ),
+            data_size=len(data),
+            data=data
+        )
+    )
+
+    img = lv.image(scr)
+    img.set_src(dsc)
+    img.center()
+
+    def _frame(frame):
+        img.set_rotation((frame * 50) % 3600)
+        img.set_scale(256 + (frame % 20) * 10)
+
+    return _frame
+
+
+SCENES = (
+    ('widgets', _scene_widgets),
+    ('list', _scene_list),
+    ('chart', _scene_chart),
+    ('image', _scene_image),
+)
+
+
+def run_scene(display, bus, setup, frames):
+    scr = lv.obj()
+    lv.screen_load(scr)
+
+    frame_cb = setup(scr)
+
+    # the tick is fed by hand instead of using the task handler so every
+    # run renders exactly the same frames. The first frame gets rendered
+    # before starting the measurement so the results don't include the time
+    # it takes to draw the initial screen.
+    lv.tick_inc(_FRAME_PERIOD)
+    lv.task_handler()
+    lv.refr_now(display._disp_drv)  # NOQA
+
+    gc.collect()
+    bus.reset_stats()
+    # the heap is only able to be read between frames, this is the most
+    # that was allocated after a frame was done and not the peak while
+    # rendering
+    heap_start = gc.mem_alloc()
+    heap_max = heap_start
+
+    start_time = time.ticks_us()  # NOQA
+
+    for frame in range(frames):
+        frame_cb(frame)
+        lv.tick_inc(_FRAME_PERIOD)
+        lv.task_handler()
+        lv.refr_now(display._disp_drv)  # NOQA
+
+        heap = gc.mem_alloc()
+        if heap > heap_max:
+            heap_max = heap
+
+    elapsed = time.ticks_diff(time.ticks_us(), start_time)  # NOQA
+    stats = bus.get_stats()
+
+    res = dict(
+        frames=frames,
+        time_us=elapsed,
+        fps=round(frames * 1000000 / elapsed, 2) if elapsed else 0,
+        flush_count=stats['tx_color_count'],
+        flush_bytes=stats['tx_color_bytes'],
+        param_count=stats['tx_param_count'],
+        param_bytes=stats['tx_param_bytes'],
+        heap_after_frame=heap_max - heap_start
+    )
+
+    lv.screen_load(lv.obj())
+    scr.delete()
+    gc.collect()
+
+    return res
+
+
+# metric: True if a higher value is better
+_COMPARE = (
+    ('fps', True),
+    ('flush_count', False),
+    ('flush_bytes', False),
+    ('param_count', False),
+    ('heap_after_frame', False),
+)
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+
+    for name, res in results['scenes'].items():
+        if name not in baseline.get('scenes', {}):
+            continue
+
+        base = baseline['scenes'][name]
+
+        for metric, higher_is_better in _COMPARE:
+            if metric not in base:
+                continue
+
+            old = base[metric]
+            new = res[metric]
+
+            if old == 0:
+                change = 0.0 if new == 0 else 100.0
+            else:
+                change = (new - old) * 100.0 / old
+
+            if higher_is_better:
+                change = -change
+
+            if change > tolerance:
+                regressions.append(
+                    dict(
+                        scene=name,
+                        metric=metric,
+                        baseline=old,
+                        value=new,
+                        change=round(change, 2)
+                    )
+                )
+
+    return regressions
+
+
+def _parse_args(argv):
+    args = dict(
+        width=320,
+        height=240,
+        frames=100,
+        buffer_lines=None,
+        scenes=None,
+        output=None,
+        baseline=None,
+        tolerance=10.0
+    )
+
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        if not arg.startswith('--') or i + 1 == len(argv):
+            raise ValueError('invalid argument "{}"'.format(arg))
+
+        key = arg[2:].replace('-', '_')
+        value = argv[i + 1]
+        i += 2
+
+        if key not in args:
+            raise ValueError('unknown argument "{}"'.format(arg))
+
+        if key in ('width', 'height', 'frames', 'buffer_lines'):
+            value = int(value)
+        elif key == 'tolerance':
+            value = float(value)
+        elif key == 'scenes':
+            value = value.split(',')
+
+        args[key] = value
+
+    return args
+
+
+def main(argv):
+    args = _parse_args(argv)
+
+    width = args['width']
+    height = args['height']
+    buffer_lines = args['buffer_lines'] or max(1, height // 10)
+
+    bus = lcd_bus.MemoryBus()
+    fb = bus.allocate_framebuffer(width * buffer_lines * 2, 0)
+
+    display = display_driver_framework.DisplayDriver(
+        data_bus=bus,
+        display_width=width,
+        display_height=height,
+        frame_buffer1=fb,
+        color_space=lv.COLOR_FORMAT.RGB565  # NOQA
+    )
+    display._initilized = True  # NOQA
+
+    results = dict(
+        width=width,
+        height=height,
+        buffer_size=len(fb),
+        platform=sys.platform,
+        scenes={}
+    )
+
+    for name, setup in SCENES:
+        if args['scenes'] is not None and name not in args['scenes']:
+            continue
+
+        results['scenes'][name] = run_scene(display, bus, setup, args['frames'])
+
+    ret = 0
+
+    if args['baseline'] is not None:
+        with open(args['baseline'], 'r') as f:
+            baseline = json.load(f)
+
+        regressions = compare(results, baseline, args['tolerance'])
+        results['regressions'] = regressions
+        if regressions:
+            ret = 1
+
+    output = json.dumps(results)
+
+    if args['output'] is None:
+        print(output)
+    else:
+        with open(args['output'], 'w') as f:
+            f.write(output)
+
+    return ret
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -1,12 +1,18 @@
 # Copyright (c) 2024 - 2025 Kevin G. Schlosser
 
 import shutil
+import filecmp
 import sys
 import os
 import subprocess
 import threading
 import random
-import queue
+import selectors
+
+from . import init_table
+from . import stages
+from . import compiler_cache
+from . import output as output_sinks
 
 _windows_env = None
 
@@ -77,6 +83,14 @@ def copy_micropy_updates(port):
 
                 iter_files(src_file, dst_file, org_file)
             else:
+                # files that are already up to date are not touched so make
+                # doesn't compile them again
+                if (
+                    os.path.isfile(dst_file) and
+                    filecmp.cmp(src_file, dst_file, shallow=False)
+                ):
+                    continue
+
                 if os.path.isfile(dst_file):        # backup file if it exits
                     shutil.copyfile(dst_file, org_file)
                 shutil.copyfile(src_file, dst_file)
@@ -85,8 +99,17 @@ def copy_micropy_updates(port):
 
 
 def write_file(file, data):
+    data = data.encode('utf-8')
+
+    # keeps the modification time if nothing changed so make doesn't
+    # compile the file again
+    if os.path.exists(file):
+        with open(file, 'rb') as f:
+            if f.read() == data:
+                return
+
     with open(file, 'wb') as f:
-        f.write(data.encode('utf-8'))
+        f.write(data)
 
 
 def read_file(port, file):
@@ -243,6 +266,7 @@ def generate_manifest(
     frozen_manifest_files = [
         f'{api_path}/frozen/display/display_driver_framework.py',
         f'{api_path}/frozen/display/rgb_display_framework.py',
+        f'{api_path}/frozen/display/render_tune.py',
         f'{api_path}/frozen/indev/touch_calibration/touch_cal_data.py',
         f'{api_path}/frozen/indev/touch_calibration/touch_calibrate.py',
         f'{api_path}/frozen/indev/_indev_base.py',
@@ -448,9 +472,21 @@ def generate_manifest(
                 if not file_name.endswith('.py'):
                     continue
 
-                print(os.path.join(tmp_file, file_name))
+                file_path = os.path.join(tmp_file, file_name)
+
+                # the init commands get compiled into init tables
+                if init_table.is_init_module(file_name):
+                    file_path = init_table.convert_file(
+                        file_path,
+                        os.path.abspath(
+                            f'build/init_tables/{os.path.split(tmp_file)[-1]}'
+                        )
+                    )
+
+                print(file_path)
 
-                entry = f"freeze('{tmp_file}', '{file_name}')"
+                file_path = os.path.split(file_path)[0]
+                entry = f"freeze('{file_path}', '{file_name}')"
                 if entry not in manifest_files:
                     manifest_files.append(entry)
         else:
@@ -462,8 +498,7 @@ def generate_manifest(
 
     manifest_files = '\n'.join(manifest_files)
 
-    with open('build/manifest.py', 'w') as f:
-        f.write(manifest_files)
+    write_file('build/manifest.py', manifest_files)
 
     return display_paths
 
@@ -569,146 +604,86 @@ def _convert_line(lne):
     try:
         lne = lne.decode('utf-8')
     except UnicodeDecodeError:
-        for char in lne:
-            if 32 <= char <= 125 or char in (b'\r', b'\n'):
-                continue
-
-            lne = lne.replace(char, b'')
+        lne = bytes(
+            char for char in lne
+            if 32 <= char <= 125 or char in (ord('\r'), ord('\n'))
+        )
         lne = lne.decode('utf-8')
 
     return lne
 
 
-def process_output(myproc, out_to_screen, spinner, cmpl, out_queue):
-    line = b''
-    err_line = b''
-    last_line_len = -1
-    line_updated = False
-    err_updated = False
+# sinks that get added to every call to spawn, a log file for example
+default_sinks = []
 
-    os.set_blocking(myproc.stdout.fileno(), False)
-    os.set_blocking(myproc.stderr.fileno(), False)
+_READ_SIZE = 65536
 
-    event = threading.Event()
-    spinner_lock = threading.Lock()
-    if spinner:
-        t = threading.Thread(target=_busy_spinner, args=(event, spinner_lock))
-        t.daemon = True
-        t.start()
-    else:
-        t = None
 
-    while True:
-        # --- extract line using read(1)
-        out = myproc.stdout.read(1)
-        while out:
-            line_updated = True
-            line += out
-            if out == b'\n':
-                line = _convert_line(line.strip())
-                if not line:
-                    line = b''
-                    break
-
-                out_queue.put(line)
-
-                if out_to_screen:
-                    if (
-                        cmpl and (
-                            line.startswith('[') or
-                            line.startswith('CC ') or
-                            line.startswith('MPY ') or
-                            (
-                                line.startswith('--') and
-                                len(line) <= 80
-                            )
-                        )
-                    ):
-                        if last_line_len != -1:
-                            sys.stdout.write('\r')
-                            sys.stdout.flush()
-
-                        if len(line) < last_line_len:
-                            padding = ' ' * (last_line_len - len(line))
-                        else:
-                            padding = ''
-
-                        sys.stdout.write(line + padding)
-                        sys.stdout.flush()
-
-                        last_line_len = len(line)
-                    else:
-                        if last_line_len == -1:
-                            if spinner:
-                                with spinner_lock:
-                                    sys.stdout.write('\r' + line + '\n')
-                                    sys.stdout.flush()
-                            else:
-                                sys.stdout.write(line + '\n')
-                                sys.stdout.flush()
-                        else:
-                            if spinner:
-                                with spinner_lock:
-                                    sys.stdout.write('\r' + line + '\n')
-                                    sys.stdout.flush()
-                            else:
-                                sys.stdout.write('\n' + line + '\n')
-                                sys.stdout.flush()
-
-                            last_line_len = -1
-
-                line = b''
-
-            out = myproc.stdout.read(1)
-
-        out = myproc.stderr.read(1)
-
-        while out:
-            err_updated = True
-            if not spinner and out_to_screen and cmpl and last_line_len != -1:
-                sys.stdout.write('\n')
-                sys.stdout.flush()
-                last_line_len = -1
-
-            err_line += out
-            if out == b'\n':
-                err_line = _convert_line(err_line.strip())
-                if not err_line:
-                    err_line = b''
-                    break
-
-                out_queue.put(err_line)
-                if out_to_screen:
-                    if spinner:
-                        with spinner_lock:
-                            sys.stderr.write('\r' + err_line + '\n')
-                            sys.stdout.flush()
-                    else:
-                        sys.stderr.write(err_line + '\n')
-                        sys.stderr.flush()
-
-                err_line = b''
-
-            out = myproc.stderr.read(1)
-
-        if not err_updated and not line_updated:
-            if myproc.poll() is not None:
-                break
-            event.wait(0.1)
+def process_output(myproc, sinks):
+    """
+    Reads the output of a process and passes every line to the sinks.
 
-        err_updated = False
-        line_updated = False
+    The output is read in large chunks when it is available and split into
+    lines. Blank lines are skipped. Returns the resource usage of the
+    process or None if it is not available.
+    """
+    selector = selectors.DefaultSelector()
+    buffers = {}
 
-    if t is not None:
-        event.set()
-        t.join()
+    for stream, is_err in ((myproc.stdout, False), (myproc.stderr, True)):
+        fd = stream.fileno()
+        os.set_blocking(fd, False)
+        selector.register(fd, selectors.EVENT_READ, is_err)
+        buffers[fd] = b''
+
+    def _dispatch(lne, is_err):
+        lne = _convert_line(lne.strip())
+        if not lne:
+            return
+
+        for sink in sinks:
+            sink.line(lne, is_err)
+
+    while selector.get_map():
+        for key, _ in selector.select():
+            fd = key.fd
+
+            try:
+                data = os.read(fd, _READ_SIZE)
+            except BlockingIOError:
+                continue
+
+            if not data:
+                selector.unregister(fd)
+                if buffers[fd]:
+                    _dispatch(buffers[fd], key.data)
+                continue
 
-    elif out_to_screen and cmpl and last_line_len != -1:
-        sys.stdout.write('\n')
-        sys.stdout.flush()
+            lines = (buffers[fd] + data).split(b'\n')
+            buffers[fd] = lines.pop()
 
+            for lne in lines:
+                _dispatch(lne, key.data)
 
-def spawn(cmd_, out_to_screen=True, spinner=False, env=None, cmpl=False):
+    selector.close()
+
+    # os.wait4 gives the resource usage of the process and its children
+    if hasattr(os, 'wait4'):
+        _, status, rusage = os.wait4(myproc.pid, 0)
+        myproc.returncode = os.waitstatus_to_exitcode(status)
+    else:
+        myproc.wait()
+        rusage = None
+
+    for sink in sinks:
+        sink.close()
+
+    return rusage
+
+
+def spawn(
+    cmd_, out_to_screen=True, spinner=False, env=None, cmpl=False, sinks=None
+):
 
     if env is None:
         env = os.environ
@@ -718,7 +693,29 @@ def spawn(cmd_, out_to_screen=True, spinner=False, env=None, cmpl=False):
 
     cmd_ = list(' '.join(c) for c in cmd_)
 
-    que = queue.Queue()
+    if spinner:
+        event = threading.Event()
+        spinner_lock = threading.Lock()
+        t = threading.Thread(target=_busy_spinner, args=(event, spinner_lock))
+        t.daemon = True
+        t.start()
+    else:
+        event = None
+        spinner_lock = None
+        t = None
+
+    output = output_sinks.CollectSink()
+    all_sinks = [output]
+
+    if out_to_screen:
+        all_sinks.append(output_sinks.ScreenSink(cmpl, spinner_lock))
+
+    all_sinks.extend(default_sinks)
+
+    if sinks is not None:
+        all_sinks.extend(sinks)
+
+    start = stages.spawn_start()
 
     p = subprocess.Popen(
         'bash',
@@ -729,19 +726,9 @@ def spawn(cmd_, out_to_screen=True, spinner=False, env=None, cmpl=False):
         env=env
     )
 
-    os.set_blocking(p.stdout.fileno(), False)
-    os.set_blocking(p.stderr.fileno(), False)
-
-    proc_thread = threading.Thread(
-        target=process_output,
-        args=(p, out_to_screen, spinner, cmpl, que)
-    )
-
-    proc_thread.start()
-    output_buffer = []
-
-    while cmd_:
-        item = cmd_.pop(0)
+    # the commands are small so they are able to be written before reading
+    # the output without the pipe filling up
+    for item in cmd_:
         # if sys.platform.startswith('darwin'):
         #     if item.startswith('make '):
         #         item = 'g' + item
@@ -752,27 +739,20 @@ def spawn(cmd_, out_to_screen=True, spinner=False, env=None, cmpl=False):
         if 'GITHUB_RUN_ID' in os.environ:
             print(item)
 
+        for sink in all_sinks:
+            sink.command(item)
+
         p.stdin.write(item.encode('utf-8') + b'\n')
 
     p.stdin.close()
 
-    while proc_thread and proc_thread.is_alive():  # wait for thread to finish
-        try:
-            line = que.get_nowait()  # or q.get(timeout=.1)
-            output_buffer.append(line)
-        except queue.Empty:
-            pass
-        try:
-            proc_thread.join(0.025)
-        except:  # NOQA
-            break
-
-    while True:
-        try:
-            line = que.get_nowait()  # or q.get(timeout=.1)
-            output_buffer.append(line)
-        except queue.Empty:
-            break
+    rusage = process_output(p, all_sinks)
+
+    if t is not None:
+        event.set()
+        t.join()
+
+    stages.spawn_end(cmd_, start, p.returncode, rusage)
 
     if not p.stdout.closed:
         p.stdout.close()
@@ -780,7 +760,7 @@ def spawn(cmd_, out_to_screen=True, spinner=False, env=None, cmpl=False):
     if not p.stderr.closed:
         p.stderr.close()
 
-    output_buffer = '\n'.join(output_buffer)
+    output_buffer = '\n'.join(output.lines)
 
     if out_to_screen:
         if spinner:
@@ -812,7 +792,10 @@ def submodules():
 
 
 def compile(*args):  # NOQA
-    return_code, _ = spawn(compile_cmd)
+    cmd_ = compile_cmd[:]
+    cmd_.extend(compiler_cache.make_args('arm-none-eabi-gcc'))
+
+    return_code, _ = spawn(cmd_)
     if return_code != 0:
         sys.exit(return_code)
 
@@ -0,0 +1,374 @@
+# Copyright (c) 2024 - 2025 Kevin G. Schlosser
+
+# Builds the firmware for a number of toml files at the same time.
+#
+#   python3 make.py batch [--jobs=<n>] <toml> [<toml> ...] [build options]
+#
+# A toml is either a path or the name of a file in display_configs (without
+# the ".toml"). Any other options get passed to every build.
+#
+# The builders patch files in the MicroPython sources and write to the build
+# folder so every build needs its own copy of the source tree. The first
+# build for each target is done in the source tree, this sets up the
+# submodules and compiles mpy-cross. The rest of the builds run at the same
+# time in work directories in build/batch/work. A work directory has a copy
+# of the files that get changed by a build and links to the submodules,
+# mpy-cross and the rest of the files that are only read. The generated
+# LVGL bindings are shared using the binding generator cache so builds with
+# identical configurations only generate them once.
+#
+# The output of each build is written to build/batch/<name>.log and the
+# files the build creates are copied to build/batch/<name>.
+
+import os
+import sys
+import time
+import shutil
+import subprocess
+import concurrent.futures
+
+from argparse import ArgumentParser
+
+
+# directories in lib/micropython that are shared between the work
+# directories, these are only read during a build
+_SHARED_MICROPY_DIRS = ('lib', 'mpy-cross')
+
+# submodules that are shared between the work directories
+_SHARED_LIBS = ('lvgl', 'SDL', 'pycparser', 'esp-idf')
+
+
+def _sync_tree(src, dst, ignore=()):
+    """
+    Copies a directory tree, only files that have changed get copied so
+    the build in the work directory stays incremental.
+    """
+    if not os.path.exists(dst):
+        os.makedirs(dst)
+
+    for name in os.listdir(src):
+        if name in ignore or name == '__pycache__':
+            continue
+
+        src_path = os.path.join(src, name)
+        dst_path = os.path.join(dst, name)
+
+        if os.path.islink(src_path):
+            if not os.path.lexists(dst_path):
+                os.symlink(os.readlink(src_path), dst_path)
+
+        elif os.path.isdir(src_path):
+            # build folders of the ports
+            if name.startswith('build-'):
+                continue
+
+            _sync_tree(src_path, dst_path)
+
+        else:
+            if os.path.exists(dst_path):
+                src_stat = os.stat(src_path)
+                dst_stat = os.stat(dst_path)
+                if (
+                    src_stat.st_size == dst_stat.st_size and
+                    src_stat.st_mtime_ns == dst_stat.st_mtime_ns
+                ):
+                    continue
+
+            shutil.copy2(src_path, dst_path)
+
+
+def _link(src, dst):
+    if os.path.lexists(dst):
+        if os.path.islink(dst):
+            return
+
+        if os.path.isdir(dst):
+            shutil.rmtree(dst)
+        else:
+            os.remove(dst)
+
+    if os.path.exists(src):
+        os.symlink(src, dst)
+
+
+def _link_git_dir(src, dst):
+    # MicroPython gets its version from git. The .git file of a submodule
+    # has a relative path to the git directory so it gets written with the
+    # absolute path instead.
+    src_git = os.path.join(src, '.git')
+    dst_git = os.path.join(dst, '.git')
+
+    if os.path.isdir(src_git):
+        git_dir = src_git
+    elif os.path.isfile(src_git):
+        with open(src_git, 'r') as f:
+            git_dir = f.read().strip()
+
+        if not git_dir.startswith('gitdir:'):
+            return
+
+        git_dir = os.path.join(src, git_dir[7:].strip())
+    else:
+        return
+
+    data = f'gitdir: {os.path.abspath(git_dir)}\n'
+
+    if os.path.isfile(dst_git):
+        with open(dst_git, 'r') as f:
+            if f.read() == data:
+                return
+
+    with open(dst_git, 'w') as f:
+        f.write(data)
+
+
+def create_work_dir(script_dir, work_dir):
+    """
+    Creates or updates a work directory for a build.
+    """
+    _sync_tree(script_dir, work_dir, ('.git', 'build', 'lib'))
+
+    lib_path = os.path.join(script_dir, 'lib')
+    work_lib_path = os.path.join(work_dir, 'lib')
+
+    if not os.path.exists(work_lib_path):
+        os.makedirs(work_lib_path)
+
+    for name in os.listdir(lib_path):
+        src_path = os.path.join(lib_path, name)
+
+        if name in _SHARED_LIBS:
+            _link(src_path, os.path.join(work_lib_path, name))
+        elif name == 'micropython':
+            _sync_tree(
+                src_path,
+                os.path.join(work_lib_path, name),
+                _SHARED_MICROPY_DIRS + ('.git',)
+            )
+            _link_git_dir(src_path, os.path.join(work_lib_path, name))
+
+            for shared in _SHARED_MICROPY_DIRS:
+                _link(
+                    os.path.join(src_path, shared),
+                    os.path.join(work_lib_path, name, shared)
+                )
+        elif os.path.isdir(src_path):
+            _sync_tree(src_path, os.path.join(work_lib_path, name))
+        else:
+            shutil.copy2(src_path, os.path.join(work_lib_path, name))
+
+    build_path = os.path.join(work_dir, 'build')
+    if not os.path.exists(build_path):
+        os.makedirs(build_path)
+
+
+def _get_target(toml_path):
+    from . import toml_reader
+
+    with open(toml_path, 'r') as f:
+        data = toml_reader.toml.load(f)
+
+    mcu = data.get('MCU', {})
+    if not mcu:
+        raise RuntimeError(f'No MCU section in "{toml_path}"')
+
+    return list(mcu.keys())[0]
+
+
+def _find_toml(script_dir, name):
+    if os.path.exists(name):
+        return os.path.abspath(name)
+
+    path = os.path.join(script_dir, 'display_configs', name)
+    if not path.endswith('.toml'):
+        path += '.toml'
+
+    if not os.path.exists(path):
+        raise RuntimeError(f'Unable to locate toml "{name}"')
+
+    return path
+
+
+def _copy_artifacts(build_path, dst):
+    if os.path.exists(dst):
+        shutil.rmtree(dst)
+
+    os.makedirs(dst)
+
+    for name in os.listdir(build_path):
+        src = os.path.join(build_path, name)
+        if os.path.isfile(src):
+            shutil.copy2(src, os.path.join(dst, name))
+
+
+class Job(object):
+
+    def __init__(self, name, toml_path, target):
+        self.name = name
+        self.toml_path = toml_path
+        self.target = target
+        self.work_dir = None
+        self.return_code = None
+        self.duration = 0.0
+
+    def run(self, script_dir, batch_path, build_args, env):
+        start = time.time()
+
+        if self.work_dir is None:
+            cwd = script_dir
+        else:
+            create_work_dir(script_dir, self.work_dir)
+            cwd = self.work_dir
+
+        cmd = [
+            sys.executable,
+            os.path.join(cwd, 'make.py'),
+            f'--toml={self.toml_path}'
+        ]
+        cmd.extend(build_args)
+
+        if self.work_dir is not None:
+            # the submodules have been set up by the build in the source tree
+            cmd.append('--no-submodules')
+
+        log_path = os.path.join(batch_path, f'{self.name}.log')
+
+        with open(log_path, 'w') as log:
+            log.write(' '.join(cmd) + '\n\n')
+            log.flush()
+
+            self.return_code = subprocess.call(
+                cmd,
+                cwd=cwd,
+                env=env,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+                stdin=subprocess.DEVNULL
+            )
+
+        if self.return_code == 0:
+            _copy_artifacts(
+                os.path.join(cwd, 'build'),
+                os.path.join(batch_path, self.name)
+            )
+
+        self.duration = time.time() - start
+
+        status = 'OK' if self.return_code == 0 else 'FAILED'
+        print(f'{self.name}: {status} ({self.duration:.1f}s)')
+        sys.stdout.flush()
+
+        return self
+
+
+def run(script_dir, argv):
+    arg_parser = ArgumentParser(prog='make.py batch')
+    arg_parser.add_argument(
+        '--jobs',
+        dest='jobs',
+        help='number of builds to run at the same time',
+        type=int,
+        default=max(1, (os.cpu_count() or 1) // 4)
+    )
+    arg_parser.add_argument('tomls', nargs='+')
+
+    args, build_args = arg_parser.parse_known_args(argv)
+
+    # options for the builds that got mixed in with the toml files
+    tomls = []
+    for toml in args.tomls:
+        if '=' in toml or toml == 'clean':
+            build_args.append(toml)
+        else:
+            tomls.append(toml)
+
+    batch_path = os.path.join(script_dir, 'build', 'batch')
+    work_path = os.path.join(batch_path, 'work')
+
+    if not os.path.exists(batch_path):
+        os.makedirs(batch_path)
+
+    jobs = []
+    names = set()
+
+    for toml in tomls:
+        toml_path = _find_toml(script_dir, toml)
+        name = os.path.splitext(os.path.split(toml_path)[-1])[0]
+
+        if name in names:
+            raise RuntimeError(f'"{name}" is in the list more than once')
+
+        names.add(name)
+        jobs.append(Job(name, toml_path, _get_target(toml_path)))
+
+    env = dict(os.environ)
+    # every build uses the same binding and compiler caches
+    env.setdefault(
+        'LVGL_API_GEN_CACHE',
+        os.path.join(script_dir, 'build', 'gen_cache')
+    )
+    env.setdefault(
+        'CCACHE_DIR',
+        os.path.join(script_dir, 'build', 'compiler_cache')
+    )
+    env.setdefault(
+        'SCCACHE_DIR',
+        os.path.join(script_dir, 'build', 'compiler_cache')
+    )
+
+    # the first build for every target runs in the source tree one at a
+    # time, it sets up the things the other builds share
+    first_jobs = []
+    other_jobs = []
+    targets = set()
+
+    for job in jobs:
+        if job.target in targets:
+            job.work_dir = os.path.join(work_path, job.name)
+            other_jobs.append(job)
+        else:
+            targets.add(job.target)
+            first_jobs.append(job)
+
+    start = time.time()
+
+    for job in first_jobs:
+        print(f'building {job.name} in the source tree')
+        sys.stdout.flush()
+        job.run(script_dir, batch_path, build_args, env)
+
+    if other_jobs:
+        print(
+            f'building {len(other_jobs)} configurations, '
+            f'{args.jobs} at a time'
+        )
+        sys.stdout.flush()
+
+        with concurrent.futures.ThreadPoolExecutor(args.jobs) as executor:
+            futures = [
+                executor.submit(
+                    job.run, script_dir, batch_path, build_args, env
+                )
+                for job in other_jobs
+            ]
+            concurrent.futures.wait(futures)
+
+            for future in futures:
+                # raises any errors from creating the work directories
+                future.result()
+
+    print()
+    print(f'batch finished in {time.time() - start:.1f}s')
+
+    failed = [job for job in jobs if job.return_code != 0]
+    for job in jobs:
+        status = 'OK' if job.return_code == 0 else 'FAILED'
+        print(f'  {job.name.ljust(30)} {status.ljust(6)} {job.duration:8.1f}s')
+
+    if failed:
+        print()
+        print('logs for the failed builds:')
+        for job in failed:
+            print(f'  {os.path.join(batch_path, job.name + ".log")}')
+
+    return 1 if failed else 0
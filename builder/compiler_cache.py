@@ -0,0 +1,172 @@
+# Copyright (c) 2024 - 2025 Kevin G. Schlosser
+
+# Compiler cache (ccache or sccache) support.
+#
+# When turned on the compiler gets run through the cache for every port.
+# CMake based builds (ESP-IDF, rp2 and SDL) use the compiler launcher
+# environment variables and the make based ports get the compiler passed
+# in the build command, see `make_args`.
+#
+# The cache is stored in build/compiler_cache unless CCACHE_DIR or
+# SCCACHE_DIR is set so it is kept when the build gets cleaned. ccache adds
+# the LVGL config file to the key of every entry, any change to the config
+# makes a new set of entries. The defines are a part of the compiler
+# command so they are in the key already.
+
+import os
+import json
+import shutil
+import subprocess
+
+
+TOOLS = ('ccache', 'sccache')
+
+# the cache that is being used, None if the cache is turned off
+tool = None
+
+_start_stats = None
+
+
+def setup(name, script_dir):
+    """
+    Turns on the compiler cache.
+
+    name is "ccache", "sccache" or "auto" to use the first one that is
+    installed.
+    """
+    global tool
+    global _start_stats
+
+    if name == 'auto':
+        for item in TOOLS:
+            if shutil.which(item) is not None:
+                name = item
+                break
+        else:
+            raise RuntimeError(
+                'Unable to locate ccache or sccache, please install one of them'
+            )
+    elif name not in TOOLS:
+        raise RuntimeError(f'Unknown compiler cache "{name}"')
+    elif shutil.which(name) is None:
+        raise RuntimeError(f'Unable to locate {name}, please install it')
+
+    tool = name
+    cache_dir = os.path.join(script_dir, 'build', 'compiler_cache')
+
+    if tool == 'ccache':
+        os.environ.setdefault('CCACHE_DIR', cache_dir)
+        # the LVGL config changes what gets compiled for every LVGL source
+        # file, it is also included by most of the binding
+        lv_conf = os.path.join(script_dir, 'lib', 'lv_conf.h')
+        if os.path.exists(lv_conf):
+            os.environ['CCACHE_EXTRAFILES'] = lv_conf
+
+        # paths get stored relative to the source tree so the work
+        # directories of a batch build are able to share the entries
+        os.environ.setdefault('CCACHE_BASEDIR', script_dir)
+
+        # used by ESP-IDF
+        os.environ['IDF_CCACHE_ENABLE'] = '1'
+    else:
+        os.environ.setdefault('SCCACHE_DIR', cache_dir)
+
+    os.environ['CMAKE_C_COMPILER_LAUNCHER'] = tool
+    os.environ['CMAKE_CXX_COMPILER_LAUNCHER'] = tool
+
+    _start_stats = get_stats()
+
+
+def make_args(compiler='gcc'):
+    """
+    Returns the arguments that get added to the make command of a port
+    that doesn't use CMake.
+    """
+    if tool is None:
+        return []
+
+    # CC is only used for the host compiler, not the cross compilers
+    if compiler == 'gcc':
+        compiler = os.environ.get('CC', compiler)
+
+    return [f'CC="{tool} {compiler}"']
+
+
+def _run(*args):
+    try:
+        output = subprocess.check_output(
+            [tool] + list(args),
+            stderr=subprocess.DEVNULL
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return output.decode('utf-8', errors='replace')
+
+
+def get_stats():
+    """
+    Returns the number of cache hits and misses as a tuple or None if the
+    statistics are not available.
+    """
+    if tool == 'ccache':
+        # tab separated "name value" lines, available since ccache 4.0
+        output = _run('--print-stats')
+        if output is None:
+            return None
+
+        stats = {}
+        for line in output.split('\n'):
+            parts = line.split('\t')
+            if len(parts) == 2 and parts[1].strip().isdigit():
+                stats[parts[0].strip()] = int(parts[1])
+
+        hits = (
+            stats.get('direct_cache_hit', 0) +
+            stats.get('preprocessed_cache_hit', 0)
+        )
+        return hits, stats.get('cache_miss', 0)
+
+    if tool == 'sccache':
+        output = _run('--show-stats', '--stats-format=json')
+        if output is None:
+            return None
+
+        try:
+            stats = json.loads(output)['stats']
+        except (ValueError, KeyError):
+            return None
+
+        hits = sum(stats.get('cache_hits', {}).get('counts', {}).values())
+        misses = sum(
+            stats.get('cache_misses', {}).get('counts', {}).values()
+        )
+        return hits, misses
+
+    return None
+
+
+def report():
+    if tool is None:
+        return
+
+    end_stats = get_stats()
+
+    print()
+    if _start_stats is None or end_stats is None:
+        print(f'Compiler cache ({tool}): statistics are not available')
+        return
+
+    hits = end_stats[0] - _start_stats[0]
+    misses = end_stats[1] - _start_stats[1]
+    total = hits + misses
+
+    if total:
+        rate = hits * 100.0 / total
+    else:
+        rate = 0.0
+
+    print(
+        f'Compiler cache ({tool}): {hits} hits, {misses} misses '
+        f'({rate:.1f}% hit rate)'
+    )
@@ -6,6 +6,7 @@ import sys
 import json
 from argparse import ArgumentParser
 from . import spawn
+from . import compiler_cache
 from . import generate_manifest
 from . import update_mphalport as _update_mphalport
 from . import (
@@ -895,8 +896,7 @@ def user_c_module():
     for module in user_c_modules:
         data.append(f'include({module})')
 
-    with open('ext_mod/esp32_components.cmake', 'w') as f:
-        f.write('\n'.join(data))
+    write_file('ext_mod/esp32_components.cmake', '\n'.join(data))
 
 
 def add_components(env, cmds):
@@ -921,14 +921,14 @@ def add_components(env, cmds):
         if ret_code != 0:
             sys.exit(ret_code)
 
-        with open('ext_mod/esp32_components.cmake', 'w') as f:
-            f.write('list(APPEND IDF_COMPONENTS\n')
-            for item in comp_names:
-                f.write(f'    {item}\n')
-            f.write(')\n')
+        data = ['list(APPEND IDF_COMPONENTS']
+        for item in comp_names:
+            data.append(f'    {item}')
+        data.append(')\n')
+
+        write_file('ext_mod/esp32_components.cmake', '\n'.join(data))
     else:
-        with open('ext_mod/esp32_components.cmake', 'w') as f:
-            f.write('')
+        write_file('ext_mod/esp32_components.cmake', '')
 
 
 def submodules():
@@ -1442,8 +1442,7 @@ def build_sdkconfig(*args):
         with open(display_path, 'r') as f:
             base_config.extend(f.read().split('\n'))
 
-    with open(SDKCONFIG_PATH, 'w') as f:
-        f.write('\n'.join(base_config))
+    write_file(SDKCONFIG_PATH, '\n'.join(base_config))
 
     return args
 
@@ -1469,6 +1468,13 @@ def compile(*args):  # NOQA
     user_c_module()
 
     if ccache:
+        # ESP-IDF is able to use the ccache it installs with its tools, the
+        # stats are only collected when ccache is installed on the system
+        if compiler_cache.tool is None and shutil.which('ccache') is not None:
+            compiler_cache.setup('ccache', SCRIPT_DIR)
+
+        env['IDF_CCACHE_ENABLE'] = '1'
+    elif compiler_cache.tool == 'ccache':
         env['IDF_CCACHE_ENABLE'] = '1'
 
     args = build_sdkconfig(*args)
@@ -1483,6 +1489,10 @@ def compile(*args):  # NOQA
         partition = Partition(p_size)
         partition.save()
 
+    # this is also done when updating the submodules, that gets skipped by
+    # incremental and batch builds and the file gets reverted after every
+    # build
+    update_makefile()
     update_main()
     update_mpthreadport()
     update_panic_handler()
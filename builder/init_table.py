@@ -0,0 +1,628 @@
+# Copyright (c) 2024 - 2025 Kevin G. Schlosser
+
+# Converts the display driver _xxx_init.py modules to use init tables.
+#
+# Every run of commands in the init function that only use constant values
+# gets replaced with a single call to DisplayDriver.run_init_table. Anything
+# that is not constant (values that come from the driver settings, if
+# statements, loops...) is kept as python code. The layout of an init table
+# is explained in display_driver_framework.py
+#
+#   python3 -m builder.init_table <init module> [output file]
+#
+# If no output file is given the converted module is printed.
+
+import ast
+import os
+import sys
+
+
+INIT_TABLE_DELAY = 0xFFFF
+
+_MAX_CMD = 0xFFFE
+_MAX_DELAY = 0xFFFF
+_MAX_PARAMS = 0xFF
+
+# display drivers that have a _write_reg method use it to send a command
+# that has a single param byte, the byte is put into self._param_buf first
+_WRITE_REG = '_write_reg'
+
+# number of bytes to put on a single line in the generated source
+_LINE_BYTES = 16
+
+_BINARY_OPS = {
+    ast.BitOr: lambda a, b: a | b,
+    ast.BitAnd: lambda a, b: a & b,
+    ast.BitXor: lambda a, b: a ^ b,
+    ast.LShift: lambda a, b: a << b,
+    ast.RShift: lambda a, b: a >> b,
+    ast.Add: lambda a, b: a + b,
+    ast.Sub: lambda a, b: a - b,
+    ast.Mult: lambda a, b: a * b,
+    ast.FloorDiv: lambda a, b: a // b,
+    ast.Mod: lambda a, b: a % b
+}
+
+_UNARY_OPS = {
+    ast.Invert: lambda a: ~a,
+    ast.USub: lambda a: -a,
+    ast.UAdd: lambda a: a
+}
+
+
+class _NotConstant(Exception):
+    pass
+
+
+class _Unsupported(Exception):
+    pass
+
+
+def _is_self_attr(node, name):
+    return (
+        isinstance(node, ast.Attribute) and
+        isinstance(node.value, ast.Name) and
+        node.value.id == 'self' and
+        node.attr == name
+    )
+
+
+class _Converter:
+
+    def __init__(self, source):
+        self.source = source
+        self.tree = ast.parse(source)
+        self.consts = {}
+
+        # names that point to the param buffer and the memoryview of it
+        self.buf_names = set()
+        self.mv_names = set()
+        self.buf_source = None
+        self.buf_expr = None
+        self.shared_buf = False
+
+        # values of the param buffer that are known at build time and the
+        # ones of those that have actually been written to the buffer
+        self.values = {}
+        self.synced = set()
+
+        # list of [cmd, params, delay]
+        self.entries = []
+        self.lines = []
+        self.indent = ''
+
+        self.table_count = 0
+
+    def _eval(self, node):
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, int) and not isinstance(node.value, bool):
+                return node.value
+            raise _NotConstant
+
+        if isinstance(node, ast.Name):
+            if node.id in self.consts:
+                return self.consts[node.id]
+            raise _NotConstant
+
+        if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+            return _BINARY_OPS[type(node.op)](
+                self._eval(node.left),
+                self._eval(node.right)
+            )
+
+        if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+            return _UNARY_OPS[type(node.op)](self._eval(node.operand))
+
+        if (
+            isinstance(node, ast.Call) and
+            isinstance(node.func, ast.Name) and
+            node.func.id == 'const' and
+            len(node.args) == 1 and
+            not node.keywords
+        ):
+            return self._eval(node.args[0])
+
+        raise _NotConstant
+
+    def _eval_bytes(self, node):
+        # bytearray([...]), bytes([...]), b'...' or [...]
+        if isinstance(node, ast.Constant) and isinstance(node.value, bytes):
+            return bytes(node.value)
+
+        if (
+            isinstance(node, ast.Call) and
+            isinstance(node.func, ast.Name) and
+            node.func.id in ('bytearray', 'bytes') and
+            len(node.args) == 1 and
+            not node.keywords
+        ):
+            node = node.args[0]
+
+        if isinstance(node, (ast.List, ast.Tuple)):
+            values = [self._eval(elt) for elt in node.elts]
+            for value in values:
+                if not 0 <= value <= 0xFF:
+                    raise _NotConstant
+            return bytes(values)
+
+        raise _NotConstant
+
+    def _eval_slice(self, node):
+        # returns (start, stop) for constant slices
+        if not isinstance(node, ast.Slice) or node.step is not None:
+            raise _NotConstant
+
+        start = 0 if node.lower is None else self._eval(node.lower)
+        if node.upper is None:
+            raise _NotConstant
+        stop = self._eval(node.upper)
+
+        if start < 0 or stop < start:
+            raise _NotConstant
+
+        return start, stop
+
+    def _is_buf(self, node):
+        if isinstance(node, ast.Name):
+            return node.id in self.buf_names
+        return _is_self_attr(node, '_param_buf')
+
+    def _is_mv(self, node):
+        if isinstance(node, ast.Name):
+            return node.id in self.mv_names or node.id in self.buf_names
+        return (
+            _is_self_attr(node, '_param_mv') or
+            _is_self_attr(node, '_param_buf')
+        )
+
+    def _uses_buf(self, node):
+        for child in ast.walk(node):
+            if self._is_mv(child):
+                return True
+
+            if (
+                self.shared_buf and
+                isinstance(child, ast.Call)
+            ):
+                # any method of the driver is able to change the contents
+                # of self._param_buf
+                return True
+
+        return False
+
+    def _set_buf(self, node, source, expr):
+        # source is where the buffer comes from and expr is what gets used
+        # to access it in the generated code
+        if self.buf_source is not None and self.buf_source != source:
+            raise _Unsupported('more than one param buffer is used')
+
+        self.buf_source = source
+        self.buf_expr = expr
+        if source == 'self._param_buf':
+            self.shared_buf = True
+
+        if isinstance(node, ast.Name):
+            self.buf_names.add(node.id)
+
+    # ===== table =====
+
+    def _add_entry(self, cmd, params):
+        if not 0 <= cmd <= _MAX_CMD:
+            raise _NotConstant
+
+        if len(params) > _MAX_PARAMS:
+            raise _NotConstant
+
+        self.entries.append([cmd, params, 0])
+
+    def _add_delay(self, delay):
+        if delay < 0:
+            raise _NotConstant
+
+        while delay:
+            if (
+                not self.entries or
+                self.entries[-1][2] == _MAX_DELAY
+            ):
+                self.entries.append([INIT_TABLE_DELAY, b'', 0])
+
+            entry = self.entries[-1]
+            amount = min(delay, _MAX_DELAY - entry[2])
+            entry[2] += amount
+            delay -= amount
+
+    def _flush(self):
+        if not self.entries:
+            return
+
+        entries = self.entries
+        self.entries = []
+
+        if all(entry[0] == INIT_TABLE_DELAY for entry in entries):
+            # not worth a table
+            for entry in entries:
+                self.lines.append(f'{self.indent}time.sleep_ms({entry[2]})  # NOQA')
+            return
+
+        self.table_count += 1
+        self.lines.append(f'{self.indent}self.run_init_table(')
+
+        for cmd, params, delay in entries:
+            data = (
+                bytes([cmd >> 8, cmd & 0xFF, len(params)]) +
+                params +
+                bytes([delay >> 8, delay & 0xFF])
+            )
+
+            for i in range(0, len(data), _LINE_BYTES):
+                chunk = ''.join(f'\\x{b:02X}' for b in data[i:i + _LINE_BYTES])
+                self.lines.append(f"{self.indent}    b'{chunk}'")
+
+        self.lines.append(f'{self.indent})')
+
+    def _materialize(self, indices=None):
+        if indices is None:
+            indices = self.values
+
+        for index in sorted(indices):
+            if index in self.synced or index not in self.values:
+                continue
+
+            self.lines.append(
+                f'{self.indent}{self.buf_expr}[{index}] = '
+                f'0x{self.values[index]:02X}'
+            )
+            self.synced.add(index)
+
+    def _emit(self, stmt):
+        segment = ast.get_source_segment(self.source, stmt)
+        self.lines.append(' ' * stmt.col_offset + segment)
+
+    # ===== statements =====
+
+    def _param_write(self, stmt):
+        # param_buf[n] = <constant> or param_buf[a:b] = bytearray([...])
+        if len(stmt.targets) != 1:
+            raise _NotConstant
+
+        target = stmt.targets[0]
+        if not isinstance(target, ast.Subscript) or not self._is_buf(target.value):
+            raise _NotConstant
+
+        if self.buf_expr is None:
+            expr = ast.unparse(target.value)
+            self._set_buf(target.value, expr, expr)
+
+        if isinstance(target.slice, ast.Slice):
+            start, stop = self._eval_slice(target.slice)
+            data = self._eval_bytes(stmt.value)
+            if len(data) != stop - start:
+                raise _NotConstant
+        else:
+            start = self._eval(target.slice)
+            value = self._eval(stmt.value)
+            if not 0 <= value <= 0xFF or start < 0:
+                raise _NotConstant
+            data = bytes([value])
+
+        for i, value in enumerate(data):
+            index = start + i
+            if self.values.get(index) != value:
+                self.values[index] = value
+                self.synced.discard(index)
+
+    def _dynamic_write(self, stmt):
+        # param_buf[n] = <not constant>, returns the indices that get written
+        if (
+            self.shared_buf or
+            not isinstance(stmt, ast.Assign) or
+            len(stmt.targets) != 1 or
+            not isinstance(stmt.targets[0], ast.Subscript) or
+            not self._is_buf(stmt.targets[0].value) or
+            self._uses_buf(stmt.value)
+        ):
+            return None
+
+        target = stmt.targets[0]
+        try:
+            if isinstance(target.slice, ast.Slice):
+                return range(*self._eval_slice(target.slice))
+
+            return [self._eval(target.slice)]
+        except _NotConstant:
+            return None
+
+    def _dynamic_read(self, stmt):
+        # self.set_params(<not constant>, param_mv[a:b]), returns the indices
+        # that get read
+        if (
+            self.shared_buf or
+            not isinstance(stmt, ast.Expr) or
+            not isinstance(stmt.value, ast.Call) or
+            not _is_self_attr(stmt.value.func, 'set_params') or
+            stmt.value.keywords or
+            len(stmt.value.args) != 2 or
+            self._uses_buf(stmt.value.args[0])
+        ):
+            return None
+
+        node = stmt.value.args[1]
+        if not isinstance(node, ast.Subscript) or not self._is_mv(node.value):
+            return None
+
+        try:
+            return range(*self._eval_slice(node.slice))
+        except _NotConstant:
+            return None
+
+    def _set_params(self, call):
+        if (
+            not _is_self_attr(call.func, 'set_params') or
+            call.keywords or
+            not 1 <= len(call.args) <= 2
+        ):
+            raise _NotConstant
+
+        cmd = self._eval(call.args[0])
+
+        if len(call.args) == 1 or (
+            isinstance(call.args[1], ast.Constant) and
+            call.args[1].value is None
+        ):
+            params = b''
+        else:
+            node = call.args[1]
+            if isinstance(node, ast.Subscript) and self._is_mv(node.value):
+                start, stop = self._eval_slice(node.slice)
+                try:
+                    params = bytes(
+                        self.values[i] for i in range(start, stop)
+                    )
+                except KeyError:
+                    raise _NotConstant
+            else:
+                params = self._eval_bytes(node)
+
+        self._add_entry(cmd, params)
+
+    def _write_reg(self, call):
+        # self._write_reg(reg, value)
+        if call.keywords or len(call.args) != 2:
+            raise _NotConstant
+
+        cmd = self._eval(call.args[0])
+        value = self._eval(call.args[1])
+        if not 0 <= value <= 0xFF:
+            raise _NotConstant
+
+        self._add_entry(cmd, bytes([value]))
+
+        if self.shared_buf:
+            # the table doesn't write to self._param_buf
+            self.values[0] = value
+            self.synced.discard(0)
+
+    def _sleep(self, call):
+        if (
+            not isinstance(call.func, ast.Attribute) or
+            not isinstance(call.func.value, ast.Name) or
+            call.func.value.id != 'time' or
+            call.func.attr not in ('sleep_ms', 'sleep_us') or
+            call.keywords or
+            len(call.args) != 1
+        ):
+            raise _NotConstant
+
+        delay = self._eval(call.args[0])
+        if call.func.attr == 'sleep_us':
+            # the table delays are in milliseconds, waiting longer than
+            # asked for is fine while initializing
+            delay = (delay + 999) // 1000
+
+        self._add_delay(delay)
+
+    def _buf_binding(self, stmt):
+        # param_buf = bytearray(n), param_buf = self._param_buf,
+        # param_mv = memoryview(param_buf), param_mv = self._param_mv
+        if len(stmt.targets) != 1 or not isinstance(stmt.targets[0], ast.Name):
+            return False
+
+        name = stmt.targets[0].id
+        value = stmt.value
+
+        if _is_self_attr(value, '_param_buf'):
+            self._set_buf(stmt.targets[0], 'self._param_buf', name)
+        elif (
+            isinstance(value, ast.Call) and
+            isinstance(value.func, ast.Name) and
+            value.func.id == 'bytearray' and
+            len(value.args) == 1
+        ):
+            self._set_buf(stmt.targets[0], name, name)
+        elif _is_self_attr(value, '_param_mv'):
+            self.mv_names.add(name)
+        elif (
+            isinstance(value, ast.Call) and
+            isinstance(value.func, ast.Name) and
+            value.func.id == 'memoryview' and
+            len(value.args) == 1 and
+            self._is_buf(value.args[0])
+        ):
+            self.mv_names.add(name)
+        else:
+            return False
+
+        return True
+
+    def _statement(self, stmt):
+        try:
+            if isinstance(stmt, ast.Assign):
+                self._param_write(stmt)
+                return
+
+            if isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Call):
+                if _is_self_attr(stmt.value.func, 'set_params'):
+                    self._set_params(stmt.value)
+                elif _is_self_attr(stmt.value.func, _WRITE_REG):
+                    self._write_reg(stmt.value)
+                else:
+                    self._sleep(stmt.value)
+                return
+        except _NotConstant:
+            pass
+
+        # everything else stays python code
+        self._flush()
+
+        if isinstance(stmt, ast.Assign) and self._buf_binding(stmt):
+            self.values.clear()
+            self.synced.clear()
+            self._emit(stmt)
+            return
+
+        if not self._uses_buf(stmt):
+            self._emit(stmt)
+            return
+
+        indices = self._dynamic_write(stmt)
+        if indices is not None:
+            # only the bytes that get written are not known anymore
+            self._emit(stmt)
+            for index in indices:
+                self.values.pop(index, None)
+                self.synced.discard(index)
+            return
+
+        indices = self._dynamic_read(stmt)
+        if indices is not None:
+            # only the bytes that get sent need to be in the buffer
+            self._materialize(indices)
+            self._emit(stmt)
+            return
+
+        self._materialize()
+        self._emit(stmt)
+
+        # the statement is able to change the contents of the buffer
+        self.values.clear()
+        self.synced.clear()
+
+    def convert(self):
+        for node in self.tree.body:
+            if (
+                isinstance(node, ast.Assign) and
+                len(node.targets) == 1 and
+                isinstance(node.targets[0], ast.Name)
+            ):
+                try:
+                    self.consts[node.targets[0].id] = self._eval(node.value)
+                except _NotConstant:
+                    pass
+
+        for func in self.tree.body:
+            if isinstance(func, ast.FunctionDef) and func.name == 'init':
+                break
+        else:
+            raise _Unsupported('no init function')
+
+        if func.decorator_list:
+            raise _Unsupported('init function has decorators')
+
+        self.indent = ' ' * func.body[0].col_offset
+
+        body = func.body
+        if (
+            isinstance(body[0], ast.Expr) and
+            isinstance(body[0].value, ast.Constant) and
+            isinstance(body[0].value.value, str)
+        ):
+            self._emit(body[0])
+            body = body[1:]
+
+        for stmt in body:
+            self._statement(stmt)
+
+        self._flush()
+
+        if not self.table_count:
+            return None
+
+        lines = self.source.splitlines()
+        header = lines[:func.lineno - 1]
+        footer = lines[func.end_lineno:]
+
+        code = header
+        code.append(
+            ' ' * func.col_offset +
+            f'def init({ast.unparse(func.args)}):'
+        )
+        code.extend(self.lines)
+        code.extend(footer)
+
+        return '\n'.join(code) + '\n'
+
+
+def convert(source):
+    """
+    Returns the converted source or None if there is nothing to convert.
+    """
+    try:
+        return _Converter(source).convert()
+    except (_Unsupported, SyntaxError):
+        return None
+
+
+def is_init_module(file_name):
+    return (
+        file_name.startswith('_') and
+        file_name.endswith('.py') and
+        (
+            file_name[:-3].endswith('_init') or
+            '_init_type' in file_name
+        )
+    )
+
+
+def convert_file(src, dst_path):
+    """
+    Writes the converted version of src into dst_path.
+
+    Returns the path to the file that needs to be frozen, which is src if
+    nothing got converted.
+    """
+    with open(src, 'r') as f:
+        source = f.read()
+
+    converted = convert(source)
+    if converted is None:
+        return src
+
+    if not os.path.exists(dst_path):
+        os.makedirs(dst_path)
+
+    dst = os.path.join(dst_path, os.path.split(src)[-1])
+
+    # an unchanged table is not written so it doesn't get frozen again
+    if os.path.exists(dst):
+        with open(dst, 'r') as f:
+            if f.read() == converted:
+                return dst
+
+    with open(dst, 'w') as f:
+        f.write(converted)
+
+    return dst
+
+
+if __name__ == '__main__':
+    with open(sys.argv[1], 'r') as in_file:
+        output = convert(in_file.read())
+
+    if output is None:
+        sys.exit(f'nothing to convert in "{sys.argv[1]}"')
+
+    if len(sys.argv) > 2:
+        with open(sys.argv[2], 'w') as out_file:
+            out_file.write(output)
+    else:
+        print(output)
@@ -0,0 +1,181 @@
+# Copyright (c) 2024 - 2025 Kevin G. Schlosser
+
+# Sinks for the output of the processes that get run by `builder.spawn`.
+#
+# Each line of output a process writes gets passed to every sink. A sink
+# only needs to implement `line` and `close`.
+
+import re
+import sys
+
+
+class OutputSink(object):
+
+    def command(self, cmd):
+        """
+        Called with every command that gets run.
+        """
+        pass
+
+    def line(self, text, is_err):
+        """
+        Called for every line the process outputs.
+
+        text is the line without the line ending and is_err is True if the
+        line was written to stderr.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        """
+        Called after the process has ended.
+        """
+        pass
+
+
+class CollectSink(OutputSink):
+    """
+    Keeps all of the lines, this is what `spawn` returns as the output.
+    """
+
+    def __init__(self):
+        self.lines = []
+
+    def line(self, text, is_err):
+        self.lines.append(text)
+
+
+class ScreenSink(OutputSink):
+    """
+    Writes the output to the screen.
+
+    When cmpl is True the progress lines from make, cmake and ninja get
+    written over each other on a single line.
+    """
+
+    def __init__(self, cmpl, spinner_lock=None):
+        self.cmpl = cmpl
+        self.spinner_lock = spinner_lock
+        self.last_line_len = -1
+
+    def _write(self, stream, data):
+        if self.spinner_lock is None:
+            stream.write(data)
+            stream.flush()
+        else:
+            with self.spinner_lock:
+                stream.write(data)
+                stream.flush()
+
+    def _is_progress(self, text):
+        return (
+            text.startswith('[') or
+            text.startswith('CC ') or
+            text.startswith('MPY ') or
+            (
+                text.startswith('--') and
+                len(text) <= 80
+            )
+        )
+
+    def line(self, text, is_err):
+        spinner = self.spinner_lock is not None
+
+        if is_err:
+            if not spinner and self.cmpl and self.last_line_len != -1:
+                self._write(sys.stdout, '\n')
+                self.last_line_len = -1
+
+            if spinner:
+                self._write(sys.stderr, '\r' + text + '\n')
+            else:
+                self._write(sys.stderr, text + '\n')
+
+        elif self.cmpl and self._is_progress(text):
+            if len(text) < self.last_line_len:
+                padding = ' ' * (self.last_line_len - len(text))
+            else:
+                padding = ''
+
+            if self.last_line_len != -1:
+                self._write(sys.stdout, '\r')
+
+            self._write(sys.stdout, text + padding)
+            self.last_line_len = len(text)
+
+        elif spinner:
+            self._write(sys.stdout, '\r' + text + '\n')
+            self.last_line_len = -1
+
+        elif self.last_line_len == -1:
+            self._write(sys.stdout, text + '\n')
+
+        else:
+            self._write(sys.stdout, '\n' + text + '\n')
+            self.last_line_len = -1
+
+    def close(self):
+        if self.spinner_lock is None and self.cmpl and self.last_line_len != -1:
+            self._write(sys.stdout, '\n')
+
+        self.last_line_len = -1
+
+
+class LogSink(OutputSink):
+    """
+    Writes all of the output to a log file.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def command(self, cmd):
+        self._file.write(f'$ {cmd}\n')
+
+    def line(self, text, is_err):
+        if is_err:
+            self._file.write('E: ' + text + '\n')
+        else:
+            self._file.write(text + '\n')
+
+    def close(self):
+        self._file.flush()
+
+
+class ErrorSink(OutputSink):
+    """
+    Collects the errors and warnings from the compiler output.
+
+    Every entry is a tuple of (kind, file, line number, message). file and
+    line number are None if the message doesn't point to a source file.
+    """
+
+    # a Windows path starts with a drive letter that is followed by a colon
+    _pattern = re.compile(
+        r'^(?:(?P<file>(?:[A-Za-z]:)?[^:\s][^:]*)'
+        r':(?P<line>\d+):(?:\d+:)?\s*)?'
+        r'(?P<kind>fatal error|error|warning):\s*(?P<message>.*)$',
+        re.IGNORECASE
+    )
+
+    def __init__(self):
+        self.errors = []
+        self.warnings = []
+
+    def line(self, text, is_err):
+        match = self._pattern.match(text)
+        if match is None:
+            return
+
+        file = match.group('file')
+        line_num = match.group('line')
+        if line_num is not None:
+            line_num = int(line_num)
+
+        kind = match.group('kind').lower()
+        entry = (kind, file, line_num, match.group('message'))
+
+        if kind == 'warning':
+            self.warnings.append(entry)
+        else:
+            self.errors.append(entry)
@@ -0,0 +1,306 @@
+# Copyright (c) 2024 - 2025 Kevin G. Schlosser
+
+# Build stages with input fingerprints.
+#
+# Every stage of the build gets run through `run`. When incremental builds
+# are turned on a fingerprint is made from the inputs of a stage and the
+# stage is skipped if the fingerprint matches the one from the last build
+# and the outputs of the stage still exist. The fingerprints get stored in
+# build/stages.json.
+#
+# Files and directories are fingerprinted using their size and modification
+# time so checking a large tree like the LVGL sources stays fast.
+#
+# If a stage fails all of the stored fingerprints get removed. Some of the
+# stages patch files in the MicroPython sources and those patches get
+# reverted when compiling fails.
+#
+# The stages and every process that gets spawned are also recorded as a
+# timeline that is able to be written as a Chrome trace (chrome://tracing or
+# https://ui.perfetto.dev). Scripts that run as part of the build, like the
+# binding generator, add their own events to the file set in the
+# LVGL_MICROPY_TRACE_EVENTS environment variable.
+
+import os
+import sys
+import json
+import time
+import hashlib
+import subprocess
+
+# the name of the environment variable is shared with the scripts in gen
+sys.path.append(
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'gen'))
+
+from gen_trace import TRACE_EVENTS_ENV  # NOQA
+
+
+STATE_PATH = 'build/stages.json'
+
+INCREMENTAL = False
+
+_state = None
+_timings = []
+_spawns = []
+_trace_events = []
+
+
+def _load_state():
+    global _state
+
+    if _state is None:
+        _state = {}
+
+        if INCREMENTAL and os.path.exists(STATE_PATH):
+            try:
+                with open(STATE_PATH, 'r') as f:
+                    _state = json.load(f)
+            except ValueError:
+                pass
+
+    return _state
+
+
+def _save_state():
+    if not INCREMENTAL:
+        return
+
+    path = os.path.split(STATE_PATH)[0]
+    if path and not os.path.exists(path):
+        os.makedirs(path)
+
+    with open(STATE_PATH, 'w') as f:
+        json.dump(_load_state(), f, indent=4)
+
+
+def _hash_path(hasher, path):
+    if os.path.isdir(path):
+        for root, dirs, files in os.walk(path):
+            dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+
+            for file in sorted(files):
+                _hash_path(hasher, os.path.join(root, file))
+
+    elif os.path.exists(path):
+        stat = os.stat(path)
+        hasher.update(
+            f'{path}:{stat.st_size}:{stat.st_mtime_ns}\n'.encode('utf-8')
+        )
+    else:
+        hasher.update(f'{path}:missing\n'.encode('utf-8'))
+
+
+def fingerprint(paths=(), values=()):
+    hasher = hashlib.sha256()
+
+    for path in paths:
+        if path is None:
+            continue
+
+        _hash_path(hasher, os.path.abspath(path))
+
+    hasher.update(repr(values).encode('utf-8'))
+
+    return hasher.hexdigest()
+
+
+def submodule_revisions(path='lib'):
+    """
+    Returns the commits the submodules under path are pinned to in HEAD as
+    a tuple of (path, commit). Pulling changes that move a submodule to a
+    different commit doesn't touch .gitmodules so this is what tells the
+    submodules stage to run again. None is returned if git is not able to
+    be run.
+    """
+    try:
+        output = subprocess.check_output(
+            ['git', 'ls-tree', 'HEAD', path + '/'],
+            stderr=subprocess.DEVNULL
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    revisions = []
+
+    # "<mode> <type> <object>\t<path>", submodules have the type commit
+    for line in output.decode('utf-8', errors='replace').splitlines():
+        info, _, file = line.partition('\t')
+        info = info.split()
+
+        if len(info) == 3 and info[1] == 'commit':
+            revisions.append((file, info[2]))
+
+    return tuple(revisions)
+
+
+def invalidate():
+    """
+    Removes all of the stored fingerprints so every stage runs on the next
+    build.
+    """
+    _load_state().clear()
+    _save_state()
+
+
+def run(name, func, *args, paths=(), values=(), outputs=(), always=False):
+    """
+    Runs a stage of the build.
+
+    paths is the files and directories the stage reads, values is anything
+    else that changes what the stage does (board, arguments, drivers).
+    outputs is the files the stage creates, the stage runs if any of them
+    are missing. If always is True the stage runs even if nothing changed.
+    The stage is still timed, this is used for stages that have their own
+    dependency tracking like make.
+    """
+    start = time.time()
+    state = _load_state()
+
+    if INCREMENTAL and not always:
+        key = fingerprint(paths, values)
+
+        if (
+            state.get(name, None) == key and
+            all(os.path.exists(output) for output in outputs)
+        ):
+            _timings.append((name, False, 0.0))
+            return None
+    else:
+        key = None
+
+    try:
+        res = func(*args)
+    except BaseException:
+        _timings.append((name, True, time.time() - start))
+        _add_trace_event(name, 'stage', start, time.time() - start)
+        invalidate()
+        raise
+
+    if key is not None:
+        # the fingerprint is made again because the stage is able to change
+        # its own inputs, patching the MicroPython sources is an example
+        state[name] = fingerprint(paths, values)
+        _save_state()
+
+    _timings.append((name, True, time.time() - start))
+    _add_trace_event(name, 'stage', start, time.time() - start)
+    return res
+
+
+def _add_trace_event(name, cat, start, duration, args=None):
+    event = dict(
+        name=name,
+        cat=cat,
+        ph='X',
+        ts=int(start * 1000000),
+        dur=int(duration * 1000000),
+        pid=os.getpid(),
+        tid=0
+    )
+
+    if args is not None:
+        event['args'] = args
+
+    _trace_events.append(event)
+
+
+def spawn_start():
+    return time.time()
+
+
+def spawn_end(cmds, start, exit_code, rusage=None):
+    """
+    Stores the wall and CPU time of a process that `builder.spawn` ran.
+
+    rusage is the resource usage of the process from `os.wait4`, it
+    includes all of the children of the process.
+    """
+    duration = time.time() - start
+    cmd = cmds[-1] if cmds else ''
+
+    if rusage is None:
+        cpu = 0.0
+        max_rss = 0
+    else:
+        cpu = rusage.ru_utime + rusage.ru_stime
+        # kilobytes on Linux and bytes on macOS
+        max_rss = rusage.ru_maxrss
+        if sys.platform == 'darwin':
+            max_rss //= 1024
+
+    _spawns.append((cmd, duration, cpu))
+
+    name = cmd.split(' ', 1)[0] if cmd else 'spawn'
+    _add_trace_event(
+        name,
+        'spawn',
+        start,
+        duration,
+        dict(
+            commands=cmds,
+            exit_code=exit_code,
+            cpu_time=round(cpu, 3),
+            max_rss_kb=max_rss
+        )
+    )
+
+
+def write_trace(path):
+    """
+    Writes the timeline of the build as a Chrome trace.
+    """
+    events = [
+        dict(
+            name='process_name',
+            ph='M',
+            pid=os.getpid(),
+            tid=0,
+            args=dict(name='make.py')
+        )
+    ]
+    events.extend(_trace_events)
+
+    # events from the scripts that ran as part of the build
+    events_path = os.environ.get(TRACE_EVENTS_ENV, None)
+    if events_path and os.path.exists(events_path):
+        with open(events_path, 'r') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        events.append(json.loads(line))
+                    except ValueError:
+                        pass
+
+    with open(path, 'w') as f:
+        json.dump(dict(traceEvents=events, displayTimeUnit='ms'), f)
+
+
+def report():
+    if _spawns:
+        print()
+        print('Processes (wall / cpu):')
+        for cmd, wall, cpu in _spawns:
+            if len(cmd) > 60:
+                cmd = cmd[:57] + '...'
+
+            print(f'  {wall:8.2f}s {cpu:8.2f}s  {cmd}')
+
+    if not _timings:
+        sys.stdout.flush()
+        return
+
+    width = max(len(name) for name, _, _ in _timings)
+    total = 0.0
+
+    print()
+    print('Build stages:')
+    for name, ran, duration in _timings:
+        total += duration
+        if ran:
+            print(f'  {name.ljust(width)}  ran      {duration:8.2f}s')
+        else:
+            print(f'  {name.ljust(width)}  skipped')
+
+    print(f'  {"total".ljust(width)}           {total:8.2f}s')
+    sys.stdout.flush()
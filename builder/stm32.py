@@ -3,6 +3,7 @@
 import os
 import sys
 from . import spawn
+from . import compiler_cache
 from . import generate_manifest
 from . import update_mphalport
 
@@ -127,6 +128,7 @@ def compile(*args):  # NOQA
 
     cmd_ = compile_cmd[:]
     cmd_.extend(list(args))
+    cmd_.extend(compiler_cache.make_args('arm-none-eabi-gcc'))
 
     return_code, _ = spawn(cmd_, cmpl=True)
     if return_code != 0:
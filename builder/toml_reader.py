@@ -1,5 +1,7 @@
 import os
 
+from . import write_file
+
 try:
     import toml
 except ImportError:
@@ -503,8 +505,7 @@ def run(toml_path, output_file):
         t_data = str(toml_obj)
 
         if t_data:
-            with open(output_file, 'w') as f:
-                f.write(t_data)
+            write_file(output_file, t_data)
 
         displays = [f'DISPLAY={item}' for item in toml_obj.imports if item in display_drivers]
         indevs = [f'INDEV={item}' for item in toml_obj.imports if item + '.py' in indev_drivers]    # ".py" needs to be added to item to compare with filelist
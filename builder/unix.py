@@ -4,6 +4,7 @@ import os
 import sys
 import shutil
 from . import spawn
+from . import compiler_cache
 from . import generate_manifest
 from . import update_mphalport as _update_mphalport
 from . import (
@@ -441,6 +442,7 @@ def compile(*args):  # NOQA
 
     cmd_ = compile_cmd[:]
     cmd_.extend(list(args))
+    cmd_.extend(compiler_cache.make_args())
 
     return_code, _ = spawn(cmd_)
     if return_code != 0:
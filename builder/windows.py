@@ -462,6 +462,7 @@ def compile(*args):  # NOQA
         '--module_name=lvgl',
         '--module_prefix=lv',
         f'--metadata={build_path}/lv_mp.c.json',
+        f'--constants={os.path.abspath("build/lv_const.py")}',
         f'--header_file={os.path.abspath("build/lvgl_header.h")}'
     ])
 
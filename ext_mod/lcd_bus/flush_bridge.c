@@ -0,0 +1,487 @@
+// Copyright (c) 2024 - 2025 Kevin G. Schlosser
+
+// Flushes LVGL displays without calling into Python.
+//
+// The display driver passes the address window it uses (the same tuple as
+// DisplayDriver._ADDRESS_WINDOW) a single time and the bridge installs a C
+// flush callback on the lv_display_t. The callback sets the address window,
+// sends the pixel data using the bus and tells LVGL the buffer is free once
+// the bus has finished. The bridge is registered as the callback of the bus
+// so it is the bridge that gets called when a transfer is done.
+
+// local includes
+#include "lcd_types.h"
+#include "modlcd_bus.h"
+#include "flush_bridge.h"
+
+// micropython includes
+#include "py/obj.h"
+#include "py/runtime.h"
+
+// lvgl includes
+#include "lvgl.h"
+
+// stdlib includes
+#include <string.h>
+
+
+// displays that have a bridge turned on. The bridges are kept alive by the
+// bus they are registered with.
+static mp_lcd_flush_bridge_obj_t *flush_bridges[FLUSH_BRIDGE_MAX_DISPLAYS] = { NULL };
+
+
+static mp_lcd_flush_bridge_obj_t *flush_bridge_find(lv_display_t *disp)
+{
+    for (uint8_t i = 0; i < FLUSH_BRIDGE_MAX_DISPLAYS; i++) {
+        if (flush_bridges[i] != NULL && flush_bridges[i]->disp == disp) {
+            return flush_bridges[i];
+        }
+    }
+    return NULL;
+}
+
+
+static void flush_bridge_flush_cb(lv_display_t *disp, const lv_area_t *area, uint8_t *px_map)
+{
+    mp_lcd_flush_bridge_obj_t *self = flush_bridge_find(disp);
+
+    if (self == NULL) {
+        lv_display_flush_ready(disp);
+        return;
+    }
+
+    mp_lcd_bus_obj_t *bus = (mp_lcd_bus_obj_t *)MP_OBJ_TO_PTR(self->data_bus);
+
+    // something else has been registered as the callback of the bus so the
+    // bridge would not be told when the transfer is done. Waiting for the
+    // bus is not able to be done without the chance of waiting forever so
+    // the frame gets dropped and the error shows up in get_stats.
+    if (bus->callback != MP_OBJ_FROM_PTR(self)) {
+        self->last_error = LCD_ERR_INVALID_STATE;
+        lv_display_flush_ready(disp);
+        return;
+    }
+
+    bool last_update = lv_display_flush_is_last(disp);
+    int32_t x1, y1, x2, y2;
+
+    if (self->direct) {
+        // LVGL has rendered the changed areas into a buffer that is the
+        // size of the display, nothing gets sent until the last area.
+        if (!last_update) {
+            lv_display_flush_ready(disp);
+            return;
+        }
+
+        x1 = 0;
+        y1 = 0;
+        x2 = lv_display_get_horizontal_resolution(disp) - 1;
+        y2 = lv_display_get_vertical_resolution(disp) - 1;
+    } else {
+        x1 = area->x1;
+        y1 = area->y1;
+        x2 = area->x2;
+        y2 = area->y2;
+    }
+
+    x1 += self->offset_x;
+    x2 += self->offset_x;
+    y1 += self->offset_y;
+    y2 += self->offset_y;
+
+    int32_t values[6];
+    values[FLUSH_BRIDGE_ADDR_X1] = x1;
+    values[FLUSH_BRIDGE_ADDR_Y1] = y1;
+    values[FLUSH_BRIDGE_ADDR_X2] = x2;
+    values[FLUSH_BRIDGE_ADDR_Y2] = y2;
+    values[FLUSH_BRIDGE_ADDR_WIDTH] = x2 - x1 + 1;
+    values[FLUSH_BRIDGE_ADDR_HEIGHT] = y2 - y1 + 1;
+
+    uint8_t params[FLUSH_BRIDGE_MAX_PARAMS];
+    uint8_t pos = 0;
+    mp_lcd_err_t ret;
+
+    for (uint8_t i = 0; i < self->cmd_count; i++) {
+        flush_bridge_cmd_t *cmd = &self->cmds[i];
+        bool changed = !self->cache_valid || !cmd->cached;
+
+        for (uint8_t j = 0; j < cmd->param_count; j++) {
+            uint8_t value = (uint8_t)((values[cmd->fields[j]] >> cmd->shifts[j]) & 0xFF);
+            if (self->cache[pos] != value) {
+                self->cache[pos] = value;
+                changed = true;
+            }
+            params[j] = value;
+            pos++;
+        }
+
+        if (changed) {
+            ret = lcd_panel_io_tx_param(self->data_bus, cmd->cmd, params, cmd->param_count);
+            if (ret != LCD_OK) {
+                // an exception is not able to be raised from inside of LVGL
+                self->last_error = ret;
+                self->cache_valid = false;
+                lv_display_flush_ready(disp);
+                return;
+            }
+            self->param_count++;
+        } else {
+            self->skip_count++;
+        }
+    }
+
+    self->cache_valid = true;
+
+    size_t color_size = (
+        (size_t)(x2 - x1 + 1) *
+        (size_t)(y2 - y1 + 1) *
+        (size_t)lv_color_format_get_size(lv_display_get_color_format(disp))
+    );
+
+    ret = lcd_panel_io_tx_color(
+        self->data_bus,
+        self->write_cmd,
+        px_map,
+        color_size,
+        (int)x1,
+        (int)y1,
+        (int)x2,
+        (int)y2,
+        (uint8_t)lv_display_get_rotation(disp),
+        last_update
+    );
+
+    if (ret != LCD_OK) {
+        self->last_error = ret;
+        lv_display_flush_ready(disp);
+        return;
+    }
+
+    self->flush_count++;
+}
+
+
+// called by the bus when a transfer has finished. On the ESP32 this gets
+// called from an ISR so nothing is allowed to be allocated.
+static mp_obj_t mp_lcd_flush_bridge_call(mp_obj_t self_in, size_t n_args, size_t n_kw, const mp_obj_t *args)
+{
+    LCD_UNUSED(n_args);
+    LCD_UNUSED(n_kw);
+    LCD_UNUSED(args);
+
+    mp_lcd_flush_bridge_obj_t *self = MP_OBJ_TO_PTR(self_in);
+
+    if (self->active) {
+        lv_display_flush_ready(self->disp);
+    }
+
+    return mp_const_none;
+}
+
+
+static void flush_bridge_parse_window(mp_lcd_flush_bridge_obj_t *self, mp_obj_t window)
+{
+    size_t cmd_count;
+    mp_obj_t *cmd_items;
+    mp_obj_get_array(window, &cmd_count, &cmd_items);
+
+    if (cmd_count > FLUSH_BRIDGE_MAX_CMDS) {
+        mp_raise_msg_varg(&mp_type_ValueError, MP_ERROR_TEXT("address window has more than %d commands"), FLUSH_BRIDGE_MAX_CMDS);
+    }
+
+    for (size_t i = 0; i < cmd_count; i++) {
+        mp_obj_t *entry;
+        mp_obj_get_array_fixed_n(cmd_items[i], 3, &entry);
+
+        size_t param_count;
+        mp_obj_t *param_items;
+        mp_obj_get_array(entry[1], &param_count, &param_items);
+
+        if (param_count > FLUSH_BRIDGE_MAX_PARAMS) {
+            mp_raise_msg_varg(&mp_type_ValueError, MP_ERROR_TEXT("address window command has more than %d bytes"), FLUSH_BRIDGE_MAX_PARAMS);
+        }
+
+        flush_bridge_cmd_t *cmd = &self->cmds[i];
+        cmd->cmd = (int)mp_obj_get_int(entry[0]);
+        cmd->cached = mp_obj_is_true(entry[2]);
+        cmd->param_count = (uint8_t)param_count;
+
+        for (size_t j = 0; j < param_count; j++) {
+            mp_obj_t *param;
+            mp_obj_get_array_fixed_n(param_items[j], 2, &param);
+
+            mp_int_t field = mp_obj_get_int(param[0]);
+            mp_int_t shift = mp_obj_get_int(param[1]);
+
+            if (field < FLUSH_BRIDGE_ADDR_X1 || field > FLUSH_BRIDGE_ADDR_HEIGHT || shift < 0 || shift > 24) {
+                mp_raise_ValueError(MP_ERROR_TEXT("invalid address window byte"));
+            }
+
+            cmd->fields[j] = (uint8_t)field;
+            cmd->shifts[j] = (uint8_t)shift;
+        }
+    }
+
+    self->cmd_count = (uint8_t)cmd_count;
+}
+
+
+static mp_obj_t mp_lcd_flush_bridge_make_new(const mp_obj_type_t *type, size_t n_args, size_t n_kw, const mp_obj_t *all_args)
+{
+    enum { ARG_data_bus, ARG_display, ARG_address_window, ARG_write_cmd, ARG_offset_x, ARG_offset_y };
+    const mp_arg_t make_new_args[] = {
+        { MP_QSTR_data_bus,       MP_ARG_OBJ | MP_ARG_REQUIRED },
+        { MP_QSTR_display,        MP_ARG_OBJ | MP_ARG_REQUIRED },
+        { MP_QSTR_address_window, MP_ARG_OBJ | MP_ARG_REQUIRED },
+        { MP_QSTR_write_cmd,      MP_ARG_INT | MP_ARG_REQUIRED },
+        { MP_QSTR_offset_x,       MP_ARG_INT | MP_ARG_KW_ONLY, { .u_int = 0 } },
+        { MP_QSTR_offset_y,       MP_ARG_INT | MP_ARG_KW_ONLY, { .u_int = 0 } },
+    };
+
+    mp_arg_val_t args[MP_ARRAY_SIZE(make_new_args)];
+    mp_arg_parse_all_kw_array(
+        n_args,
+        n_kw,
+        all_args,
+        MP_ARRAY_SIZE(make_new_args),
+        make_new_args,
+        args
+    );
+
+    // the binding exposes the pointer of an LVGL struct using the buffer
+    // protocol, the buffer holds the pointer itself.
+    mp_buffer_info_t bufinfo;
+    mp_get_buffer_raise(args[ARG_display].u_obj, &bufinfo, MP_BUFFER_READ);
+
+    if (bufinfo.len != sizeof(lv_display_t *)) {
+        mp_raise_TypeError(MP_ERROR_TEXT("display must be an lv_display_t object"));
+    }
+
+    // create new object, the finaliser takes the bridge out of the list
+    // of active bridges when it gets collected
+    mp_lcd_flush_bridge_obj_t *self = mp_obj_malloc_with_finaliser(mp_lcd_flush_bridge_obj_t, &mp_lcd_flush_bridge_type);
+
+    memcpy(&self->disp, bufinfo.buf, sizeof(lv_display_t *));
+
+    if (self->disp == NULL) {
+        mp_raise_ValueError(MP_ERROR_TEXT("display has been deleted"));
+    }
+
+    self->data_bus = args[ARG_data_bus].u_obj;
+    self->write_cmd = (int)args[ARG_write_cmd].u_int;
+    self->offset_x = (int32_t)args[ARG_offset_x].u_int;
+    self->offset_y = (int32_t)args[ARG_offset_y].u_int;
+    self->direct = false;
+
+    memset(self->cache, 0, sizeof(self->cache));
+    self->cache_valid = false;
+
+    self->active = false;
+    self->last_error = LCD_OK;
+
+    self->flush_count = 0;
+    self->param_count = 0;
+    self->skip_count = 0;
+
+    flush_bridge_parse_window(self, args[ARG_address_window].u_obj);
+
+    return MP_OBJ_FROM_PTR(self);
+}
+
+
+static mp_obj_t mp_lcd_flush_bridge_enable(mp_obj_t self_in)
+{
+    mp_lcd_flush_bridge_obj_t *self = MP_OBJ_TO_PTR(self_in);
+
+    if (self->active) {
+        return mp_const_none;
+    }
+
+    int8_t index = -1;
+
+    for (uint8_t i = 0; i < FLUSH_BRIDGE_MAX_DISPLAYS; i++) {
+        // a bridge that was not turned off before the display got deleted
+        // and a new display got the same address
+        if (flush_bridges[i] != NULL && flush_bridges[i]->disp == self->disp) {
+            flush_bridges[i]->active = false;
+            flush_bridges[i] = NULL;
+        }
+
+        if (flush_bridges[i] == NULL && index == -1) {
+            index = (int8_t)i;
+        }
+    }
+
+    if (index == -1) {
+        mp_raise_msg_varg(&mp_type_RuntimeError, MP_ERROR_TEXT("only %d displays are able to use a flush bridge"), FLUSH_BRIDGE_MAX_DISPLAYS);
+    }
+
+    flush_bridges[index] = self;
+    self->active = true;
+    self->cache_valid = false;
+
+    mp_lcd_bus_obj_t *bus = (mp_lcd_bus_obj_t *)MP_OBJ_TO_PTR(self->data_bus);
+    bus->callback = self_in;
+
+    lv_display_set_flush_cb(self->disp, flush_bridge_flush_cb);
+
+    return mp_const_none;
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_1(mp_lcd_flush_bridge_enable_obj, mp_lcd_flush_bridge_enable);
+
+
+// The flush callback and the callback of the bus need to be set again by
+// the display driver after this has been called.
+static mp_obj_t mp_lcd_flush_bridge_disable(mp_obj_t self_in)
+{
+    mp_lcd_flush_bridge_obj_t *self = MP_OBJ_TO_PTR(self_in);
+
+    for (uint8_t i = 0; i < FLUSH_BRIDGE_MAX_DISPLAYS; i++) {
+        if (flush_bridges[i] == self) {
+            flush_bridges[i] = NULL;
+        }
+    }
+
+    self->active = false;
+
+    mp_lcd_bus_obj_t *bus = (mp_lcd_bus_obj_t *)MP_OBJ_TO_PTR(self->data_bus);
+    if (bus->callback == self_in) {
+        bus->callback = mp_const_none;
+    }
+
+    return mp_const_none;
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_1(mp_lcd_flush_bridge_disable_obj, mp_lcd_flush_bridge_disable);
+
+
+// The bus is not touched here. A bus that still has the bridge as its
+// callback keeps the bridge alive, so the bus is either alive and using
+// another callback or it is being collected at the same time.
+static mp_obj_t mp_lcd_flush_bridge_del(mp_obj_t self_in)
+{
+    mp_lcd_flush_bridge_obj_t *self = MP_OBJ_TO_PTR(self_in);
+
+    for (uint8_t i = 0; i < FLUSH_BRIDGE_MAX_DISPLAYS; i++) {
+        if (flush_bridges[i] == self) {
+            flush_bridges[i] = NULL;
+        }
+    }
+
+    self->active = false;
+
+    return mp_const_none;
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_1(mp_lcd_flush_bridge_del_obj, mp_lcd_flush_bridge_del);
+
+
+static mp_obj_t mp_lcd_flush_bridge_is_active(mp_obj_t self_in)
+{
+    mp_lcd_flush_bridge_obj_t *self = MP_OBJ_TO_PTR(self_in);
+    return mp_obj_new_bool(self->active);
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_1(mp_lcd_flush_bridge_is_active_obj, mp_lcd_flush_bridge_is_active);
+
+
+static mp_obj_t mp_lcd_flush_bridge_set_offset(mp_obj_t self_in, mp_obj_t x_in, mp_obj_t y_in)
+{
+    mp_lcd_flush_bridge_obj_t *self = MP_OBJ_TO_PTR(self_in);
+
+    self->offset_x = (int32_t)mp_obj_get_int(x_in);
+    self->offset_y = (int32_t)mp_obj_get_int(y_in);
+
+    return mp_const_none;
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_3(mp_lcd_flush_bridge_set_offset_obj, mp_lcd_flush_bridge_set_offset);
+
+
+static mp_obj_t mp_lcd_flush_bridge_set_direct(mp_obj_t self_in, mp_obj_t direct_in)
+{
+    mp_lcd_flush_bridge_obj_t *self = MP_OBJ_TO_PTR(self_in);
+    bool direct = mp_obj_is_true(direct_in);
+
+    // the bus swaps the bytes in the buffer when it sends them. LVGL keeps
+    // drawing into the same buffer in DIRECT mode and the areas that didn't
+    // change would get swapped again on every flush.
+    mp_lcd_bus_obj_t *bus = (mp_lcd_bus_obj_t *)MP_OBJ_TO_PTR(self->data_bus);
+    if (direct && bus->rgb565_byte_swap) {
+        mp_raise_ValueError(MP_ERROR_TEXT("DIRECT render mode is not able to be used with rgb565_byte_swap"));
+    }
+
+    self->direct = direct;
+    return mp_const_none;
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_2(mp_lcd_flush_bridge_set_direct_obj, mp_lcd_flush_bridge_set_direct);
+
+
+// forces all of the address window registers to be sent on the next flush
+static mp_obj_t mp_lcd_flush_bridge_invalidate(mp_obj_t self_in)
+{
+    mp_lcd_flush_bridge_obj_t *self = MP_OBJ_TO_PTR(self_in);
+    self->cache_valid = false;
+    return mp_const_none;
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_1(mp_lcd_flush_bridge_invalidate_obj, mp_lcd_flush_bridge_invalidate);
+
+
+static mp_obj_t mp_lcd_flush_bridge_get_stats(mp_obj_t self_in)
+{
+    mp_lcd_flush_bridge_obj_t *self = MP_OBJ_TO_PTR(self_in);
+
+    mp_obj_t items[4] = {
+        mp_obj_new_int_from_uint(self->flush_count),
+        mp_obj_new_int_from_uint(self->param_count),
+        mp_obj_new_int_from_uint(self->skip_count),
+        mp_obj_new_int(self->last_error)
+    };
+
+    return mp_obj_new_tuple(4, items);
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_1(mp_lcd_flush_bridge_get_stats_obj, mp_lcd_flush_bridge_get_stats);
+
+
+static mp_obj_t mp_lcd_flush_bridge_reset_stats(mp_obj_t self_in)
+{
+    mp_lcd_flush_bridge_obj_t *self = MP_OBJ_TO_PTR(self_in);
+
+    self->flush_count = 0;
+    self->param_count = 0;
+    self->skip_count = 0;
+    self->last_error = LCD_OK;
+
+    return mp_const_none;
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_1(mp_lcd_flush_bridge_reset_stats_obj, mp_lcd_flush_bridge_reset_stats);
+
+
+static const mp_rom_map_elem_t mp_lcd_flush_bridge_locals_dict_table[] = {
+    { MP_ROM_QSTR(MP_QSTR_enable),      MP_ROM_PTR(&mp_lcd_flush_bridge_enable_obj)      },
+    { MP_ROM_QSTR(MP_QSTR_disable),     MP_ROM_PTR(&mp_lcd_flush_bridge_disable_obj)     },
+    { MP_ROM_QSTR(MP_QSTR_is_active),   MP_ROM_PTR(&mp_lcd_flush_bridge_is_active_obj)   },
+    { MP_ROM_QSTR(MP_QSTR_set_offset),  MP_ROM_PTR(&mp_lcd_flush_bridge_set_offset_obj)  },
+    { MP_ROM_QSTR(MP_QSTR_set_direct),  MP_ROM_PTR(&mp_lcd_flush_bridge_set_direct_obj)  },
+    { MP_ROM_QSTR(MP_QSTR_invalidate),  MP_ROM_PTR(&mp_lcd_flush_bridge_invalidate_obj)  },
+    { MP_ROM_QSTR(MP_QSTR_get_stats),   MP_ROM_PTR(&mp_lcd_flush_bridge_get_stats_obj)   },
+    { MP_ROM_QSTR(MP_QSTR_reset_stats), MP_ROM_PTR(&mp_lcd_flush_bridge_reset_stats_obj) },
+    { MP_ROM_QSTR(MP_QSTR___del__),     MP_ROM_PTR(&mp_lcd_flush_bridge_del_obj)         },
+};
+
+static MP_DEFINE_CONST_DICT(mp_lcd_flush_bridge_locals_dict, mp_lcd_flush_bridge_locals_dict_table);
+
+
+MP_DEFINE_CONST_OBJ_TYPE(
+    mp_lcd_flush_bridge_type,
+    MP_QSTR_FlushBridge,
+    MP_TYPE_FLAG_NONE,
+    make_new, mp_lcd_flush_bridge_make_new,
+    call, mp_lcd_flush_bridge_call,
+    locals_dict, (mp_obj_dict_t *)&mp_lcd_flush_bridge_locals_dict
+);
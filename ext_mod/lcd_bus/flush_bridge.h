@@ -0,0 +1,71 @@
+// Copyright (c) 2024 - 2025 Kevin G. Schlosser
+
+#ifndef _FLUSH_BRIDGE_H_
+    #define _FLUSH_BRIDGE_H_
+
+    //local_includes
+    #include "lcd_types.h"
+
+    // micropython includes
+    #include "py/obj.h"
+    #include "py/runtime.h"
+
+    // lvgl includes
+    #include "lvgl.h"
+
+    // the most commands and parameter bytes per command an address window
+    // is able to use. These match the parameter buffer of the DisplayDriver.
+    #define FLUSH_BRIDGE_MAX_CMDS       4
+    #define FLUSH_BRIDGE_MAX_PARAMS     4
+
+    // number of displays that are able to use a bridge at the same time
+    #define FLUSH_BRIDGE_MAX_DISPLAYS   4
+
+    // ADDR_* values in the display driver framework
+    #define FLUSH_BRIDGE_ADDR_X1        0
+    #define FLUSH_BRIDGE_ADDR_Y1        1
+    #define FLUSH_BRIDGE_ADDR_X2        2
+    #define FLUSH_BRIDGE_ADDR_Y2        3
+    #define FLUSH_BRIDGE_ADDR_WIDTH     4
+    #define FLUSH_BRIDGE_ADDR_HEIGHT    5
+
+    typedef struct _flush_bridge_cmd_t {
+        int cmd;
+        bool cached;
+        uint8_t param_count;
+        uint8_t fields[FLUSH_BRIDGE_MAX_PARAMS];
+        uint8_t shifts[FLUSH_BRIDGE_MAX_PARAMS];
+    } flush_bridge_cmd_t;
+
+    typedef struct _mp_lcd_flush_bridge_obj_t {
+        mp_obj_base_t base;
+
+        mp_obj_t data_bus;
+        lv_display_t *disp;
+
+        flush_bridge_cmd_t cmds[FLUSH_BRIDGE_MAX_CMDS];
+        uint8_t cmd_count;
+        int write_cmd;
+
+        int32_t offset_x;
+        int32_t offset_y;
+        uint8_t rotation;
+
+        // the whole buffer gets sent after the last area is rendered
+        bool direct;
+
+        // last value written to every address window parameter
+        uint8_t cache[FLUSH_BRIDGE_MAX_CMDS * FLUSH_BRIDGE_MAX_PARAMS];
+        bool cache_valid;
+
+        bool active;
+        mp_lcd_err_t last_error;
+
+        uint32_t flush_count;
+        uint32_t param_count;
+        uint32_t skip_count;
+    } mp_lcd_flush_bridge_obj_t;
+
+    extern const mp_obj_type_t mp_lcd_flush_bridge_type;
+
+#endif /* _FLUSH_BRIDGE_H_ */
@@ -0,0 +1,314 @@
+// Copyright (c) 2024 - 2025 Kevin G. Schlosser
+
+// local includes
+#include "lcd_types.h"
+#include "modlcd_bus.h"
+#include "memory_bus.h"
+
+// micropython includes
+#include "py/obj.h"
+#include "py/runtime.h"
+#include "py/objarray.h"
+#include "py/binary.h"
+
+// stdlib includes
+#include <string.h>
+
+
+#ifdef MP_PORT_UNIX
+    mp_lcd_err_t memory_tx_param(mp_obj_t obj, int lcd_cmd, void *param, size_t param_size);
+    mp_lcd_err_t memory_rx_param(mp_obj_t obj, int lcd_cmd, void *param, size_t param_size);
+    mp_lcd_err_t memory_tx_color(mp_obj_t obj, int lcd_cmd, void *color, size_t color_size, int x_start, int y_start, int x_end, int y_end, uint8_t rotation, bool last_update);
+    mp_lcd_err_t memory_del(mp_obj_t obj);
+    mp_lcd_err_t memory_init(mp_obj_t obj, uint16_t width, uint16_t height, uint8_t bpp, uint32_t buffer_size, bool rgb565_byte_swap, uint8_t cmd_bits, uint8_t param_bits);
+    mp_lcd_err_t memory_get_lane_count(mp_obj_t obj, uint8_t *lane_count);
+
+
+    static mp_obj_t mp_lcd_memory_bus_make_new(const mp_obj_type_t *type, size_t n_args, size_t n_kw, const mp_obj_t *all_args)
+    {
+        enum { ARG_caset, ARG_raset };
+        const mp_arg_t make_new_args[] = {
+            { MP_QSTR_caset, MP_ARG_INT | MP_ARG_KW_ONLY, { .u_int = 0x2A } },
+            { MP_QSTR_raset, MP_ARG_INT | MP_ARG_KW_ONLY, { .u_int = 0x2B } },
+        };
+
+        mp_arg_val_t args[MP_ARRAY_SIZE(make_new_args)];
+        mp_arg_parse_all_kw_array(
+            n_args,
+            n_kw,
+            all_args,
+            MP_ARRAY_SIZE(make_new_args),
+            make_new_args,
+            args
+        );
+
+        // create new object
+        mp_lcd_memory_bus_obj_t *self = m_new_obj(mp_lcd_memory_bus_obj_t);
+        self->base.type = &mp_lcd_memory_bus_type;
+
+        self->callback = mp_const_none;
+        self->buf1 = NULL;
+        self->buf2 = NULL;
+        self->buffer_flags = 0;
+        self->trans_done = true;
+        self->rgb565_byte_swap = false;
+
+        self->framebuffer = NULL;
+        self->framebuffer_size = 0;
+        self->width = 0;
+        self->height = 0;
+        self->bytes_per_pixel = 0;
+
+        self->caset_cmd = (int)args[ARG_caset].u_int;
+        self->raset_cmd = (int)args[ARG_raset].u_int;
+        self->window_set = false;
+
+        self->tx_param_count = 0;
+        self->tx_param_bytes = 0;
+        self->tx_color_count = 0;
+        self->tx_color_bytes = 0;
+
+        self->panel_io_handle.del = memory_del;
+        self->panel_io_handle.init = memory_init;
+        self->panel_io_handle.tx_param = memory_tx_param;
+        self->panel_io_handle.rx_param = memory_rx_param;
+        self->panel_io_handle.tx_color = memory_tx_color;
+        self->panel_io_handle.get_lane_count = memory_get_lane_count;
+        self->panel_io_handle.allocate_framebuffer = NULL;
+        self->panel_io_handle.free_framebuffer = NULL;
+
+        return MP_OBJ_FROM_PTR(self);
+    }
+
+
+    mp_lcd_err_t memory_init(mp_obj_t obj, uint16_t width, uint16_t height, uint8_t bpp, uint32_t buffer_size, bool rgb565_byte_swap, uint8_t cmd_bits, uint8_t param_bits)
+    {
+        LCD_UNUSED(buffer_size);
+        LCD_UNUSED(cmd_bits);
+        LCD_UNUSED(param_bits);
+
+        mp_lcd_memory_bus_obj_t *self = MP_OBJ_TO_PTR(obj);
+
+        self->width = width;
+        self->height = height;
+        self->bytes_per_pixel = (uint8_t)((bpp + 7) / 8);
+        self->rgb565_byte_swap = rgb565_byte_swap && bpp == 16;
+
+        size_t size = (size_t)width * (size_t)height * (size_t)self->bytes_per_pixel;
+
+        if (self->framebuffer != NULL) {
+            m_free(self->framebuffer);
+            self->framebuffer = NULL;
+        }
+
+        self->framebuffer = (uint8_t *)m_malloc0(size);
+        self->framebuffer_size = size;
+        self->window_set = false;
+
+        return LCD_OK;
+    }
+
+
+    mp_lcd_err_t memory_get_lane_count(mp_obj_t obj, uint8_t *lane_count)
+    {
+        LCD_UNUSED(obj);
+        *lane_count = 1;
+        return LCD_OK;
+    }
+
+
+    mp_lcd_err_t memory_rx_param(mp_obj_t obj, int lcd_cmd, void *param, size_t param_size)
+    {
+        LCD_UNUSED(obj);
+        LCD_UNUSED(lcd_cmd);
+
+        // there is no display to read from
+        memset(param, 0x00, param_size);
+        return LCD_OK;
+    }
+
+
+    mp_lcd_err_t memory_tx_param(mp_obj_t obj, int lcd_cmd, void *param, size_t param_size)
+    {
+        mp_lcd_memory_bus_obj_t *self = MP_OBJ_TO_PTR(obj);
+
+        self->tx_param_count++;
+        self->tx_param_bytes += param_size;
+
+        if (param_size >= 4 && (lcd_cmd == self->caset_cmd || lcd_cmd == self->raset_cmd)) {
+            uint8_t *buf = (uint8_t *)param;
+            uint16_t start = (uint16_t)((buf[0] << 8) | buf[1]);
+            uint16_t end = (uint16_t)((buf[2] << 8) | buf[3]);
+
+            if (lcd_cmd == self->caset_cmd) {
+                self->x_start = start;
+                self->x_end = end;
+            } else {
+                self->y_start = start;
+                self->y_end = end;
+            }
+            self->window_set = true;
+        }
+
+        return LCD_OK;
+    }
+
+
+    mp_lcd_err_t memory_tx_color(mp_obj_t obj, int lcd_cmd, void *color, size_t color_size, int x_start, int y_start, int x_end, int y_end, uint8_t rotation, bool last_update)
+    {
+        LCD_UNUSED(lcd_cmd);
+        LCD_UNUSED(rotation);
+        LCD_UNUSED(last_update);
+
+        mp_lcd_memory_bus_obj_t *self = MP_OBJ_TO_PTR(obj);
+
+        self->tx_color_count++;
+        self->tx_color_bytes += color_size;
+
+        // the data gets written to the address window that was set the same
+        // way a display IC would do it. If the driver doesn't set an address
+        // window the area that was passed gets used instead.
+        if (self->window_set) {
+            x_start = (int)self->x_start;
+            y_start = (int)self->y_start;
+            x_end = (int)self->x_end;
+            y_end = (int)self->y_end;
+        }
+
+        if (self->framebuffer != NULL && x_end >= x_start && y_end >= y_start) {
+            uint8_t *src = (uint8_t *)color;
+            size_t bpp = (size_t)self->bytes_per_pixel;
+            size_t row_size = (size_t)(x_end - x_start + 1) * bpp;
+
+            // clip the columns to the frame buffer
+            int x1 = x_start < 0 ? 0 : x_start;
+            int x2 = x_end >= (int)self->width ? (int)self->width - 1 : x_end;
+
+            for (int y = y_start; y <= y_end && color_size >= row_size; y++) {
+                if (y >= 0 && y < (int)self->height && x2 >= x1) {
+                    memcpy(
+                        self->framebuffer + ((size_t)y * self->width + (size_t)x1) * bpp,
+                        src + (size_t)(x1 - x_start) * bpp,
+                        (size_t)(x2 - x1 + 1) * bpp
+                    );
+                }
+                src += row_size;
+                color_size -= row_size;
+            }
+        }
+
+        bus_trans_done_cb(&self->panel_io_handle, NULL, self);
+
+        return LCD_OK;
+    }
+
+
+    mp_lcd_err_t memory_del(mp_obj_t obj)
+    {
+        mp_lcd_memory_bus_obj_t *self = MP_OBJ_TO_PTR(obj);
+
+        if (self->framebuffer != NULL) {
+            m_free(self->framebuffer);
+            self->framebuffer = NULL;
+            self->framebuffer_size = 0;
+        }
+
+        return LCD_OK;
+    }
+
+
+    static mp_obj_t mp_lcd_memory_bus_get_framebuffer(mp_obj_t self_in)
+    {
+        mp_lcd_memory_bus_obj_t *self = MP_OBJ_TO_PTR(self_in);
+
+        if (self->framebuffer == NULL) {
+            return mp_const_none;
+        }
+
+        mp_obj_array_t *view = MP_OBJ_TO_PTR(mp_obj_new_memoryview(BYTEARRAY_TYPECODE, self->framebuffer_size, self->framebuffer));
+        view->typecode |= 0x80; // used to indicate writable buffer
+        return MP_OBJ_FROM_PTR(view);
+    }
+
+    MP_DEFINE_CONST_FUN_OBJ_1(mp_lcd_memory_bus_get_framebuffer_obj, mp_lcd_memory_bus_get_framebuffer);
+
+
+    static mp_obj_t mp_lcd_memory_bus_get_window(mp_obj_t self_in)
+    {
+        mp_lcd_memory_bus_obj_t *self = MP_OBJ_TO_PTR(self_in);
+
+        if (!self->window_set) {
+            return mp_const_none;
+        }
+
+        mp_obj_t items[4] = {
+            mp_obj_new_int(self->x_start),
+            mp_obj_new_int(self->y_start),
+            mp_obj_new_int(self->x_end),
+            mp_obj_new_int(self->y_end)
+        };
+
+        return mp_obj_new_tuple(4, items);
+    }
+
+    MP_DEFINE_CONST_FUN_OBJ_1(mp_lcd_memory_bus_get_window_obj, mp_lcd_memory_bus_get_window);
+
+
+    static mp_obj_t mp_lcd_memory_bus_get_stats(mp_obj_t self_in)
+    {
+        mp_lcd_memory_bus_obj_t *self = MP_OBJ_TO_PTR(self_in);
+
+        mp_obj_t stats = mp_obj_new_dict(4);
+        mp_obj_dict_store(stats, MP_OBJ_NEW_QSTR(MP_QSTR_tx_param_count), mp_obj_new_int_from_uint(self->tx_param_count));
+        mp_obj_dict_store(stats, MP_OBJ_NEW_QSTR(MP_QSTR_tx_param_bytes), mp_obj_new_int_from_ull(self->tx_param_bytes));
+        mp_obj_dict_store(stats, MP_OBJ_NEW_QSTR(MP_QSTR_tx_color_count), mp_obj_new_int_from_uint(self->tx_color_count));
+        mp_obj_dict_store(stats, MP_OBJ_NEW_QSTR(MP_QSTR_tx_color_bytes), mp_obj_new_int_from_ull(self->tx_color_bytes));
+
+        return stats;
+    }
+
+    MP_DEFINE_CONST_FUN_OBJ_1(mp_lcd_memory_bus_get_stats_obj, mp_lcd_memory_bus_get_stats);
+
+
+    static mp_obj_t mp_lcd_memory_bus_reset_stats(mp_obj_t self_in)
+    {
+        mp_lcd_memory_bus_obj_t *self = MP_OBJ_TO_PTR(self_in);
+
+        self->tx_param_count = 0;
+        self->tx_param_bytes = 0;
+        self->tx_color_count = 0;
+        self->tx_color_bytes = 0;
+
+        return mp_const_none;
+    }
+
+    MP_DEFINE_CONST_FUN_OBJ_1(mp_lcd_memory_bus_reset_stats_obj, mp_lcd_memory_bus_reset_stats);
+
+
+    static const mp_rom_map_elem_t mp_lcd_memory_bus_locals_dict_table[] = {
+        { MP_ROM_QSTR(MP_QSTR_get_lane_count),       MP_ROM_PTR(&mp_lcd_bus_get_lane_count_obj)       },
+        { MP_ROM_QSTR(MP_QSTR_register_callback),    MP_ROM_PTR(&mp_lcd_bus_register_callback_obj)    },
+        { MP_ROM_QSTR(MP_QSTR_tx_color),             MP_ROM_PTR(&mp_lcd_bus_tx_color_obj)             },
+        { MP_ROM_QSTR(MP_QSTR_rx_param),             MP_ROM_PTR(&mp_lcd_bus_rx_param_obj)             },
+        { MP_ROM_QSTR(MP_QSTR_tx_param),             MP_ROM_PTR(&mp_lcd_bus_tx_param_obj)             },
+        { MP_ROM_QSTR(MP_QSTR_free_framebuffer),     MP_ROM_PTR(&mp_lcd_bus_free_framebuffer_obj)     },
+        { MP_ROM_QSTR(MP_QSTR_allocate_framebuffer), MP_ROM_PTR(&mp_lcd_bus_allocate_framebuffer_obj) },
+        { MP_ROM_QSTR(MP_QSTR_init),                 MP_ROM_PTR(&mp_lcd_bus_init_obj)                 },
+        { MP_ROM_QSTR(MP_QSTR_deinit),               MP_ROM_PTR(&mp_lcd_bus_deinit_obj)               },
+        { MP_ROM_QSTR(MP_QSTR___del__),              MP_ROM_PTR(&mp_lcd_bus_deinit_obj)               },
+        { MP_ROM_QSTR(MP_QSTR_get_framebuffer),      MP_ROM_PTR(&mp_lcd_memory_bus_get_framebuffer_obj) },
+        { MP_ROM_QSTR(MP_QSTR_get_window),           MP_ROM_PTR(&mp_lcd_memory_bus_get_window_obj)      },
+        { MP_ROM_QSTR(MP_QSTR_get_stats),            MP_ROM_PTR(&mp_lcd_memory_bus_get_stats_obj)       },
+        { MP_ROM_QSTR(MP_QSTR_reset_stats),          MP_ROM_PTR(&mp_lcd_memory_bus_reset_stats_obj)     },
+    };
+
+    static MP_DEFINE_CONST_DICT(mp_lcd_memory_bus_locals_dict, mp_lcd_memory_bus_locals_dict_table);
+
+    MP_DEFINE_CONST_OBJ_TYPE(
+        mp_lcd_memory_bus_type,
+        MP_QSTR_MemoryBus,
+        MP_TYPE_FLAG_NONE,
+        make_new, mp_lcd_memory_bus_make_new,
+        locals_dict, (mp_obj_dict_t *)&mp_lcd_memory_bus_locals_dict
+    );
+#endif
@@ -0,0 +1,57 @@
+// Copyright (c) 2024 - 2025 Kevin G. Schlosser
+
+#ifndef _MEMORY_BUS_H_
+    #define _MEMORY_BUS_H_
+
+    //local_includes
+    #include "modlcd_bus.h"
+
+    // micropython includes
+    #include "py/obj.h"
+    #include "py/runtime.h"
+
+    #ifdef MP_PORT_UNIX
+        typedef struct _mp_lcd_memory_bus_obj_t {
+            mp_obj_base_t base;
+
+            mp_obj_t callback;
+
+            void *buf1;
+            void *buf2;
+            uint32_t buffer_flags;
+
+            bool trans_done;
+            bool rgb565_byte_swap;
+
+            lcd_panel_io_t panel_io_handle;
+
+            /* the pixels that have been written, this is what the
+             * display would be showing
+             */
+            uint8_t *framebuffer;
+            size_t framebuffer_size;
+            uint16_t width;
+            uint16_t height;
+            uint8_t bytes_per_pixel;
+
+            /* commands that set the column and row address window */
+            int caset_cmd;
+            int raset_cmd;
+
+            /* address window set using caset_cmd and raset_cmd */
+            uint16_t x_start;
+            uint16_t y_start;
+            uint16_t x_end;
+            uint16_t y_end;
+            bool window_set;
+
+            uint32_t tx_param_count;
+            uint64_t tx_param_bytes;
+            uint32_t tx_color_count;
+            uint64_t tx_color_bytes;
+
+        } mp_lcd_memory_bus_obj_t;
+
+        extern const mp_obj_type_t mp_lcd_memory_bus_type;
+    #endif
+#endif /* _MEMORY_BUS_H_ */
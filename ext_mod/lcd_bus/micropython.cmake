@@ -13,6 +13,7 @@ if(ESP_PLATFORM)
     set(LCD_SOURCES
         ${CMAKE_CURRENT_LIST_DIR}/modlcd_bus.c
         ${CMAKE_CURRENT_LIST_DIR}/lcd_types.c
+        ${CMAKE_CURRENT_LIST_DIR}/flush_bridge.c
         ${CMAKE_CURRENT_LIST_DIR}/esp32_src/i2c_bus.c
         ${CMAKE_CURRENT_LIST_DIR}/esp32_src/spi_bus.c
         ${CMAKE_CURRENT_LIST_DIR}/esp32_src/i80_bus.c
@@ -36,16 +37,19 @@ else()
         ${CMAKE_CURRENT_LIST_DIR}
         ${CMAKE_CURRENT_LIST_DIR}/common_include
         ${CMAKE_CURRENT_LIST_DIR}/sdl_bus
+        ${CMAKE_CURRENT_LIST_DIR}/memory_bus
     )
 
     set(LCD_SOURCES
         ${CMAKE_CURRENT_LIST_DIR}/lcd_types.c
         ${CMAKE_CURRENT_LIST_DIR}/modlcd_bus.c
+        ${CMAKE_CURRENT_LIST_DIR}/flush_bridge.c
         ${CMAKE_CURRENT_LIST_DIR}/common_src/i2c_bus.c
         ${CMAKE_CURRENT_LIST_DIR}/common_src/spi_bus.c
         ${CMAKE_CURRENT_LIST_DIR}/common_src/i80_bus.c
         ${CMAKE_CURRENT_LIST_DIR}/common_src/rgb_bus.c
         ${CMAKE_CURRENT_LIST_DIR}/sdl_bus/sdl_bus.c
+        ${CMAKE_CURRENT_LIST_DIR}/memory_bus/memory_bus.c
     )
 
 endif(ESP_PLATFORM)
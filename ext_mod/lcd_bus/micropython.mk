@@ -9,6 +9,7 @@ LVGL_BINDING_DIR = $(subst /ext_mod/lcd_bus,,$(MOD_DIR))
 CFLAGS_USERMOD += -I$(MOD_DIR)
 CFLAGS_USERMOD += -I$(MOD_DIR)/common_include
 CFLAGS_USERMOD += -I$(MOD_DIR)/sdl_bus
+CFLAGS_USERMOD += -I$(MOD_DIR)/memory_bus
 
 ifneq (,$(findstring -Wno-missing-field-initializers, $(CFLAGS_USERMOD)))
     CFLAGS_USERMOD += -Wno-missing-field-initializers
@@ -16,11 +17,13 @@ endif
 
 SRC_USERMOD_C += $(MOD_DIR)/modlcd_bus.c
 SRC_USERMOD_C += $(MOD_DIR)/lcd_types.c
+SRC_USERMOD_C += $(MOD_DIR)/flush_bridge.c
 SRC_USERMOD_C += $(MOD_DIR)/common_src/i2c_bus.c
 SRC_USERMOD_C += $(MOD_DIR)/common_src/i80_bus.c
 SRC_USERMOD_C += $(MOD_DIR)/common_src/spi_bus.c
 SRC_USERMOD_C += $(MOD_DIR)/common_src/rgb_bus.c
 SRC_USERMOD_C += $(MOD_DIR)/sdl_bus/sdl_bus.c
+SRC_USERMOD_C += $(MOD_DIR)/memory_bus/memory_bus.c
 
 ifneq (,$(findstring unix, $(LV_PORT)))
     CFLAGS_USERMOD += -DMP_PORT_UNIX=1
@@ -6,9 +6,11 @@
 #include "i2c_bus.h"
 #include "i80_bus.h"
 #include "rgb_bus.h"
+#include "flush_bridge.h"
 
 #ifdef MP_PORT_UNIX
     #include "sdl_bus.h"
+    #include "memory_bus.h"
 #endif
 
 // micropython includes
@@ -291,10 +293,12 @@ static const mp_rom_map_elem_t mp_module_lcd_bus_globals_table[] = {
     { MP_ROM_QSTR(MP_QSTR_SPIBus),             MP_ROM_PTR(&mp_lcd_spi_bus_type)        },
     { MP_ROM_QSTR(MP_QSTR_I2CBus),             MP_ROM_PTR(&mp_lcd_i2c_bus_type)        },
     { MP_ROM_QSTR(MP_QSTR_I80Bus),             MP_ROM_PTR(&mp_lcd_i80_bus_type)        },
+    { MP_ROM_QSTR(MP_QSTR_FlushBridge),        MP_ROM_PTR(&mp_lcd_flush_bridge_type)   },
     { MP_ROM_QSTR(MP_QSTR__pump_main_thread),  MP_ROM_PTR(&mp_lcd_bus__pump_main_thread_obj)       },
 
     #ifdef MP_PORT_UNIX
         { MP_ROM_QSTR(MP_QSTR_SDLBus),         MP_ROM_PTR(&mp_lcd_sdl_bus_type)        },
+        { MP_ROM_QSTR(MP_QSTR_MemoryBus),      MP_ROM_PTR(&mp_lcd_memory_bus_type)     },
     #endif
     { MP_ROM_QSTR(MP_QSTR_DEBUG_ENABLED),    MP_ROM_INT(LCD_DEBUG) },
 
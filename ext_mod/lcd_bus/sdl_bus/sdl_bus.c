@@ -22,7 +22,88 @@
 
     mp_lcd_err_t sdl_tx_param(mp_obj_t obj, int lcd_cmd, void *param, size_t param_size);
     mp_lcd_err_t sdl_rx_param(mp_obj_t obj, int lcd_cmd, void *param, size_t param_size);
-    mp_lcd_err_t sdl_tx_color(mp_obj_t obj, int lcd_cmd, void *color, size_t color_size, int x_start, int y_start, int x_end, int y_end, uint8_t rotation, bool last_update);
+    static void sdl_present(mp_lcd_sdl_bus_obj_t *self)
+    {
+        SDL_RenderClear(self->renderer);
+        SDL_RenderCopy(self->renderer, self->texture, NULL, NULL);
+        SDL_RenderPresent(self->renderer);
+
+        self->last_present = SDL_GetTicks();
+        self->present_pending = false;
+        self->present_count++;
+    }
+
+
+    static bool sdl_present_due(mp_lcd_sdl_bus_obj_t *self)
+    {
+        if (self->present_interval == 0) return true;
+        return (uint32_t)(SDL_GetTicks() - self->last_present) >= self->present_interval;
+    }
+
+
+    mp_lcd_err_t sdl_tx_color(mp_obj_t obj, int lcd_cmd, void *color, size_t color_size, int x_start, int y_start, int x_end, int y_end, uint8_t rotation, bool last_update)
+    {
+        LCD_UNUSED(lcd_cmd);
+        LCD_UNUSED(color_size);
+        LCD_UNUSED(rotation);
+
+        mp_lcd_sdl_bus_obj_t *self = MP_OBJ_TO_PTR(obj);
+
+        int width = (int)self->panel_io_config.width;
+        int height = (int)self->panel_io_config.height;
+        int bytes_per_pixel = (int)self->panel_io_config.bytes_per_pixel;
+
+        if (x_start < 0) x_start = 0;
+        if (y_start < 0) y_start = 0;
+        if (x_end >= width) x_end = width - 1;
+        if (y_end >= height) y_end = height - 1;
+
+        if (x_end >= x_start && y_end >= y_start) {
+            SDL_Rect rect = {
+                .x = x_start,
+                .y = y_start,
+                .w = x_end - x_start + 1,
+                .h = y_end - y_start + 1
+            };
+
+            uint8_t *pixels = (uint8_t *)color;
+            int pitch;
+
+            if (self->full_frame) {
+                // DIRECT and FULL render modes, the buffer is the size of
+                // the display and the area is at its position in the buffer
+                pitch = width * bytes_per_pixel;
+                pixels += rect.y * pitch + rect.x * bytes_per_pixel;
+            } else {
+                // PARTIAL render mode, only the area is in the buffer
+                pitch = rect.w * bytes_per_pixel;
+            }
+
+            // only the area that changed gets copied into the texture
+            SDL_UpdateTexture(self->texture, &rect, pixels, pitch);
+
+            self->upload_count++;
+            self->upload_bytes += (uint64_t)(rect.w * rect.h * bytes_per_pixel);
+            self->present_pending = true;
+        }
+
+        // the window is only updated after the last area of a frame
+        if (last_update && self->present_pending) {
+            if (sdl_present_due(self)) {
+                sdl_present(self);
+            } else {
+                // poll_events presents it once the interval has passed
+                self->skipped_present_count++;
+            }
+        }
+
+        if (self->callback != mp_const_none && mp_obj_is_callable(self->callback)) {
+            mp_call_function_n_kw(self->callback, 0, 0, NULL);
+        }
+
+        return LCD_OK;
+    }
+
     mp_lcd_err_t sdl_del(mp_obj_t obj);
     mp_lcd_err_t sdl_init(mp_obj_t obj, uint16_t width, uint16_t height, uint8_t bpp, uint32_t buffer_size,  bool rgb565_byte_swap, uint8_t cmd_bits, uint8_t param_bits);
     mp_lcd_err_t sdl_get_lane_count(mp_obj_t obj, uint8_t *lane_count);
@@ -74,6 +155,17 @@
         self->keypad_callback = mp_const_none;
         self->inited = false;
 
+        self->present_interval = 0;
+        self->last_present = 0;
+        self->present_pending = false;
+
+        self->upload_count = 0;
+        self->upload_bytes = 0;
+        self->present_count = 0;
+        self->skipped_present_count = 0;
+
+        self->full_frame = false;
+
         return MP_OBJ_FROM_PTR(self);
     }
 
@@ -97,32 +189,6 @@
         return LCD_OK;
     }
 
-    mp_lcd_err_t sdl_tx_color(mp_obj_t obj, int lcd_cmd, void *color, size_t color_size, int x_start, int y_start, int x_end, int y_end, uint8_t rotation, bool last_update)
-    {
-        LCD_UNUSED(x_start);
-        LCD_UNUSED(y_start);
-        LCD_UNUSED(x_end);
-        LCD_UNUSED(y_end);
-        LCD_UNUSED(color_size);
-        LCD_UNUSED(rotation);
-        LCD_UNUSED(last_update);
-
-        mp_lcd_sdl_bus_obj_t *self = MP_OBJ_TO_PTR(obj);
-
-        int pitch = self->panel_io_config.width * self->panel_io_config.bytes_per_pixel;
-
-        SDL_UpdateTexture(self->texture, NULL, color, pitch);
-        SDL_RenderClear(self->renderer);
-        SDL_RenderCopy(self->renderer, self->texture, NULL, NULL);
-        SDL_RenderPresent(self->renderer);
-
-        if (self->callback != mp_const_none && mp_obj_is_callable(self->callback)) {
-            mp_call_function_n_kw(self->callback, 0, 0, NULL);
-        }
-
-        return LCD_OK;
-    }
-
     mp_lcd_err_t sdl_del(mp_obj_t obj)
     {
         mp_lcd_sdl_bus_obj_t *self = MP_OBJ_TO_PTR(obj);
@@ -222,6 +288,14 @@
             }
         }
 
+        // frames that were held back by the frame rate limit
+        for (uint8_t i=0;i < instance_count;i++) {
+            self = instances[i];
+            if (self != NULL && self->present_pending && sdl_present_due(self)) {
+                sdl_present(self);
+            }
+        }
+
         return mp_const_none;
     }
 
@@ -344,6 +418,64 @@
     MP_DEFINE_CONST_FUN_OBJ_KW(mp_lcd_sdl_realloc_buffer_obj, 3, mp_lcd_sdl_realloc_buffer);
 
 
+    static mp_obj_t mp_lcd_sdl_set_fps_limit(mp_obj_t self_in, mp_obj_t fps_in)
+    {
+        mp_lcd_sdl_bus_obj_t *self = MP_OBJ_TO_PTR(self_in);
+        mp_int_t fps = mp_obj_get_int(fps_in);
+
+        if (fps <= 0) {
+            self->present_interval = 0;
+        } else {
+            self->present_interval = (uint32_t)(1000 / fps);
+        }
+
+        return mp_const_none;
+    }
+
+    MP_DEFINE_CONST_FUN_OBJ_2(mp_lcd_sdl_set_fps_limit_obj, mp_lcd_sdl_set_fps_limit);
+
+
+    static mp_obj_t mp_lcd_sdl_set_full_frame(mp_obj_t self_in, mp_obj_t full_frame_in)
+    {
+        mp_lcd_sdl_bus_obj_t *self = MP_OBJ_TO_PTR(self_in);
+        self->full_frame = mp_obj_is_true(full_frame_in);
+        return mp_const_none;
+    }
+
+    MP_DEFINE_CONST_FUN_OBJ_2(mp_lcd_sdl_set_full_frame_obj, mp_lcd_sdl_set_full_frame);
+
+
+    static mp_obj_t mp_lcd_sdl_get_stats(mp_obj_t self_in)
+    {
+        mp_lcd_sdl_bus_obj_t *self = MP_OBJ_TO_PTR(self_in);
+
+        mp_obj_t stats = mp_obj_new_dict(4);
+        mp_obj_dict_store(stats, MP_OBJ_NEW_QSTR(MP_QSTR_upload_count), mp_obj_new_int_from_uint(self->upload_count));
+        mp_obj_dict_store(stats, MP_OBJ_NEW_QSTR(MP_QSTR_upload_bytes), mp_obj_new_int_from_ull(self->upload_bytes));
+        mp_obj_dict_store(stats, MP_OBJ_NEW_QSTR(MP_QSTR_present_count), mp_obj_new_int_from_uint(self->present_count));
+        mp_obj_dict_store(stats, MP_OBJ_NEW_QSTR(MP_QSTR_skipped_present_count), mp_obj_new_int_from_uint(self->skipped_present_count));
+
+        return stats;
+    }
+
+    MP_DEFINE_CONST_FUN_OBJ_1(mp_lcd_sdl_get_stats_obj, mp_lcd_sdl_get_stats);
+
+
+    static mp_obj_t mp_lcd_sdl_reset_stats(mp_obj_t self_in)
+    {
+        mp_lcd_sdl_bus_obj_t *self = MP_OBJ_TO_PTR(self_in);
+
+        self->upload_count = 0;
+        self->upload_bytes = 0;
+        self->present_count = 0;
+        self->skipped_present_count = 0;
+
+        return mp_const_none;
+    }
+
+    MP_DEFINE_CONST_FUN_OBJ_1(mp_lcd_sdl_reset_stats_obj, mp_lcd_sdl_reset_stats);
+
+
     int process_event(mp_lcd_sdl_bus_obj_t *self, SDL_Event * event)
     {
         if (!self->inited) return 0;
@@ -613,6 +745,10 @@
         { MP_ROM_QSTR(MP_QSTR_register_keypad_callback),  MP_ROM_PTR(&mp_lcd_sdl_register_keypad_callback_obj) },
         { MP_ROM_QSTR(MP_QSTR_register_window_callback),  MP_ROM_PTR(&mp_lcd_sdl_register_window_callback_obj) },
         { MP_ROM_QSTR(MP_QSTR_poll_events),  MP_ROM_PTR(&mp_lcd_sdl_poll_events_obj) },
+        { MP_ROM_QSTR(MP_QSTR_set_fps_limit),     MP_ROM_PTR(&mp_lcd_sdl_set_fps_limit_obj)     },
+        { MP_ROM_QSTR(MP_QSTR_set_full_frame),    MP_ROM_PTR(&mp_lcd_sdl_set_full_frame_obj)    },
+        { MP_ROM_QSTR(MP_QSTR_get_stats),         MP_ROM_PTR(&mp_lcd_sdl_get_stats_obj)         },
+        { MP_ROM_QSTR(MP_QSTR_reset_stats),       MP_ROM_PTR(&mp_lcd_sdl_reset_stats_obj)       },
         { MP_ROM_QSTR(MP_QSTR_WINDOW_FULLSCREEN),         MP_ROM_INT(SDL_WINDOW_FULLSCREEN)         },
         { MP_ROM_QSTR(MP_QSTR_WINDOW_FULLSCREEN_DESKTOP), MP_ROM_INT(SDL_WINDOW_FULLSCREEN_DESKTOP) },
         { MP_ROM_QSTR(MP_QSTR_WINDOW_BORDERLESS),         MP_ROM_INT(SDL_WINDOW_BORDERLESS)         },
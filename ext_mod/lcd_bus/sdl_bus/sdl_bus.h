@@ -36,6 +36,7 @@
 
             void *buf1;
             void *buf2;
+            uint32_t buffer_flags;
 
             bool trans_done;
             bool rgb565_byte_swap;
@@ -56,6 +57,20 @@
             bool ignore_size_chg;
             bool inited;
 
+            // minimum number of milliseconds between presents, 0 is no limit
+            uint32_t present_interval;
+            uint32_t last_present;
+            bool present_pending;
+
+            uint32_t upload_count;
+            uint64_t upload_bytes;
+            uint32_t present_count;
+            uint32_t skipped_present_count;
+
+            // the buffers that get flushed are the size of the display,
+            // set by the display driver for the FULL and DIRECT render modes
+            bool full_frame;
+
         } mp_lcd_sdl_bus_obj_t;
 
         extern const mp_obj_type_t mp_lcd_sdl_bus_type;
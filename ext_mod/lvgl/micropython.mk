@@ -28,6 +28,7 @@ ALL_LVGL_SRC = $(shell find $(LVGL_DIR) -type f -name '*.h') $(LVGL_BINDING_DIR)
 
 LVGL_MPY = $(BUILD)/lv_mpy.c
 LVGL_MPY_METADATA = $(BUILD)/lv_mpy.json
+LVGL_MPY_CONSTANTS = $(LVGL_BINDING_DIR)/build/lv_const.py
 
 
 SRC_USERMOD_LIB_C += $(shell find $(LVGL_DIR)/src -type f -name "*.c")
@@ -38,7 +39,7 @@ $(LVGL_MPY): $(ALL_LVGL_SRC) $(LVGL_BINDING_DIR)/gen/$(GEN_SCRIPT)_api_gen_mpy.p
 	$(ECHO) "LVGL-GEN $@"
 	$(Q)mkdir -p $(dir $@)
 
-	$(Q)$(PYTHON) $(LVGL_BINDING_DIR)/gen/$(GEN_SCRIPT)_api_gen_mpy.py $(LV_CFLAGS) --board=$(LV_PORT) --output=$(LVGL_MPY)  --include=$(LIB_DIR) --include=$(LVGL_DIR)  --module_name=lvgl --module_prefix=lv --metadata=$(LVGL_MPY_METADATA) --header_file=$(LVGL_DIR)/lvgl.h
+	$(Q)$(PYTHON) $(LVGL_BINDING_DIR)/gen/$(GEN_SCRIPT)_api_gen_mpy.py $(LV_CFLAGS) --board=$(LV_PORT) --output=$(LVGL_MPY)  --include=$(LIB_DIR) --include=$(LVGL_DIR)  --module_name=lvgl --module_prefix=lv --metadata=$(LVGL_MPY_METADATA) --constants=$(LVGL_MPY_CONSTANTS) --header_file=$(LVGL_DIR)/lvgl.h
 
 .PHONY: LVGL_MPY
 LVGL_MPY: $(LVGL_MPY)
@@ -0,0 +1,255 @@
+# Copyright (c) 2024 - 2025 Kevin G. Schlosser
+
+# Content hash cache for the binding generators.
+#
+# The key for a cache entry is a hash of everything that is able to change
+# the output of a generator: the headers (or the preprocessor output), the
+# preprocessor arguments and the source code of the generator itself. If
+# nothing has changed the generated files are copied from the cache instead
+# of parsing LVGL and generating the bindings again.
+#
+# The cache is stored in build/gen_cache by default. Setting the
+# LVGL_API_GEN_CACHE environment variable changes where the cache is
+# stored, setting it to an empty string turns the cache off.
+
+import os
+import sys
+import shutil
+import pickle
+import hashlib
+
+
+SCRIPT_DIR = os.path.abspath(os.path.dirname(__file__))
+DEFAULT_CACHE_DIR = os.path.abspath(
+    os.path.join(SCRIPT_DIR, '..', 'build', 'gen_cache')
+)
+
+# number of entries that are kept, the oldest ones get removed first
+MAX_ENTRIES = 8
+
+_GENERATOR_FILES = (
+    'gen_cache.py',
+    'gen_prune.py',
+    'stub_gen.py',
+    'fixed_gen_json.py'
+)
+
+
+def get_cache_dir(cache_dir=None):
+    if cache_dir is None:
+        cache_dir = os.environ.get('LVGL_API_GEN_CACHE', DEFAULT_CACHE_DIR)
+
+    if not cache_dir:
+        return None
+
+    return os.path.abspath(cache_dir)
+
+
+def hash_files(hasher, paths):
+    for path in sorted(paths):
+        hasher.update(path.encode('utf-8'))
+        with open(path, 'rb') as f:
+            hasher.update(f.read())
+
+
+def hash_tree(hasher, path, extensions=('.h',)):
+    paths = []
+    for root, _, files in os.walk(path):
+        for file in files:
+            if file.endswith(extensions):
+                paths.append(os.path.join(root, file))
+
+    hash_files(hasher, paths)
+
+
+def _entry_id(entry):
+    stat = os.stat(entry)
+    return stat.st_ino, stat.st_ctime_ns
+
+
+class GenCache(object):
+
+    def __init__(self, cache_dir, generator, *key_parts):
+        self.hasher = hashlib.sha256()
+
+        # the generator version
+        hash_files(self.hasher, [os.path.abspath(generator)])
+        hash_files(
+            self.hasher,
+            [
+                os.path.join(SCRIPT_DIR, file)
+                for file in _GENERATOR_FILES
+                if os.path.exists(os.path.join(SCRIPT_DIR, file))
+            ]
+        )
+        self.hasher.update(sys.version.encode('utf-8'))
+
+        for part in key_parts:
+            self.update(part)
+
+        self.cache_dir = cache_dir
+
+    def update(self, part):
+        if isinstance(part, (list, tuple)):
+            for item in part:
+                self.update(item)
+        else:
+            if not isinstance(part, bytes):
+                part = str(part).encode('utf-8')
+
+            self.hasher.update(part)
+            self.hasher.update(b'\x00')
+
+    @property
+    def key(self):
+        return self.hasher.hexdigest()
+
+    @property
+    def enabled(self):
+        return self.cache_dir is not None
+
+    def _entry_path(self, name):
+        return os.path.join(self.cache_dir, self.key, name)
+
+    def restore(self, files):
+        """
+        Copies the cached files to their destinations.
+
+        files is a dict of cache name -> destination path. Returns False if
+        any of the files is not in the cache. Builds that run at the same
+        time share the cache, an entry that gets replaced or removed while
+        it is being copied is a cache miss.
+        """
+        if not self.enabled:
+            return False
+
+        for name in files:
+            if not os.path.exists(self._entry_path(name)):
+                return False
+
+        entry = os.path.join(self.cache_dir, self.key)
+        cached_files = []
+
+        try:
+            # an open file keeps its contents when the entry gets replaced,
+            # the files all come from the same entry if the entry is still
+            # the same one after they have been opened
+            entry_id = _entry_id(entry)
+            for name in files:
+                cached_files.append(open(self._entry_path(name), 'rb'))
+
+            if _entry_id(entry) != entry_id:
+                return False
+
+            for cached_file, dst in zip(cached_files, files.values()):
+                with open(dst, 'wb') as f:
+                    shutil.copyfileobj(cached_file, f)
+
+            # keeps the entry from being removed as one of the oldest
+            os.utime(entry)
+        except OSError:
+            return False
+        finally:
+            for cached_file in cached_files:
+                cached_file.close()
+
+        return True
+
+    def store(self, files):
+        """
+        Copies files (a dict of cache name -> source path) into the cache.
+        """
+        if not self.enabled:
+            return
+
+        entry = os.path.join(self.cache_dir, self.key)
+        # builds that run at the same time share the cache
+        tmp_entry = f'{entry}.{os.getpid()}.tmp'
+        old_entry = f'{entry}.{os.getpid()}.old.tmp'
+
+        for path in (tmp_entry, old_entry):
+            if os.path.exists(path):
+                shutil.rmtree(path)
+
+        os.makedirs(tmp_entry)
+
+        for name, src in files.items():
+            shutil.copyfile(src, os.path.join(tmp_entry, name))
+
+        # The entry is only ever renamed, a directory is not able to be
+        # renamed over one that has files in it so the old entry is moved
+        # out of the way first. A build that looks at the entry in between
+        # doesn't find it and sees a cache miss, it never sees an entry
+        # that is only partly written.
+        try:
+            os.rename(entry, old_entry)
+        except OSError:
+            # there was no entry or another build moved it first
+            pass
+
+        try:
+            os.rename(tmp_entry, entry)
+        except OSError:
+            # another build stored the same entry first
+            shutil.rmtree(tmp_entry, ignore_errors=True)
+
+        shutil.rmtree(old_entry, ignore_errors=True)
+        self._prune()
+
+    def load(self, name):
+        """
+        Returns a pickled object from the cache or None.
+        """
+        if not self.enabled:
+            return None
+
+        path = self._entry_path(name)
+        if not os.path.exists(path):
+            return None
+
+        try:
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        except Exception:  # NOQA
+            return None
+
+    def save(self, name, obj):
+        if not self.enabled:
+            return
+
+        entry = os.path.join(self.cache_dir, self.key)
+        if not os.path.exists(entry):
+            os.makedirs(entry, exist_ok=True)
+
+        # pycparser's AST is deeply nested
+        recursion_limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(max(recursion_limit, 100000))
+
+        tmp_path = f'{self._entry_path(name)}.{os.getpid()}.tmp'
+
+        try:
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        finally:
+            sys.setrecursionlimit(recursion_limit)
+
+        try:
+            os.replace(tmp_path, self._entry_path(name))
+        except OSError:
+            # the entry was replaced by another build
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+        self._prune()
+
+    def _prune(self):
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            if os.path.isdir(path) and not name.endswith('.tmp'):
+                entries.append((os.path.getmtime(path), path))
+
+        entries.sort()
+
+        for _, path in entries[:-MAX_ENTRIES]:
+            shutil.rmtree(path, ignore_errors=True)
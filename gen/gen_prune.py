@@ -0,0 +1,234 @@
+# Copyright (c) 2024 - 2025 Kevin G. Schlosser
+
+# Usage driven pruning of the LVGL bindings.
+#
+# When make.py is run using --prune-bindings it writes a JSON file that
+# lists the Python sources of the application and the allow-lists using
+# `write_spec`, and sets the LVGL_API_GEN_PRUNE environment variable to the
+# path of that file. make.py imports this module so the name of the
+# environment variable is only in one place.
+# Every identifier that is used in the sources (and every name in the
+# allow-lists) is collected and the generator only makes bindings for the
+# widgets, functions, enums, constants and globals that are able to be
+# reached using one of those names. The structs and callbacks those need
+# get generated the same way they always do, when a function uses them.
+#
+# Sources are able to be:
+#   * a Python file
+#   * a directory, all of the Python files in it get scanned
+#   * a MicroPython manifest (a file with a name that starts with "manifest"), the
+#     files that get frozen by it get scanned. build/manifest.py has the
+#     frozen drivers and the display.py made from a toml file.
+#   * a text file (.txt) that has one name per line, "#" starts a comment.
+#     Names are able to use wildcards, "chart*" or "*_cb".
+#
+# The names are collected from the whole source file, comments and strings
+# included, so it is better to keep something that isn't used than to drop
+# something that is. What gets dropped is written to a report file.
+
+import os
+import re
+import json
+import fnmatch
+
+
+PRUNE_ENV = 'LVGL_API_GEN_PRUNE'
+
+_WORD_PATTERN = re.compile(r'[A-Za-z_][A-Za-z0-9_]*')
+
+_MANIFEST_PATTERN = re.compile(
+    r'^\s*(freeze|include|module|package)\(\s*'
+    r'[\'"]([^\'"]+)[\'"]'
+    r'(?:\s*,\s*(?:script\s*=\s*)?[\'"]([^\'"]+)[\'"])?'
+    r'(?:.*base_path\s*=\s*[\'"]([^\'"]+)[\'"])?',
+    re.MULTILINE
+)
+
+
+def write_spec(spec_path, sources, report_path=None):
+    """
+    Writes the file `load` reads. The environment variable in `PRUNE_ENV`
+    needs to be set to spec_path for the generator to use it.
+    """
+    spec_dir = os.path.dirname(os.path.abspath(spec_path))
+    if not os.path.exists(spec_dir):
+        os.makedirs(spec_dir)
+
+    with open(spec_path, 'w') as f:
+        f.write(json.dumps({
+            'sources': [os.path.abspath(source) for source in sources],
+            'report': report_path
+        }, indent=4))
+
+
+def load():
+    """
+    Returns a `Pruner` if pruning is turned on, otherwise None.
+    """
+    spec_path = os.environ.get(PRUNE_ENV, None)
+    if not spec_path:
+        return None
+
+    with open(spec_path, 'r') as f:
+        spec = json.load(f)
+
+    return Pruner(spec.get('sources', []), spec.get('report', None))
+
+
+class Pruner(object):
+
+    def __init__(self, sources, report_path=None):
+        self.report_path = report_path
+        self.names = set()
+        self.patterns = []
+        self.files = []
+        self.missing = []
+        # kind -> [(c name, python name), ...]
+        self.dropped = {}
+        self.kept = {}
+
+        for source in sources:
+            self._add_source(os.path.abspath(source))
+
+        self.files.sort()
+
+    def _add_source(self, path):
+        if path in self.files:
+            return
+
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for file in sorted(files):
+                    if file.endswith('.py'):
+                        self._add_source(os.path.join(root, file))
+        elif not os.path.isfile(path):
+            self.missing.append(path)
+        elif path.endswith('.txt'):
+            self.files.append(path)
+            self._add_allow_list(path)
+        elif os.path.split(path)[-1].startswith('manifest'):
+            self.files.append(path)
+            self._add_manifest(path)
+        elif path.endswith('.py'):
+            self.files.append(path)
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                self.names.update(_WORD_PATTERN.findall(f.read()))
+
+    def _add_allow_list(self, path):
+        with open(path, 'r') as f:
+            for line in f:
+                line = line.split('#', 1)[0].strip()
+                if not line:
+                    continue
+
+                if any(c in line for c in '*?['):
+                    self.patterns.append(line)
+                else:
+                    self.names.add(line)
+
+    def _add_manifest(self, path):
+        manifest_dir = os.path.dirname(path)
+
+        with open(path, 'r') as f:
+            data = f.read()
+
+        for func, arg1, arg2, base_path in _MANIFEST_PATTERN.findall(data):
+            # paths that use the variables of the MicroPython build are
+            # the modules of the port, those don't use LVGL
+            if '$(' in arg1 or '$(' in arg2 or '$(' in base_path:
+                continue
+
+            if func == 'include':
+                include_path = os.path.join(manifest_dir, arg1)
+                if os.path.isdir(include_path):
+                    include_path = os.path.join(include_path, 'manifest.py')
+                self._add_source(os.path.abspath(include_path))
+            elif func == 'freeze':
+                # freeze(path) or freeze(path, script)
+                source_path = os.path.join(manifest_dir, arg1)
+                if arg2:
+                    source_path = os.path.join(source_path, arg2)
+                self._add_source(os.path.abspath(source_path))
+            else:
+                # module(file, base_path=...) and package(name, base_path=...)
+                if not base_path:
+                    base_path = manifest_dir
+                source_path = os.path.join(manifest_dir, base_path, arg1)
+                self._add_source(os.path.abspath(source_path))
+
+    def key(self):
+        """
+        Everything that changes what gets generated, this is added to the
+        key of the generator cache.
+        """
+        return '\n'.join(sorted(self.names) + sorted(self.patterns))
+
+    def is_used(self, *py_names):
+        for py_name in py_names:
+            if py_name in self.names:
+                return True
+
+            for pattern in self.patterns:
+                if fnmatch.fnmatchcase(py_name, pattern):
+                    return True
+
+        return False
+
+    def keep(self, kind, c_name, *py_names):
+        """
+        Returns True if one of the names that the item is able to be reached
+        with is used. `py_names` are the names the item has in Python.
+        """
+        if self.is_used(*py_names):
+            self.kept.setdefault(kind, []).append(c_name)
+            return True
+
+        self.drop(kind, c_name, py_names[0])
+        return False
+
+    def drop(self, kind, c_name, py_name):
+        self.dropped.setdefault(kind, []).append((c_name, py_name))
+
+    def summary(self):
+        kept = sum(len(value) for value in self.kept.values())
+        dropped = sum(len(value) for value in self.dropped.values())
+        return (
+            f'LVGL binding pruning: {kept} kept, {dropped} dropped '
+            f'({len(self.files)} source files scanned)'
+        )
+
+    def write_report(self):
+        if not self.report_path:
+            return
+
+        lines = [self.summary(), '']
+
+        if self.missing:
+            lines.append('Sources not found:')
+            lines.extend(f'    {path}' for path in self.missing)
+            lines.append('')
+
+        lines.append('Sources scanned:')
+        lines.extend(f'    {path}' for path in self.files)
+        lines.append('')
+
+        for kind in sorted(set(self.kept.keys()) | set(self.dropped.keys())):
+            dropped = self.dropped.get(kind, [])
+            lines.append(
+                f'{kind}: {len(self.kept.get(kind, []))} kept, '
+                f'{len(dropped)} dropped'
+            )
+            for c_name, py_name in sorted(dropped):
+                if c_name == py_name:
+                    lines.append(f'    {c_name}')
+                else:
+                    lines.append(f'    {c_name} ({py_name})')
+            lines.append('')
+
+        report_dir = os.path.dirname(os.path.abspath(self.report_path))
+        if not os.path.exists(report_dir):
+            os.makedirs(report_dir)
+
+        with open(self.report_path, 'w') as f:
+            f.write('\n'.join(lines))
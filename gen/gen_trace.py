@@ -0,0 +1,67 @@
+# Copyright (c) 2024 - 2025 Kevin G. Schlosser
+
+# Adds events to the timeline of the build when make.py is run using
+# --trace. The events get appended as JSON lines to the file set in the
+# LVGL_MICROPY_TRACE_EVENTS environment variable and make.py adds them to
+# the trace when the build finishes. Nothing is recorded if the environment
+# variable is not set.
+
+import os
+import json
+import time
+
+
+TRACE_EVENTS_ENV = 'LVGL_MICROPY_TRACE_EVENTS'
+
+
+class span(object):
+    """
+    Records how long a part of the generator takes.
+
+        with gen_trace.span('parse'):
+            ...
+
+    For module level code that can't be put into a with block `begin` and
+    `end` can be called instead.
+    """
+
+    def __init__(self, name, **args):
+        self.name = name
+        self.args = args
+        self.start = 0.0
+
+    def begin(self):
+        self.start = time.time()
+        return self
+
+    def end(self, error=None):
+        path = os.environ.get(TRACE_EVENTS_ENV, None)
+        if not path:
+            return
+
+        event = dict(
+            name=self.name,
+            cat='gen',
+            ph='X',
+            ts=int(self.start * 1000000),
+            dur=int((time.time() - self.start) * 1000000),
+            pid=os.getpid(),
+            tid=0
+        )
+
+        if self.args:
+            event['args'] = self.args
+
+        if error is not None:
+            event.setdefault('args', {})['error'] = error
+
+        # the lines are small enough to be written in a single write so
+        # processes that run at the same time don't mix up the lines
+        with open(path, 'a') as f:
+            f.write(json.dumps(event) + '\n')
+
+    def __enter__(self):
+        return self.begin()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.end(None if exc_type is None else exc_type.__name__)
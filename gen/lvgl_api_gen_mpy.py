@@ -582,13 +582,43 @@ func_prototypes = {}
 parser = c_parser.CParser()
 gen = c_generator.CGenerator()
 
-ast = pycparser.parse_file(
-    args.input[0], 
-    use_cpp=True, 
+import gen_cache  # NOQA
+
+pp_data = pycparser.preprocess_file(
+    args.input[0],
     cpp_path=cpp_path,
     cpp_args=cpp_args
 )
 
+# if the preprocessor output and the generator have not changed the output
+# from the last time the bindings were generated gets used. The AST gets
+# cached separately because it only depends on the preprocessor output.
+cache_dir = gen_cache.get_cache_dir()
+ast_cache = gen_cache.GenCache(
+    cache_dir, __file__, pp_data, pycparser.__version__)
+output_cache = gen_cache.GenCache(
+    cache_dir, __file__, ast_cache.key, args.input,
+    args.module_name, args.module_prefix, args.board
+)
+
+cache_files = {'output.c': args.output}
+if args.metadata:
+    cache_files['metadata.json'] = args.metadata
+
+if output_cache.restore(cache_files):
+    if args.metadata:
+        import stub_gen
+
+        stub_gen.run(args.metadata)
+
+    sys.exit(0)
+
+ast = ast_cache.load('ast.pickle')
+
+if ast is None:
+    ast = parser.parse(pp_data, args.input[0])
+    ast_cache.save('ast.pickle', ast)
+
 
 forward_struct_decls = {}
 
@@ -1858,11 +1888,16 @@ static MP_DEFINE_CONST_CLASSMETHOD_OBJ(mp_lv_cast_class_method, MP_ROM_PTR(&mp_l
 static MP_DEFINE_CONST_FUN_OBJ_2(mp_lv_cast_instance_obj, mp_lv_cast_instance);
 
 // Dereference a struct/blob. This allows access to the raw data the struct holds
+// When a memoryview is passed as the third argument it gets pointed at the data
+// and returned instead of creating a new memoryview. Callbacks that get called
+// a lot (flush, file system) are able to keep a single memoryview that way and
+// nothing gets allocated when they are called.
 
 static mp_obj_t mp_lv_dereference(size_t argc, const mp_obj_t *argv)
 {
     mp_obj_t self_in = argv[0];
     mp_obj_t size_in = argc > 1? argv[1]: mp_const_none;
+    mp_obj_t view_in = argc > 2? argv[2]: mp_const_none;
     mp_lv_struct_t *self = MP_OBJ_TO_PTR(self_in);
     size_t size = 0;
     if (size_in == mp_const_none){
@@ -1872,13 +1907,26 @@ static mp_obj_t mp_lv_dereference(size_t argc, const mp_obj_t *argv)
         size = (size_t)mp_obj_get_int(size_in);
     }
     if (size == 0) return mp_const_none;
-    mp_obj_array_t *view = MP_OBJ_TO_PTR(mp_obj_new_memoryview(BYTEARRAY_TYPECODE,
-        size, self->data));
+    mp_obj_array_t *view;
+    if (view_in == mp_const_none) {
+        view = MP_OBJ_TO_PTR(mp_obj_new_memoryview(BYTEARRAY_TYPECODE,
+            size, self->data));
+    } else {
+        if (!MP_OBJ_IS_TYPE(view_in, &mp_type_memoryview))
+            nlr_raise(
+                mp_obj_new_exception_msg(
+                    &mp_type_TypeError, MP_ERROR_TEXT("view must be a memoryview!")));
+        view = MP_OBJ_TO_PTR(view_in);
+        view->typecode = BYTEARRAY_TYPECODE;
+        view->free = 0; // offset into the data for a memoryview
+        view->len = size;
+        view->items = self->data;
+    }
     view->typecode |= 0x80; // used to indicate writable buffer
     return MP_OBJ_FROM_PTR(view);
 }
 
-static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(mp_lv_dereference_obj, 1, 2, mp_lv_dereference);
+static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(mp_lv_dereference_obj, 1, 3, mp_lv_dereference);
 
 // Callback function handling
 // Callback is either a callable object or a pointer. If it's a callable object, set user_data to the callback.
@@ -3607,3 +3655,5 @@ if args.metadata:
 
 stdout.close()
 
+output_cache.store(cache_files)
+
@@ -110,6 +110,7 @@ argParser.add_argument('--board', dest='board', help='Board or OS', metavar='<Bo
 argParser.add_argument('--output', dest='output', help='Output file path', metavar='<Output path>', action='store')
 argParser.add_argument('--debug', dest='debug', help='enable debugging output', action='store_true')
 argParser.add_argument('--header_file', dest='header', action='store', default=None)
+argParser.add_argument('--constants', dest='constants', help='Optional file to emit a Python module that has the enum and constant values using const()', metavar='<Constants File Name>', action='store')
 
 args, unknownargs = argParser.parse_known_args()
 
@@ -126,6 +127,59 @@ gen_json_path = os.path.join(lvgl_path, 'scripts/gen_json')
 
 sys.path.insert(0, gen_json_path)
 
+
+import gen_cache  # NOQA
+import gen_trace  # NOQA
+import gen_prune  # NOQA
+
+# None unless only the parts of LVGL that the application uses get generated
+prune = gen_prune.load()
+
+# parsing LVGL and generating the bindings takes a long time, if none of the
+# inputs have changed since the last build the cached output gets used.
+# This has to be checked before the JSON API gets generated because that
+# parses LVGL as well.
+output_cache = gen_cache.GenCache(
+    gen_cache.get_cache_dir(), __file__, args.define, args.include,
+    args.module_name, args.module_prefix, args.board, unknownargs,
+    pycparser.__version__, None if prune is None else prune.key()
+)
+gen_cache.hash_files(
+    output_cache.hasher,
+    [os.path.abspath(input_header), lv_config_path]
+)
+gen_cache.hash_tree(output_cache.hasher, os.path.join(lvgl_path, 'src'))
+gen_cache.hash_tree(output_cache.hasher, fake_libc_path)
+gen_cache.hash_tree(output_cache.hasher, gen_json_path, ('.py',))
+gen_cache.hash_tree(
+    output_cache.hasher, os.path.join(script_path, 'api_gen'), ('.py',))
+
+cache_files = {'output.c': args.output}
+if args.metadata:
+    api_json_path = os.path.join(
+        os.path.split(args.metadata)[0], 'lvgl_api.json')
+    cache_files['metadata.json'] = args.metadata
+    cache_files['lvgl_api.json'] = api_json_path
+
+if args.constants:
+    cache_files['lv_const.py'] = args.constants
+
+if prune is not None and prune.report_path:
+    cache_files['prune_report.txt'] = prune.report_path
+
+with gen_trace.span('restore cached bindings', module=module_name):
+    cache_hit = output_cache.restore(cache_files)
+
+if cache_hit:
+    if args.metadata:
+        import stub_gen  # NOQA
+
+        with gen_trace.span('stubs', module=module_name):
+            stub_gen.run(args.metadata, api_json_path)
+
+    sys.exit(0)
+
+
 original_nodes = {}
 
 
@@ -137,7 +191,8 @@ for key, value in c_ast.__dict__.items():
 import fixed_gen_json  # NOQA
 
 
-json_ast = fixed_gen_json.run(lv_config_path, os.path.join(project_path, 'build', 'lvgl_header.h'), False)
+with gen_trace.span('json api', module=module_name):
+    json_ast = fixed_gen_json.run(lv_config_path, os.path.join(project_path, 'build', 'lvgl_header.h'), False)
 
 lvgl_json = json_ast.to_dict()
 
@@ -313,15 +368,16 @@ cpp_cmd.extend(unknownargs)
 
 cpp_cmd = ' '.join(cpp_cmd)
 
-p = subprocess.Popen(
-    cpp_cmd,
-    stdout=subprocess.PIPE,
-    stderr=subprocess.PIPE,
-    env=os.environ,
-    shell=True
-)
-out, err = p.communicate()
-exit_code = p.returncode
+with gen_trace.span('preprocess', module=module_name):
+    p = subprocess.Popen(
+        cpp_cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=os.environ,
+        shell=True
+    )
+    out, err = p.communicate()
+    exit_code = p.returncode
 
 if not os.path.exists(pp_file):
     sys.stdout.write(out.decode('utf-8').strip() + '\n')
@@ -668,8 +724,18 @@ gen = c_generator.CGenerator()
 with open(pp_file, 'r') as f:
     pp_data = f.read()
 
-cparser = pycparser.CParser()
-ast = cparser.parse(pp_data, input_header)
+ast_cache = gen_cache.GenCache(
+    gen_cache.get_cache_dir(), __file__, pp_data, pycparser.__version__)
+ast = ast_cache.load('ast.pickle')
+
+if ast is None:
+    with gen_trace.span('parse', module=module_name):
+        cparser = pycparser.CParser()
+        ast = cparser.parse(pp_data, input_header)
+        ast_cache.save('ast.pickle', ast)
+
+# the generation is module level code so begin and end get used
+generate_trace = gen_trace.span('generate', module=module_name).begin()
 
 forward_struct_decls = {}
 
@@ -1349,6 +1415,26 @@ print("""
 #define GENMPY_UNUSED
 #endif // __GNUC__
 #endif // GENMPY_UNUSED
+
+// The dicts of the module, the classes and the enums are hash tables in ROM
+// that get laid out when the bindings are generated. Set MP_LV_HASHED_DICTS
+// to 0 to use ordered tables, those get searched one key at a time.
+#ifndef MP_LV_HASHED_DICTS
+#define MP_LV_HASHED_DICTS (1)
+#endif
+
+#define MP_LV_DEFINE_CONST_HASHED_DICT(dict_name, table_name, n) \
+    const mp_obj_dict_t dict_name = { \
+        .base = {&mp_type_dict}, \
+        .map = { \
+            .all_keys_are_qstrs = 1, \
+            .is_fixed = 1, \
+            .is_ordered = 0, \
+            .used = n, \
+            .alloc = MP_ARRAY_SIZE(table_name), \
+            .table = (mp_map_elem_t *)(mp_rom_map_elem_t *)table_name, \
+        }, \
+    }
  
 // Custom function mp object
 
@@ -1978,11 +2064,16 @@ static MP_DEFINE_CONST_CLASSMETHOD_OBJ(mp_lv_cast_class_method, MP_ROM_PTR(&mp_l
 static MP_DEFINE_CONST_FUN_OBJ_2(mp_lv_cast_instance_obj, mp_lv_cast_instance);
 
 // Dereference a struct/blob. This allows access to the raw data the struct holds
+// When a memoryview is passed as the third argument it gets pointed at the data
+// and returned instead of creating a new memoryview. Callbacks that get called
+// a lot (flush, file system) are able to keep a single memoryview that way and
+// nothing gets allocated when they are called.
 
 static mp_obj_t mp_lv_dereference(size_t argc, const mp_obj_t *argv)
 {
     mp_obj_t self_in = argv[0];
     mp_obj_t size_in = argc > 1? argv[1]: mp_const_none;
+    mp_obj_t view_in = argc > 2? argv[2]: mp_const_none;
     mp_lv_struct_t *self = MP_OBJ_TO_PTR(self_in);
     size_t size = 0;
     if (size_in == mp_const_none){
@@ -1992,13 +2083,26 @@ static mp_obj_t mp_lv_dereference(size_t argc, const mp_obj_t *argv)
         size = (size_t)mp_obj_get_int(size_in);
     }
     if (size == 0) return mp_const_none;
-    mp_obj_array_t *view = MP_OBJ_TO_PTR(mp_obj_new_memoryview(BYTEARRAY_TYPECODE,
-        size, self->data));
+    mp_obj_array_t *view;
+    if (view_in == mp_const_none) {
+        view = MP_OBJ_TO_PTR(mp_obj_new_memoryview(BYTEARRAY_TYPECODE,
+            size, self->data));
+    } else {
+        if (!MP_OBJ_IS_TYPE(view_in, &mp_type_memoryview))
+            nlr_raise(
+                mp_obj_new_exception_msg(
+                    &mp_type_TypeError, MP_ERROR_TEXT("view must be a memoryview!")));
+        view = MP_OBJ_TO_PTR(view_in);
+        view->typecode = BYTEARRAY_TYPECODE;
+        view->free = 0; // offset into the data for a memoryview
+        view->len = size;
+        view->items = self->data;
+    }
     view->typecode |= 0x80; // used to indicate writable buffer
     return MP_OBJ_FROM_PTR(view);
 }
 
-static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(mp_lv_dereference_obj, 1, 2, mp_lv_dereference);
+static MP_DEFINE_CONST_FUN_OBJ_VAR_BETWEEN(mp_lv_dereference_obj, 1, 3, mp_lv_dereference);
 
 // Callback function handling
 // Callback is either a callable object or a pointer. If it's a callable object, set user_data to the callback.
@@ -2240,6 +2344,65 @@ MP_ARRAY_CONVERTOR(i64ptr, 8, true)
 
 """)
 
+#
+# Work out the values of the enum members, used for the constants module.
+# The source has been preprocessed so a value is an expression made of
+# numbers and the members that come before it.
+#
+
+def eval_enum_value(node, values):
+    if isinstance(node, c_ast.Constant):
+        if node.type == 'char':
+            # only plain characters, not escapes
+            if len(node.value) != 3:
+                raise ValueError('unsupported char %s' % node.value)
+            return ord(node.value[1])
+        value = node.value.rstrip('uUlL')
+        if len(value) > 1 and value[0] == '0' and value[1].isdigit():
+            return int(value, 8)
+        return int(value, 0)
+    if isinstance(node, c_ast.ID):
+        return values[node.name]
+    if isinstance(node, c_ast.Cast):
+        return eval_enum_value(node.expr, values)
+    if isinstance(node, c_ast.UnaryOp):
+        value = eval_enum_value(node.expr, values)
+        return {'-': lambda: -value, '+': lambda: value, '~': lambda: ~value, '!': lambda: int(not value)}[node.op]()
+    if isinstance(node, c_ast.TernaryOp):
+        if eval_enum_value(node.cond, values):
+            return eval_enum_value(node.iftrue, values)
+        return eval_enum_value(node.iffalse, values)
+    if isinstance(node, c_ast.BinaryOp):
+        left = eval_enum_value(node.left, values)
+        right = eval_enum_value(node.right, values)
+        return {
+            '+': lambda: left + right, '-': lambda: left - right, '*': lambda: left * right,
+            # C division truncates towards zero
+            '/': lambda: int(left / right), '%': lambda: left - right * int(left / right),
+            '<<': lambda: left << right, '>>': lambda: left >> right,
+            '|': lambda: left | right, '&': lambda: left & right, '^': lambda: left ^ right,
+            '==': lambda: int(left == right), '!=': lambda: int(left != right),
+            '<': lambda: int(left < right), '<=': lambda: int(left <= right),
+            '>': lambda: int(left > right), '>=': lambda: int(left >= right),
+            '&&': lambda: int(bool(left and right)), '||': lambda: int(bool(left or right)),
+        }[node.op]()
+    raise ValueError('unsupported enum value %s' % type(node).__name__)
+
+
+enum_values = {}
+for enum_def in enum_defs:
+    if not isinstance(enum_def.type, c_ast.Enum) or not enum_def.type.values:
+        continue
+    value = -1
+    for member in enum_def.type.values.enumerators:
+        try:
+            value = value + 1 if member.value is None else eval_enum_value(member.value, enum_values)
+        except (ValueError, KeyError, TypeError, ZeroDivisionError):
+            value = None
+            continue
+        enum_values[member.name] = value
+
+
 #
 # Add regular enums with integer values
 #
@@ -2312,6 +2475,73 @@ for enum_def in enum_defs:
 # eprint('--> enums: \n%s' % enums)
 
 
+#
+# Remove the parts of the API the application doesn't use
+#
+def prune_api():
+    global obj_ctors
+    global obj_names
+    global funcs
+    global int_constants
+
+    # the base object is needed by every widget
+    kept_obj_names = [
+        obj_name for obj_name in obj_names
+        if obj_name == base_obj_name or prune.keep('widgets', ctor_name_from_obj_name(obj_name), obj_name)
+    ]
+    dropped_obj_names = [obj_name for obj_name in obj_names if obj_name not in kept_obj_names]
+    obj_ctors = [ctor for ctor in obj_ctors if create_obj_pattern.match(ctor.name).group(1) in kept_obj_names]
+    obj_names = kept_obj_names
+
+    kept_funcs = []
+    for func in funcs:
+        # methods of a widget that was dropped would end up as module functions
+        if any(is_method_of(func.name, obj_name) for obj_name in dropped_obj_names):
+            prune.drop('functions', func.name, method_name_from_func_name(func.name))
+            continue
+
+        # a function is able to be a module function, a widget method or a
+        # struct function, the name is different for each one of them
+        py_names = [simplify_identifier(func.name)]
+        if lv_method_pattern.match(func.name):
+            py_names.append(method_name_from_func_name(func.name))
+        first_arg_type = get_first_arg_type(func)
+        if first_arg_type:
+            py_names.append(noncommon_part(func.name, first_arg_type))
+
+        py_names = py_names + [sanitize(py_name) for py_name in py_names]
+        if prune.keep('functions', func.name, *py_names):
+            kept_funcs.append(func)
+
+    funcs = kept_funcs
+
+    for enum_name in list(enums.keys()):
+        py_name = get_enum_name(enum_name)
+        # enums that belong to a widget are attributes of the widget class
+        obj_py_names = [
+            method_name_from_func_name(enum_name) for obj_name in obj_names
+            if is_method_of(enum_name, obj_name)
+        ]
+        if not prune.keep('enums', enum_name, py_name, *obj_py_names):
+            del enums[enum_name]
+
+    int_constants = [
+        int_constant for int_constant in int_constants
+        if prune.keep('constants', int_constant, sanitize(get_enum_name(int_constant)))
+    ]
+
+    for global_name in list(blobs.keys()):
+        if global_name == '_nesting':
+            continue
+        if not prune.keep('globals', global_name, simplify_identifier(global_name)):
+            del blobs[global_name]
+
+
+if prune is not None:
+    with gen_trace.span('prune', module=module_name):
+        prune_api()
+
+
 # eprint(',\n'.join(sorted('%s : %s' % (name, get_type(blobs[name])) for name in blobs)))
 
 #
@@ -3243,6 +3473,112 @@ def gen_func_error(method, exp):
         pass
 
 
+#
+# Hashed ROM dicts
+#
+# MP_DEFINE_CONST_DICT makes an ordered dict and MicroPython finds a key in
+# one of those by comparing it to every key in the table, the module has
+# thousands of them. The hash of a qstr gets worked out when MicroPython is
+# built, so the table is able to be laid out here the same way a dict in RAM
+# is laid out and mp_map_lookup goes right to the slot of the key.
+#
+
+rom_dict_key_pattern = re.compile(r'^\s*{\s*MP_ROM_QSTR\(MP_QSTR_(\w+)\)')
+
+# a table larger than this doesn't work well with a 1 byte hash
+MAX_HASHED_ENTRIES_1_BYTE = 128
+
+
+def qstr_hash(qstr, bytes_in_hash):
+    # compute_hash in py/makeqstrdata.py
+    hash = 5381
+    for b in qstr.encode('utf-8'):
+        hash = (hash * 33) ^ b
+    return (hash & ((1 << (8 * bytes_in_hash)) - 1)) or 1
+
+
+def layout_hashed_table(hashes):
+    # A number of table sizes get tried and the one that has the fewest keys
+    # that are not in the slot their hash points to gets used. mp_map_lookup
+    # moves to the next slot when the slot has a different key in it.
+    count = len(hashes)
+    min_alloc = count + count // 3 + 1
+    max_alloc = count + count // 2 + 1
+    step = max(1, (max_alloc - min_alloc) // 64)
+
+    best = None
+    for alloc in range(min_alloc, max_alloc + 1, step):
+        used = [False] * alloc
+        slots = []
+        probes = 0
+        for hash in hashes:
+            slot = hash % alloc
+            while used[slot]:
+                slot = (slot + 1) % alloc
+                probes += 1
+            used[slot] = True
+            slots.append(slot)
+
+        if best is None or probes < best[0]:
+            best = (probes, alloc, slots)
+            if probes == 0:
+                break
+
+    return best[1], best[2]
+
+
+def gen_rom_dict(dict_name, entries):
+    """
+    Returns the C code for a ROM dict, `entries` are
+    "{ MP_ROM_QSTR(MP_QSTR_name), value }" strings.
+    """
+    ordered = """
+static const mp_rom_map_elem_t {dict_name}_table[] = {{
+    {entries}
+}};
+
+static MP_DEFINE_CONST_DICT({dict_name}, {dict_name}_table);
+""".format(dict_name=dict_name, entries=',\n    '.join(entries))
+
+    keys = []
+    hashed_entries = []
+    for entry in entries:
+        key = rom_dict_key_pattern.match(entry).group(1)
+        # an ordered dict finds the first one
+        if key in keys:
+            continue
+        keys.append(key)
+        hashed_entries.append(entry)
+
+    if not keys:
+        return ordered
+
+    hashed = []
+    for bytes_in_hash in (1, 2):
+        if bytes_in_hash == 1 and len(keys) > MAX_HASHED_ENTRIES_1_BYTE:
+            continue
+
+        alloc, slots = layout_hashed_table([qstr_hash(key, bytes_in_hash) for key in keys])
+        hashed.append("""#{directive} MP_LV_HASHED_DICTS && MICROPY_QSTR_BYTES_IN_HASH == {bytes_in_hash}
+static const mp_rom_map_elem_t {dict_name}_table[{alloc}] = {{
+    {entries}
+}};
+
+static MP_LV_DEFINE_CONST_HASHED_DICT({dict_name}, {dict_name}_table, {count});
+""".format(
+            directive='elif' if hashed else 'if',
+            bytes_in_hash=bytes_in_hash,
+            dict_name=dict_name,
+            alloc=alloc,
+            entries=',\n    '.join(
+                '[%d] = %s' % (slot, entry.strip())
+                for slot, entry in sorted(zip(slots, hashed_entries))
+            ),
+            count=len(keys)))
+
+    return '\n%s#else\n%s#endif\n' % (''.join(hashed), ordered)
+
+
 #
 # Emit Mpy objects definitions
 #
@@ -3338,11 +3674,7 @@ static mp_obj_t {obj}_make_new(
             obj = obj_name))
 
     print("""
-static const mp_rom_map_elem_t {obj}_locals_dict_table[] = {{
-    {locals_dict_entries}
-}};
-
-static MP_DEFINE_CONST_DICT({obj}_locals_dict, {obj}_locals_dict_table);
+{locals_dict}
 
 {ctor}
 
@@ -3368,7 +3700,7 @@ GENMPY_UNUSED static const mp_lv_obj_type_t mp_lv_{obj}_type = {{
             module_name = module_name,
             obj = sanitize(obj_name), base_obj = base_obj_name,
             base_class = '&mp_%s_type' % base_obj_name if should_add_base_methods else 'NULL',
-            locals_dict_entries = ",\n    ".join(gen_obj_methods(obj_name)),
+            locals_dict = gen_rom_dict('%s_locals_dict' % sanitize(obj_name), gen_obj_methods(obj_name)),
             ctor = ctor.format(obj = obj_name, ctor_name = ctor_func.name) if has_ctor(obj_name) else '',
             make_new = 'make_new, %s_make_new,' % obj_name if is_obj else '',
             binary_op = 'binary_op, mp_lv_obj_binary_op,' if is_obj else '',
@@ -3497,6 +3829,20 @@ for global_name in blobs:
 # Generate struct-functions
 #
 # eprint("/* Generating struct-functions */")
+
+# structs that are used by name in Python, like lv.area_t(), and not by any
+# of the functions that are left after pruning
+if prune is not None:
+    for struct_name in list(structs.keys()):
+        if not struct_name or struct_name in generated_structs:
+            continue
+        if not prune.is_used(simplify_identifier(struct_name)):
+            continue
+        try:
+            try_generate_struct(struct_name, structs[struct_name])
+        except MissingConversionException as exp:
+            gen_func_error(struct_name, exp)
+
 try_generate_structs_from_first_argument()
 
 
@@ -3622,50 +3968,39 @@ for (func_name, func, struct_name) in callbacks_used_on_structs:
 #
 
 # eprint("/* Generating module definition */")
+module_globals = ['{{ MP_ROM_QSTR(MP_QSTR___name__), MP_ROM_QSTR(MP_QSTR_{module_name}) }}'.format(module_name = sanitize(module_name))]
+module_globals.extend('{{ MP_ROM_QSTR(MP_QSTR_{obj}), MP_ROM_PTR(&mp_lv_{obj}_type_base) }}'.
+    format(obj = sanitize(o)) for o in obj_names)
+module_globals.extend('{{ MP_ROM_QSTR(MP_QSTR_{name}), MP_ROM_PTR(&mp_{func}_mpobj) }}'.
+    format(name = sanitize(simplify_identifier(f.name)), func = f.name) for f in module_funcs)
+module_globals.extend('{{ MP_ROM_QSTR(MP_QSTR_{name}), MP_ROM_PTR(&mp_lv_{enum}_type_base) }}'.
+    format(name = sanitize(get_enum_name(enum_name)), enum=enum_name) for enum_name in enums.keys() if enum_name not in enum_referenced)
+module_globals.extend('{{ MP_ROM_QSTR(MP_QSTR_{name}), MP_ROM_PTR(&mp_{struct_name}_type) }}'.
+    format(name = sanitize(simplify_identifier(struct_name)), struct_name = sanitize(struct_name)) for struct_name in generated_structs \
+            if generated_structs[struct_name])
+module_globals.extend('{{ MP_ROM_QSTR(MP_QSTR_{alias_name}), MP_ROM_PTR(&mp_{struct_name}_type) }}'.
+    format(struct_name = sanitize(struct_name), alias_name = sanitize(simplify_identifier(struct_aliases[struct_name]))) for struct_name in struct_aliases.keys())
+module_globals.extend('{{ MP_ROM_QSTR(MP_QSTR_{name}), MP_ROM_PTR(&mp_{global_name}) }}'.
+    format(name = sanitize(simplify_identifier(global_name)), global_name = global_name) for global_name in generated_globals)
+module_globals.extend('{{ MP_ROM_QSTR(MP_QSTR_{name}), MP_ROM_PTR(MP_ROM_INT({value})) }}'.
+    format(name = sanitize(get_enum_name(int_constant)), value = int_constant) for int_constant in int_constants)
+
+# LV_OBJ_T is defined when there are objects
+if len(obj_names) > 0:
+    module_globals.append('{ MP_ROM_QSTR(MP_QSTR_LvReferenceError), MP_ROM_PTR(&mp_type_LvReferenceError) }')
+
 print("""
 
 /*
  * {module_name} module definitions
  */
-
-static const mp_rom_map_elem_t {module_name}_globals_table[] = {{
-    {{ MP_ROM_QSTR(MP_QSTR___name__), MP_ROM_QSTR(MP_QSTR_{module_name}) }},
-    {objects}
-    {functions}
-    {enums}
-    {structs}
-    {struct_aliases}
-    {blobs}
-    {int_constants}
-#ifdef LV_OBJ_T
-    {{ MP_ROM_QSTR(MP_QSTR_LvReferenceError), MP_ROM_PTR(&mp_type_LvReferenceError) }},
-#endif // LV_OBJ_T
-}};
+{globals}
 """.format(
-        module_name = sanitize(module_name),
-        objects = ''.join(['{{ MP_ROM_QSTR(MP_QSTR_{obj}), MP_ROM_PTR(&mp_lv_{obj}_type_base) }},\n    '.
-            format(obj = sanitize(o)) for o in obj_names]),
-        functions =  ''.join(['{{ MP_ROM_QSTR(MP_QSTR_{name}), MP_ROM_PTR(&mp_{func}_mpobj) }},\n    '.
-            format(name = sanitize(simplify_identifier(f.name)), func = f.name) for f in module_funcs]),
-        enums = ''.join(['{{ MP_ROM_QSTR(MP_QSTR_{name}), MP_ROM_PTR(&mp_lv_{enum}_type_base) }},\n    '.
-            format(name = sanitize(get_enum_name(enum_name)), enum=enum_name) for enum_name in enums.keys() if enum_name not in enum_referenced]),
-        structs = ''.join(['{{ MP_ROM_QSTR(MP_QSTR_{name}), MP_ROM_PTR(&mp_{struct_name}_type) }},\n    '.
-            format(name = sanitize(simplify_identifier(struct_name)), struct_name = sanitize(struct_name)) for struct_name in generated_structs \
-                    if generated_structs[struct_name]]),
-        struct_aliases = ''.join(['{{ MP_ROM_QSTR(MP_QSTR_{alias_name}), MP_ROM_PTR(&mp_{struct_name}_type) }},\n    '.
-            format(struct_name = sanitize(struct_name), alias_name = sanitize(simplify_identifier(struct_aliases[struct_name]))) for struct_name in struct_aliases.keys()]),
-        blobs = ''.join(['{{ MP_ROM_QSTR(MP_QSTR_{name}), MP_ROM_PTR(&mp_{global_name}) }},\n    '.
-            format(name = sanitize(simplify_identifier(global_name)), global_name = global_name) for global_name in generated_globals]),
-        int_constants = ''.join(['{{ MP_ROM_QSTR(MP_QSTR_{name}), MP_ROM_PTR(MP_ROM_INT({value})) }},\n    '.
-            format(name = sanitize(get_enum_name(int_constant)), value = int_constant) for int_constant in int_constants])))
+        module_name = module_name,
+        globals = gen_rom_dict('mp_module_%s_globals' % module_name, module_globals)))
 
 
 print("""
-static MP_DEFINE_CONST_DICT (
-    mp_module_{module_name}_globals,
-    {module_name}_globals_table
-);
-
 const mp_obj_module_t mp_module_{module_name} = {{
     .base = {{ &mp_type_module }},
     .globals = (mp_obj_dict_t*)&mp_module_{module_name}_globals
@@ -3766,7 +4101,56 @@ if args.metadata:
 
     import stub_gen
 
-    stub_gen.run(args.metadata, api_json_path)
+    with gen_trace.span('stubs', module=module_name):
+        stub_gen.run(args.metadata, api_json_path)
+
+#
+# Emit the constants module
+#
+# MicroPython looks up lv.DISPLAY_ROTATION._180 every time the code runs. A
+# name that is assigned using const() in the same file gets replaced with the
+# value when the file is compiled, the lines in this module are able to be
+# copied into a driver to do that.
+#
+
+if args.constants:
+    constant_names = collections.OrderedDict()
+    for enum_name in enums.keys():
+        for member_value in enums[enum_name].values():
+            match_result = re.match(r'^MP_ROM_INT\((\w+)\)$', member_value)
+            if match_result:
+                constant_names.setdefault(get_enum_name(match_result.group(1)), match_result.group(1))
+    for int_constant in int_constants:
+        constant_names.setdefault(sanitize(get_enum_name(int_constant)), int_constant)
+
+    constant_lines = [
+        '%s = const(%d)' % (name, enum_values[c_name])
+        for name, c_name in constant_names.items()
+        # MicroPython only folds small ints
+        if c_name in enum_values and -(1 << 30) <= enum_values[c_name] < (1 << 30)
+    ]
+
+    constants_dir = os.path.dirname(os.path.abspath(args.constants))
+    if not os.path.exists(constants_dir):
+        os.makedirs(constants_dir)
+
+    with open(args.constants, 'w') as constants_file:
+        constants_file.write('''# Auto-Generated file, DO NOT EDIT!
+#
+# The values of the enums and the int constants in the {module_name} module.
+# {prefix}.DISPLAY_ROTATION._180 is DISPLAY_ROTATION_180 in this file.
+
+from micropython import const
+
+{constants}
+'''.format(module_name=module_name, prefix=module_prefix, constants='\n'.join(constant_lines)))
 
 stdout.close()
 
+if prune is not None:
+    prune.write_report()
+    eprint(prune.summary())
+
+output_cache.store(cache_files)
+generate_trace.end()
+
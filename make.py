@@ -3,6 +3,7 @@
 
 import os
 import sys
+import atexit
 import builder
 import shutil
 
@@ -15,6 +16,12 @@ SCRIPT_DIR = os.path.abspath(os.path.dirname(sys.argv[0]))
 MPY_DIR = os.path.join(SCRIPT_DIR, 'micropython')
 
 
+if len(sys.argv) > 1 and sys.argv[1] == 'batch':
+    from builder import batch
+
+    sys.exit(batch.run(SCRIPT_DIR, sys.argv[2:]))
+
+
 argParser = ArgumentParser(prefix_chars='-')
 argParser.add_argument(
     '--custom-board-path',
@@ -47,10 +54,10 @@ argParser.add_argument(
     default=None
 )
 args, extra_args = argParser.parse_known_args(extra_args)
+toml_path = args.toml
 
 
-if args.toml is not None:
-    toml_path = args.toml
+if toml_path is not None:
     build_path = os.path.join(SCRIPT_DIR, 'build')
     if not os.path.exists(build_path):
         os.mkdir(build_path)
@@ -181,6 +188,63 @@ argParser.add_argument(
     action='store_true'
 )
 
+argParser.add_argument(
+    '--compiler-cache',
+    dest='compiler_cache',
+    help='compile using ccache or sccache (auto, ccache or sccache)',
+    nargs='?',
+    const='auto',
+    default=None,
+    action='store'
+)
+
+argParser.add_argument(
+    '--no-submodules',
+    dest='no_submodules',
+    help='do not update the submodules, they need to already be set up',
+    default=False,
+    action='store_true'
+)
+
+argParser.add_argument(
+    '--build-log',
+    dest='build_log',
+    help='write the output of the build to a file',
+    default=None,
+    action='store'
+)
+
+argParser.add_argument(
+    '--trace',
+    dest='trace',
+    help='write a timeline of the build as a Chrome trace (JSON)',
+    default=None,
+    action='store'
+)
+
+argParser.add_argument(
+    '--prune-bindings',
+    dest='prune_bindings',
+    help=(
+        'only make the LVGL bindings that are used by the frozen Python '
+        'files. A file or folder is able to be given to also be scanned '
+        '(--prune-bindings=path), the option is able to be used more than '
+        'once. Text files are allow-lists that have one name per line'
+    ),
+    nargs='?',
+    const='',
+    default=None,
+    action='append'
+)
+
+argParser.add_argument(
+    '--incremental',
+    dest='incremental',
+    help='skip the build stages that have not had their inputs change',
+    default=False,
+    action='store_true'
+)
+
 
 args2, extra_args = argParser.parse_known_args(extra_args)
 
@@ -192,7 +256,56 @@ displays = args2.displays
 indevs = args2.indevs
 expanders = args2.expanders
 imus = args2.imus
-builder.DO_NOT_SCRUB_BUILD_FOLDER = args2.no_scrub
+incremental = args2.incremental
+no_submodules = args2.no_submodules
+
+if args2.build_log is not None:
+    builder.default_sinks.append(
+        builder.output_sinks.LogSink(os.path.abspath(args2.build_log))
+    )
+
+trace_path = args2.trace
+
+if trace_path is not None:
+    trace_path = os.path.abspath(trace_path)
+    # the scripts that run during the build, like the binding generator,
+    # write their events to this file
+    trace_events_path = os.path.join(SCRIPT_DIR, 'build', 'trace_events.jsonl')
+    if os.path.exists(trace_events_path):
+        os.remove(trace_events_path)
+
+    os.environ[builder.stages.TRACE_EVENTS_ENV] = trace_events_path
+
+if args2.prune_bindings is not None:
+    sys.path.append(os.path.join(SCRIPT_DIR, 'gen'))
+    import gen_prune  # NOQA
+
+    # --prune-bindings without a path only adds an empty string
+    prune_sources = [
+        os.path.abspath(source) for source in args2.prune_bindings if source
+    ]
+
+    for source in prune_sources:
+        if not os.path.exists(source):
+            raise RuntimeError(f'Prune source does not exist. ({source})')
+
+    # the binding generator reads this file, build/manifest.py gets made
+    # before the generator runs and has all of the frozen files
+    prune_spec_path = os.path.join(SCRIPT_DIR, 'build', 'lvgl_prune.json')
+    gen_prune.write_spec(
+        prune_spec_path,
+        [os.path.join(SCRIPT_DIR, 'build', 'manifest.py')] + prune_sources,
+        os.path.join(SCRIPT_DIR, 'build', 'lvgl_prune_report.txt')
+    )
+
+    os.environ[gen_prune.PRUNE_ENV] = prune_spec_path
+
+if args2.compiler_cache is not None:
+    builder.compiler_cache.setup(args2.compiler_cache, SCRIPT_DIR)
+
+# the generated files in the build folder are inputs to the next build
+builder.DO_NOT_SCRUB_BUILD_FOLDER = args2.no_scrub or incremental
+builder.stages.INCREMENTAL = incremental
 
 if imus:
     os.environ['FUSION'] = "1"
@@ -236,13 +349,11 @@ def get_submodules():
 def create_lvgl_header():
     header_path = f'{SCRIPT_DIR}/build/lvgl_header.h'
 
-    with open(header_path, 'w') as f:
-        f.write(
-            f'#include "{SCRIPT_DIR}/lib/lvgl/lvgl.h"\n'
-        )
-        f.write(
-            f'#include "{SCRIPT_DIR}/lib/lvgl/src/lvgl_private.h"\n'
-        )
+    builder.write_file(
+        header_path,
+        f'#include "{SCRIPT_DIR}/lib/lvgl/lvgl.h"\n'
+        f'#include "{SCRIPT_DIR}/lib/lvgl/src/lvgl_private.h"\n'
+    )
 
 
 if __name__ == '__main__':
@@ -282,7 +393,8 @@ if __name__ == '__main__':
     else:
         import builder as mod
 
-    get_submodules()
+    if not no_submodules:
+        get_submodules()
 
     if custom_board_path is not None:
         if custom_board_path.endswith('/') or custom_board_path.endswith('\\'):
@@ -304,27 +416,79 @@ if __name__ == '__main__':
     extra_args = mod.build_commands(
         target, extra_args, SCRIPT_DIR, lv_cflags, board)
 
+    stages = builder.stages
+
+    error_sink = builder.output_sinks.ErrorSink()
+    builder.default_sinks.append(error_sink)
+
+    def _report():
+        stages.report()
+        builder.compiler_cache.report()
+
+        if trace_path is not None:
+            stages.write_trace(trace_path)
+            print()
+            print(f'build trace written to {trace_path}')
+
+        if error_sink.errors:
+            print()
+            print(f'{len(error_sink.errors)} error(s):')
+            for _, file, line_num, message in error_sink.errors[:20]:
+                if file is None:
+                    print(f'  {message}')
+                else:
+                    print(f'  {file}:{line_num}: {message}')
+
+    # the report gets printed when the build fails as well
+    atexit.register(_report)
+
+    # anything that changes how the firmware gets built. If any of these
+    # change the build gets cleaned when doing an incremental build.
+    build_config = (
+        target, board, lv_cflags, extra_args, displays,
+        indevs, expanders, imus, frozen_manifest
+    )
+    config_paths = (toml_path, custom_board_path, 'lib/lv_conf.h')
+
     if clean:
         print('Cleaning build....')
-        mod.force_clean(True)
+        stages.run('clean', mod.force_clean, True, always=True)
     else:
-        mod.clean()
+        stages.run(
+            'clean', mod.clean, paths=config_paths, values=build_config)
 
     if not os.path.exists('lib/micropython/mpy_cross/build/mpy-cross'):
         print('Compiling mpy-cross....')
-        mod.mpy_cross()
-
-    mod.submodules()
+        stages.run('mpy_cross', mod.mpy_cross, always=True)
+
+    if not no_submodules:
+        revisions = stages.submodule_revisions()
+
+        stages.run(
+            'submodules',
+            mod.submodules,
+            paths=('.gitmodules',),
+            values=(target, board, revisions),
+            outputs=('lib/micropython/mpy-cross',),
+            # without git there is no way to tell if a submodule has moved
+            always=revisions is None
+        )
 
     print('Generating build files....')
     set_mp_version(target.lower())
 
-    mod.build_manifest(
+    # the port modules keep state from building the manifest that gets used
+    # when compiling so this always runs. Only files that have changed get
+    # written which keeps make from compiling them again.
+    stages.run(
+        'manifest',
+        mod.build_manifest,
         target, SCRIPT_DIR, False, displays,
-        indevs, expanders, imus, frozen_manifest
+        indevs, expanders, imus, frozen_manifest,
+        always=True
     )
 
-    create_lvgl_header()
+    stages.run('lvgl_header', create_lvgl_header, always=True)
 
     print('Compiling....')
-    mod.compile(*extra_args)
+    stages.run('compile', mod.compile, *extra_args, always=True)
@@ -22,61 +22,213 @@
 
 #include <termios.h>
 #include <fcntl.h>
+#include <time.h>
 
-static const useconds_t TIMER_POLL_INTERVAL_US = 1000;  // 1 millisecond
+// The timers are kept in a min-heap ordered by when they are due. The timer
+// thread sleeps on a condition variable until the first timer is due or
+// until the timers get changed. When there are no active timers the thread
+// waits without a timeout so it doesn't wake up at all.
 
-static pthread_t timer_poll_thread_id;
+static pthread_t timer_thread_id;
 
 bool timer_polling = false;
 pthread_mutex_t timer_lock;
+static pthread_cond_t timer_cond;
 
 
 const mp_obj_type_t machine_timer_type;
 
 static machine_timer_obj_t *timer_objs[TIMER_COUNT];
 
+static machine_timer_obj_t *timer_heap[TIMER_COUNT];
+static uint8_t timer_heap_count = 0;
+
 
 static void machine_timer_disable(machine_timer_obj_t *self);
 static void machine_timer_init_helper(machine_timer_obj_t *self, int16_t mode, mp_obj_t callback, int32_t period);
 
 
-static void *timer_poll_thread(void *arg)
+static uint64_t timer_now_ns(void)
+{
+    struct timespec ts;
+    clock_gettime(CLOCK_MONOTONIC, &ts);
+    return (uint64_t)ts.tv_sec * 1000000000ULL + (uint64_t)ts.tv_nsec;
+}
+
+
+static void timer_heap_swap(uint8_t a, uint8_t b)
+{
+    machine_timer_obj_t *timer = timer_heap[a];
+
+    timer_heap[a] = timer_heap[b];
+    timer_heap[b] = timer;
+
+    timer_heap[a]->heap_index = (int8_t)a;
+    timer_heap[b]->heap_index = (int8_t)b;
+}
+
+
+static void timer_heap_up(uint8_t index)
+{
+    while (index > 0) {
+        uint8_t parent = (uint8_t)((index - 1) / 2);
+        if (timer_heap[parent]->deadline <= timer_heap[index]->deadline) break;
+
+        timer_heap_swap(parent, index);
+        index = parent;
+    }
+}
+
+
+static void timer_heap_down(uint8_t index)
+{
+    while (true) {
+        uint8_t left = (uint8_t)(index * 2 + 1);
+        uint8_t right = (uint8_t)(index * 2 + 2);
+        uint8_t smallest = index;
+
+        if (left < timer_heap_count && timer_heap[left]->deadline < timer_heap[smallest]->deadline) smallest = left;
+        if (right < timer_heap_count && timer_heap[right]->deadline < timer_heap[smallest]->deadline) smallest = right;
+        if (smallest == index) break;
+
+        timer_heap_swap(smallest, index);
+        index = smallest;
+    }
+}
+
+
+static void timer_heap_push(machine_timer_obj_t *timer)
+{
+    timer->heap_index = (int8_t)timer_heap_count;
+    timer_heap[timer_heap_count] = timer;
+    timer_heap_count++;
+    timer_heap_up((uint8_t)timer->heap_index);
+}
+
+
+static void timer_heap_remove(machine_timer_obj_t *timer)
+{
+    if (timer->heap_index < 0) return;
+
+    uint8_t index = (uint8_t)timer->heap_index;
+    timer_heap_count--;
+
+    if (index != timer_heap_count) {
+        timer_heap_swap(index, timer_heap_count);
+        timer_heap_down(index);
+        timer_heap_up(index);
+    }
+
+    timer->heap_index = -1;
+    timer_heap[timer_heap_count] = NULL;
+}
+
+
+static void timer_cond_wait_until(uint64_t deadline)
+{
+#ifdef __APPLE__
+    // macOS doesn't support using CLOCK_MONOTONIC with condition variables
+    uint64_t now = timer_now_ns();
+    if (deadline <= now) return;
+
+    uint64_t wait = deadline - now;
+    struct timespec ts = {
+        .tv_sec = (time_t)(wait / 1000000000ULL),
+        .tv_nsec = (long)(wait % 1000000000ULL)
+    };
+    pthread_cond_timedwait_relative_np(&timer_cond, &timer_lock, &ts);
+#else
+    struct timespec ts = {
+        .tv_sec = (time_t)(deadline / 1000000000ULL),
+        .tv_nsec = (long)(deadline % 1000000000ULL)
+    };
+    pthread_cond_timedwait(&timer_cond, &timer_lock, &ts);
+#endif
+}
+
+
+static void *timer_thread(void *arg)
 {
     (void)arg;
 
     machine_timer_obj_t *timer;
+    uint64_t now;
+    uint64_t late;
+    uint64_t period;
+
+    pthread_mutex_lock(&timer_lock);
 
     while (timer_polling) {
-        usleep(TIMER_POLL_INTERVAL_US);
+        if (timer_heap_count == 0) {
+            // idle, the thread gets woken up when a timer is started
+            pthread_cond_wait(&timer_cond, &timer_lock);
+            continue;
+        }
 
-        pthread_mutex_lock(&timer_lock);
+        timer = timer_heap[0];
+        now = timer_now_ns();
 
-        for (uint8_t i=0;i<TIMER_COUNT;i++) {
-            timer = timer_objs[i];
+        if (timer->deadline > now) {
+            timer_cond_wait_until(timer->deadline);
+            continue;
+        }
 
-            if (timer != NULL && timer->active) {
-                timer->ms_ticks += 1;
+        late = (now - timer->deadline) / 1000ULL;
+        timer->fire_count++;
+        timer->jitter_sum_us += late;
+        if (late > timer->jitter_max_us) timer->jitter_max_us = (uint32_t)late;
 
-                if (timer->ms_ticks >= timer->period) {
-                    timer->ms_ticks = 0;
+        timer_heap_remove(timer);
 
-                    if (timer->callback != NULL && timer->callback != mp_const_none) {
-                        if (!timer->repeat) timer->active = false;
+        if (timer->repeat) {
+            period = (uint64_t)timer->period * 1000000ULL;
+            timer->deadline += period;
 
-                        mp_sched_schedule(timer->callback, MP_OBJ_FROM_PTR(timer));
-                    }
-                }
+            if (timer->deadline <= now) {
+                // one or more periods have been missed, they are skipped
+                // instead of firing the callback several times in a row
+                timer->overrun_count++;
+                timer->deadline = now + period;
             }
+
+            timer_heap_push(timer);
+        } else {
+            timer->active = false;
+        }
+
+        if (timer->callback != NULL && timer->callback != mp_const_none) {
+            mp_sched_schedule(timer->callback, MP_OBJ_FROM_PTR(timer));
         }
-        pthread_mutex_unlock(&timer_lock);
     }
 
+    pthread_mutex_unlock(&timer_lock);
+
     return NULL;
 }
 
 
+static void timer_thread_start(void)
+{
+    pthread_condattr_t cond_attr;
+    pthread_condattr_init(&cond_attr);
+#ifndef __APPLE__
+    pthread_condattr_setclock(&cond_attr, CLOCK_MONOTONIC);
+#endif
+    pthread_cond_init(&timer_cond, &cond_attr);
+    pthread_condattr_destroy(&cond_attr);
+
+    pthread_mutex_init(&timer_lock, NULL);
+    timer_heap_count = 0;
+    timer_polling = true;
+
+    pthread_create(&timer_thread_id, NULL, &timer_thread, NULL);
+}
+
+
 void machine_timer_deinit_all(void)
 {
+    if (!timer_polling) return;
+
     // Disable, deallocate and remove all timers from list
     machine_timer_obj_t *timer;
     pthread_mutex_lock(&timer_lock);
@@ -88,11 +240,13 @@ void machine_timer_deinit_all(void)
         }
     }
 
+    timer_polling = false;
+    pthread_cond_signal(&timer_cond);
     pthread_mutex_unlock(&timer_lock);
 
-    timer_polling = false;
-    pthread_join(timer_poll_thread_id, NULL);
+    pthread_join(timer_thread_id, NULL);
     pthread_mutex_destroy(&timer_lock);
+    pthread_cond_destroy(&timer_cond);
 
     timer = NULL;
 
@@ -138,12 +292,7 @@ static mp_obj_t machine_timer_make_new(const mp_obj_type_t *type, size_t n_args,
     }
 
     if (!timer_polling) {
-        pthread_mutex_init(&timer_lock, NULL);
-        timer_polling = true;
-        pthread_attr_t attr;
-        pthread_attr_init(&attr);
-        pthread_attr_setdetachstate(&attr, PTHREAD_CREATE_DETACHED);
-        pthread_create(&timer_poll_thread_id, &attr, &timer_poll_thread, NULL);
+        timer_thread_start();
     }
 
     int16_t mode = (int16_t)args[ARG_mode].u_int;
@@ -160,6 +309,11 @@ static mp_obj_t machine_timer_make_new(const mp_obj_type_t *type, size_t n_args,
 
         self->id = id;
         self->callback = NULL;
+        self->heap_index = -1;
+        self->fire_count = 0;
+        self->overrun_count = 0;
+        self->jitter_sum_us = 0;
+        self->jitter_max_us = 0;
         timer_objs[id] = self;
     } else {
         machine_timer_disable(self);
@@ -172,16 +326,25 @@ static mp_obj_t machine_timer_make_new(const mp_obj_type_t *type, size_t n_args,
 }
 
 
+// these need to be called while holding timer_lock
 static void machine_timer_disable(machine_timer_obj_t *self)
 {
     self->active = false;
+    timer_heap_remove(self);
 }
 
 
 static void machine_timer_enable(machine_timer_obj_t *self)
 {
-    self->ms_ticks = 0;
-	self->active = true;
+    // a period of 0 fires every millisecond
+    if (self->period == 0) self->period = 1;
+
+    self->deadline = timer_now_ns() + (uint64_t)self->period * 1000000ULL;
+    self->active = true;
+    timer_heap_push(self);
+
+    // the timer thread needs to recalculate how long it sleeps for
+    pthread_cond_signal(&timer_cond);
 }
 
 
@@ -190,7 +353,7 @@ static void machine_timer_init_helper(machine_timer_obj_t *self, int16_t mode, m
     pthread_mutex_lock(&timer_lock);
     machine_timer_disable(self);
 
-    if (period != -1) self->period = (uint16_t)period;
+    if (period != -1) self->period = (uint32_t)period;
     if (mode != -1) self->repeat = (uint8_t)mode;
     if (callback != NULL) self->callback = callback;
 
@@ -260,10 +423,53 @@ static mp_obj_t machine_timer_init(size_t n_args, const mp_obj_t *pos_args, mp_m
 static MP_DEFINE_CONST_FUN_OBJ_KW(machine_timer_init_obj, 1, machine_timer_init);
 
 
+static mp_obj_t machine_timer_get_stats(mp_obj_t self_in)
+{
+    machine_timer_obj_t *self = (machine_timer_obj_t *)self_in;
+
+    pthread_mutex_lock(&timer_lock);
+    uint32_t fire_count = self->fire_count;
+    uint32_t overrun_count = self->overrun_count;
+    uint32_t jitter_max_us = self->jitter_max_us;
+    uint32_t jitter_avg_us = 0;
+    if (fire_count) jitter_avg_us = (uint32_t)(self->jitter_sum_us / fire_count);
+    pthread_mutex_unlock(&timer_lock);
+
+    mp_obj_t stats = mp_obj_new_dict(4);
+    mp_obj_dict_store(stats, MP_OBJ_NEW_QSTR(MP_QSTR_fire_count), mp_obj_new_int_from_uint(fire_count));
+    mp_obj_dict_store(stats, MP_OBJ_NEW_QSTR(MP_QSTR_overrun_count), mp_obj_new_int_from_uint(overrun_count));
+    mp_obj_dict_store(stats, MP_OBJ_NEW_QSTR(MP_QSTR_jitter_avg_us), mp_obj_new_int_from_uint(jitter_avg_us));
+    mp_obj_dict_store(stats, MP_OBJ_NEW_QSTR(MP_QSTR_jitter_max_us), mp_obj_new_int_from_uint(jitter_max_us));
+
+    return stats;
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_1(machine_timer_get_stats_obj, machine_timer_get_stats);
+
+
+static mp_obj_t machine_timer_reset_stats(mp_obj_t self_in)
+{
+    machine_timer_obj_t *self = (machine_timer_obj_t *)self_in;
+
+    pthread_mutex_lock(&timer_lock);
+    self->fire_count = 0;
+    self->overrun_count = 0;
+    self->jitter_sum_us = 0;
+    self->jitter_max_us = 0;
+    pthread_mutex_unlock(&timer_lock);
+
+    return mp_const_none;
+}
+
+static MP_DEFINE_CONST_FUN_OBJ_1(machine_timer_reset_stats_obj, machine_timer_reset_stats);
+
+
 static const mp_rom_map_elem_t machine_timer_locals_dict_table[] = {
     { MP_ROM_QSTR(MP_QSTR___del__), MP_ROM_PTR(&machine_timer_del_obj) },
     { MP_ROM_QSTR(MP_QSTR_deinit), MP_ROM_PTR(&machine_timer_deinit_obj) },
     { MP_ROM_QSTR(MP_QSTR_init), MP_ROM_PTR(&machine_timer_init_obj) },
+    { MP_ROM_QSTR(MP_QSTR_get_stats), MP_ROM_PTR(&machine_timer_get_stats_obj) },
+    { MP_ROM_QSTR(MP_QSTR_reset_stats), MP_ROM_PTR(&machine_timer_reset_stats_obj) },
     { MP_ROM_QSTR(MP_QSTR_ONE_SHOT), MP_ROM_INT(false) },
     { MP_ROM_QSTR(MP_QSTR_PERIODIC), MP_ROM_INT(true) },
 };
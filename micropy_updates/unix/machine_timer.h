@@ -14,12 +14,20 @@
         bool active;
 
         uint8_t repeat;
-        uint16_t period;
-        uint16_t ms_ticks;
+        uint32_t period;  // milliseconds
         mp_obj_t callback;
 
+        uint64_t deadline;  // nanoseconds, CLOCK_MONOTONIC
+        int8_t heap_index;  // -1 when the timer is not scheduled
+
+        // how late the timer fired compared to when it was due
+        uint32_t fire_count;
+        uint32_t overrun_count;
+        uint64_t jitter_sum_us;
+        uint32_t jitter_max_us;
+
     } machine_timer_obj_t;
 
     void machine_timer_deinit_all(void);
 
-#endif // __MACHINE_TIMER_H__
\ No newline at end of file
+#endif // __MACHINE_TIMER_H__
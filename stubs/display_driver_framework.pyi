@@ -22,11 +22,90 @@ STATE_HIGH: int = ...
 STATE_LOW: int = ...
 STATE_PWM: int = ...
 
+MEMORY_PREFER_INTERNAL: int = ...
+MEMORY_PREFER_SPIRAM: int = ...
+MEMORY_INTERNAL_ONLY: int = ...
+MEMORY_SPIRAM_ONLY: int = ...
+
 _BufferType = Union[bytearray, memoryview, bytes, array.array]
 _PinType = Union[machine.Pin, int, io_expander_framework.Pin]
 _DatabusType = Union[lcd_bus.I80Bus, lcd_bus.I2CBus, lcd_bus.RGBBus, lcd_bus.SPIBus, lcd_bus.SDLBus]
 
 
+class FrameBufferLayout:
+    buffers: List[memoryview] = ...
+    size: int = ...
+    lines: int = ...
+    flags: Optional[int] = ...
+
+    def __init__(self, buffers: List[memoryview], size: int, lines: int, flags: Optional[int]):
+        ...
+
+    @property
+    def count(self) -> int:
+        ...
+
+    @property
+    def dma(self) -> bool:
+        ...
+
+    @property
+    def spiram(self) -> bool:
+        ...
+
+
+class FrameBufferStrategy:
+    size: Optional[int] = ...
+    lines: Optional[int] = ...
+    memory: int = ...
+    buffers: Optional[int] = ...
+    min_size: Optional[int] = ...
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        lines: Optional[int] = None,
+        memory: int = MEMORY_PREFER_INTERNAL,
+        buffers: Optional[int] = None,
+        min_size: Optional[int] = None
+    ):
+        ...
+
+    def get_sizes(self, width: int, height: int, color_size: int) -> Tuple[List[int], int]:
+        ...
+
+    def allocate(self, data_bus: _DatabusType, width: int, height: int, color_size: int) -> FrameBufferLayout:
+        ...
+
+
+class FrameBufferPool:
+    strategy: FrameBufferStrategy = ...
+    layout: Optional[FrameBufferLayout] = ...
+    displays: List["DisplayDriver"] = ...
+    timeout: int = ...
+
+    def __init__(self, strategy: Optional[FrameBufferStrategy] = None, timeout: int = 100):
+        ...
+
+    def acquire(self, display: "DisplayDriver", data_bus: _DatabusType, width: int, height: int, color_size: int) -> FrameBufferLayout:
+        ...
+
+    def release(self, display: "DisplayDriver") -> None:
+        ...
+
+    def wait(self, display: "DisplayDriver") -> bool:
+        ...
+
+    def flush(self, display: "DisplayDriver", last: bool) -> None:
+        ...
+
+    def flushed(self, display: "DisplayDriver") -> None:
+        ...
+
+    def rendered(self, display: "DisplayDriver") -> None:
+        ...
+
+
 class DisplayDriver:
     _INVON: ClassVar[int] = ...
     _INVOFF: ClassVar[int] = ...
@@ -96,12 +175,37 @@ class DisplayDriver:
     def get_displays() -> List["DisplayDriver"]:
         ...
 
+    @staticmethod
+    def set_frame_buffer_strategy(strategy: Optional[FrameBufferStrategy]) -> None:
+        ...
+
+    def get_frame_buffer_layout(self) -> Optional[FrameBufferLayout]:
+        ...
+
+    def invalidate_screen(self) -> None:
+        ...
+
+    def set_render_mode(self, render_mode: int, buffer_size: Optional[int] = None, buffer_count: Optional[int] = None) -> None:
+        ...
+
+    def get_render_mode(self) -> Tuple[Optional[int], int, int]:
+        ...
+
+    def _can_render_direct(self) -> bool:
+        ...
+
+    def set_native_flush(self, enable: bool) -> None:
+        ...
+
+    def is_native_flush(self) -> bool:
+        ...
+
     def __init__(
         self,
         data_bus: _DatabusType,
         display_width: int,
         display_height: int,
-        frame_buffer1: Optional[_BufferType] = None,
+        frame_buffer1: Optional[Union[_BufferType, FrameBufferStrategy, FrameBufferPool]] = None,
         frame_buffer2: Optional[_BufferType] = None,
         reset_pin: Optional[_PinType] = None,
         reset_state: int = STATE_HIGH,
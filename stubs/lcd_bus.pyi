@@ -206,6 +206,18 @@ class SDLBus:
     def poll_events(self):
         ...
 
+    def set_fps_limit(self, fps: int, /) -> None:
+        ...
+
+    def set_full_frame(self, full_frame: bool, /) -> None:
+        ...
+
+    def get_stats(self) -> dict:
+        ...
+
+    def reset_stats(self) -> None:
+        ...
+
 class RGBBus:
 
     def __init__(
@@ -342,6 +354,49 @@ class I80Bus:
         ...
 
 
+class FlushBridge:
+
+    def __init__(
+        self,
+        data_bus: Union[SPIBus, I80Bus, I2CBus, RGBBus, SDLBus],
+        display: Any,
+        address_window: tuple,
+        write_cmd: int,
+        /,
+        *,
+        offset_x: int = 0,
+        offset_y: int = 0
+    ):
+        ...
+
+    def __call__(self) -> None:
+        ...
+
+    def enable(self) -> None:
+        ...
+
+    def disable(self) -> None:
+        ...
+
+    def is_active(self) -> bool:
+        ...
+
+    def set_offset(self, x: int, y: int, /) -> None:
+        ...
+
+    def set_direct(self, direct: bool, /) -> None:
+        ...
+
+    def invalidate(self) -> None:
+        ...
+
+    def get_stats(self) -> tuple:
+        ...
+
+    def reset_stats(self) -> None:
+        ...
+
+
 def _pump_main_thread() -> None:
     ...
 
@@ -0,0 +1,57 @@
+# Copyright (c) 2024 - 2025 Kevin G. Schlosser
+
+from typing import Optional, List, Type
+
+import display_driver_framework
+
+
+class RenderTuneData(object):
+    render_mode: Optional[int] = ...
+    buffer_count: Optional[int] = ...
+    buffer_size: Optional[int] = ...
+    fps: Optional[float] = ...
+
+    def __init__(self, name: str):
+        ...
+
+    @property
+    def is_valid(self) -> bool:
+        ...
+
+    def save(self) -> None:
+        ...
+
+
+class TuneResult(object):
+    render_mode: int = ...
+    buffer_size: int = ...
+    buffer_count: int = ...
+    fps: float = ...
+    free_after_frame: int = ...
+
+    def __init__(self, render_mode: int, buffer_size: int, buffer_count: int):
+        ...
+
+    @property
+    def memory(self) -> int:
+        ...
+
+
+def tune(
+    display: display_driver_framework.DisplayDriver,
+    duration: int = 1000,
+    save: bool = True,
+    verbose: bool = True
+) -> List[TuneResult]:
+    ...
+
+
+def get_strategy(
+    display_class: Type[display_driver_framework.DisplayDriver],
+    memory: int = display_driver_framework.MEMORY_PREFER_INTERNAL
+) -> Optional[display_driver_framework.FrameBufferStrategy]:
+    ...
+
+
+def apply(display: display_driver_framework.DisplayDriver) -> bool:
+    ...
@@ -0,0 +1,98 @@
+# Copyright (c) 2024 - 2025 Kevin G. Schlosser
+
+# Checks which render modes are able to be used by a display. The functions
+# are taken from display_driver_framework.py and render_tune.py and run with
+# a fake lvgl module so no board is needed.
+
+import ast
+import os
+import types
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DISPLAY_DIR = os.path.join(
+    ROOT, 'api_drivers', 'py_api_drivers', 'frozen', 'display')
+
+_RGB565 = 2
+_RGB888 = 3
+
+_FULL = 1
+_DIRECT = 2
+_PARTIAL = 0
+
+_lv = types.SimpleNamespace(
+    COLOR_FORMAT=types.SimpleNamespace(RGB565=_RGB565, RGB888=_RGB888),
+    DISPLAY_RENDER_MODE=types.SimpleNamespace(
+        PARTIAL=_PARTIAL, FULL=_FULL, DIRECT=_DIRECT),
+    color_format_get_size=lambda color_space: color_space
+)
+
+
+def _load(file, names):
+    with open(os.path.join(DISPLAY_DIR, file), 'r') as f:
+        tree = ast.parse(f.read())
+
+    nodes = []
+    for node in ast.walk(tree):
+        if (
+            isinstance(node, (ast.FunctionDef, ast.ClassDef)) and
+            node.name in names
+        ):
+            nodes.append(node)
+
+    assert len(nodes) == len(names)
+
+    namespace = {'lv': _lv, '_PARTIAL_DIVIDERS': (1, 2, 4)}
+    for node in nodes:
+        exec(ast.unparse(node), namespace)
+    return namespace
+
+
+class _Display:
+
+    def __init__(self, fb_size, pool=None, byte_swap=False, color_space=_RGB565):
+        self.display_width = 320
+        self.display_height = 240
+        self._color_space = color_space
+        self._rgb565_byte_swap = byte_swap
+        self._fb_pool = pool
+        self._frame_buffer1 = bytearray(fb_size)
+        self._frame_buffer2 = None
+
+    _can_render_direct = _load(
+        'display_driver_framework.py', ('_can_render_direct',)
+    )['_can_render_direct']
+
+
+_FULL_SIZE = 320 * 240 * _RGB565
+
+
+@pytest.mark.parametrize('display, expected', [
+    (_Display(_FULL_SIZE), True),
+    (_Display(_FULL_SIZE, byte_swap=True), False),
+    (_Display(_FULL_SIZE, byte_swap=True, color_space=_RGB888), True),
+    (_Display(_FULL_SIZE, pool=object()), False)
+])
+def test_can_render_direct(display, expected):
+    assert display._can_render_direct() is expected
+
+
+def _candidates(display):
+    namespace = _load('render_tune.py', ('TuneResult', '_get_candidates'))
+    return [
+        (result.render_mode, result.buffer_size)
+        for result in namespace['_get_candidates'](display)
+    ]
+
+
+def test_candidates_skip_direct_for_a_pool():
+    modes = {mode for mode, _ in _candidates(_Display(_FULL_SIZE))}
+    assert modes == {_PARTIAL, _FULL, _DIRECT}
+
+    modes = {mode for mode, _ in _candidates(_Display(_FULL_SIZE, pool=object()))}
+    assert modes == {_PARTIAL, _FULL}
+
+
+def test_no_candidates_for_a_buffer_smaller_than_a_line():
+    assert _candidates(_Display(320 * _RGB565 - 1)) == []
@@ -0,0 +1,174 @@
+# Copyright (c) 2024 - 2025 Kevin G. Schlosser
+
+import multiprocessing
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'gen'))
+
+import gen_cache  # NOQA
+
+GENERATOR = os.path.join(ROOT, 'gen', 'python_api_gen_mpy.py')
+
+
+def _write(path, data):
+    with open(path, 'w') as f:
+        f.write(data)
+
+
+def _read(path):
+    with open(path, 'r') as f:
+        return f.read()
+
+
+def _cache(cache_dir, *parts):
+    return gen_cache.GenCache(str(cache_dir), GENERATOR, *parts)
+
+
+def test_key_follows_the_inputs(tmp_path):
+    assert _cache(tmp_path, 'a', ['b']).key == _cache(tmp_path, 'a', ['b']).key
+    assert _cache(tmp_path, 'a', ['b']).key != _cache(tmp_path, 'a', ['c']).key
+    # the parts are separated so moving text between them changes the key
+    assert _cache(tmp_path, 'ab', 'c').key != _cache(tmp_path, 'a', 'bc').key
+
+
+def test_disabled_cache(tmp_path):
+    cache = gen_cache.GenCache(None, GENERATOR, 'a')
+    assert not cache.enabled
+    assert not cache.restore({'output.c': str(tmp_path / 'output.c')})
+    assert cache.load('ast.pickle') is None
+
+
+def test_store_and_restore(tmp_path):
+    src = tmp_path / 'src.c'
+    dst = tmp_path / 'dst.c'
+    _write(src, 'generated')
+
+    cache = _cache(tmp_path / 'cache', 'a')
+    assert not cache.restore({'output.c': str(dst)})
+
+    cache.store({'output.c': str(src)})
+    assert cache.restore({'output.c': str(dst)})
+    assert _read(dst) == 'generated'
+
+    # a file that was not stored is a miss
+    assert not cache.restore({
+        'output.c': str(dst),
+        'metadata.json': str(tmp_path / 'metadata.json')
+    })
+
+
+def test_store_replaces_the_entry(tmp_path):
+    src = tmp_path / 'src.c'
+    dst = tmp_path / 'dst.c'
+    cache = _cache(tmp_path / 'cache', 'a')
+
+    _write(src, 'first')
+    cache.store({'output.c': str(src)})
+    _write(src, 'second')
+    cache.store({'output.c': str(src)})
+
+    assert cache.restore({'output.c': str(dst)})
+    assert _read(dst) == 'second'
+    assert os.listdir(tmp_path / 'cache') == [cache.key]
+
+
+def test_entry_that_goes_away_is_a_miss(tmp_path, monkeypatch):
+    src = tmp_path / 'src.c'
+    _write(src, 'generated')
+
+    cache = _cache(tmp_path / 'cache', 'a')
+    cache.store({'output.c': str(src)})
+
+    def copyfileobj(*_):
+        raise FileNotFoundError
+
+    monkeypatch.setattr(gen_cache.shutil, 'copyfileobj', copyfileobj)
+    assert not cache.restore({'output.c': str(tmp_path / 'dst.c')})
+
+
+def test_load_and_save(tmp_path):
+    cache = _cache(tmp_path / 'cache', 'a')
+    assert cache.load('ast.pickle') is None
+
+    cache.save('ast.pickle', {'nested': [1, 2, 3]})
+    assert cache.load('ast.pickle') == {'nested': [1, 2, 3]}
+
+
+def test_oldest_entries_get_removed(tmp_path):
+    src = tmp_path / 'src.c'
+    _write(src, 'generated')
+
+    keys = []
+    for i in range(gen_cache.MAX_ENTRIES + 3):
+        cache = _cache(tmp_path / 'cache', i)
+        cache.store({'output.c': str(src)})
+        # mtime has a coarse resolution on some file systems
+        os.utime(os.path.join(str(tmp_path / 'cache'), cache.key), (i, i))
+        keys.append(cache.key)
+
+    _cache(tmp_path / 'cache', 'last').store({'output.c': str(src)})
+
+    entries = os.listdir(tmp_path / 'cache')
+    assert len(entries) == gen_cache.MAX_ENTRIES
+    assert keys[0] not in entries
+
+
+def _store_loop(cache_dir, src_dir, count):
+    cache = _cache(cache_dir, 'shared')
+    for i in range(count):
+        letter = 'ab'[i % 2]
+        cache.store({
+            'output.c': os.path.join(src_dir, f'{letter}.c'),
+            'metadata.json': os.path.join(src_dir, f'{letter}.json')
+        })
+
+
+@pytest.mark.skipif(
+    'fork' not in multiprocessing.get_all_start_methods(),
+    reason='needs fork'
+)
+def test_restore_while_another_build_stores(tmp_path):
+    # every restore either misses or gets both files of the same store
+    src_dir = tmp_path / 'src'
+    src_dir.mkdir()
+    for letter in 'ab':
+        data = letter * 200000
+        _write(src_dir / f'{letter}.c', data)
+        _write(src_dir / f'{letter}.json', data)
+
+    cache_dir = tmp_path / 'cache'
+    cache = _cache(cache_dir, 'shared')
+    cache.store({
+        'output.c': str(src_dir / 'a.c'),
+        'metadata.json': str(src_dir / 'a.json')
+    })
+
+    ctx = multiprocessing.get_context('fork')
+    writer = ctx.Process(
+        target=_store_loop, args=(str(cache_dir), str(src_dir), 200))
+    writer.start()
+
+    files = {
+        'output.c': str(tmp_path / 'out.c'),
+        'metadata.json': str(tmp_path / 'out.json')
+    }
+
+    hits = 0
+    try:
+        while writer.is_alive():
+            if cache.restore(files):
+                output = _read(files['output.c'])
+                metadata = _read(files['metadata.json'])
+                assert len(output) == 200000
+                assert output == metadata
+                hits += 1
+    finally:
+        writer.join()
+
+    assert writer.exitcode == 0
+    assert cache.restore(files)
+    assert not [name for name in os.listdir(cache_dir) if name.endswith('.tmp')]
@@ -0,0 +1,117 @@
+# Copyright (c) 2024 - 2025 Kevin G. Schlosser
+
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'gen'))
+
+import gen_prune  # NOQA
+
+
+def _write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(data)
+    return str(path)
+
+
+def test_python_sources_and_folders(tmp_path):
+    main = _write(tmp_path / 'main.py', 'import lvgl as lv\nlv.button(scrn)\n')
+    _write(tmp_path / 'app' / 'ui.py', '# uses lv.chart\n')
+    _write(tmp_path / 'app' / 'notes.md', 'slider\n')
+
+    pruner = gen_prune.Pruner([main, str(tmp_path / 'app')])
+
+    assert pruner.is_used('button')
+    # comments are scanned as well
+    assert pruner.is_used('chart')
+    # only Python files are scanned in a folder
+    assert not pruner.is_used('slider')
+    assert len(pruner.files) == 2
+
+
+def test_allow_list(tmp_path):
+    names = _write(tmp_path / 'names.txt', (
+        '# widgets that get created from a string\n'
+        'label\n'
+        'chart*  # every chart function\n'
+        '\n'
+    ))
+
+    pruner = gen_prune.Pruner([names])
+
+    assert pruner.is_used('label')
+    assert pruner.is_used('chart_set_type')
+    assert not pruner.is_used('slider')
+
+
+def test_manifest(tmp_path):
+    _write(tmp_path / 'frozen' / 'display.py', 'lv.label\n')
+    _write(tmp_path / 'frozen' / 'pkg' / 'keyboard.py', 'lv.keyboard\n')
+    _write(tmp_path / 'lib' / 'spinner.py', 'lv.spinner\n')
+    _write(tmp_path / 'other' / 'manifest.py', "module('roller.py')\n")
+    _write(tmp_path / 'other' / 'roller.py', 'lv.roller\n')
+    _write(tmp_path / 'port.py', 'lv.slider\n')
+
+    manifest = _write(tmp_path / 'manifest.py', (
+        "freeze('frozen', 'display.py')\n"
+        "package('pkg', base_path='frozen')\n"
+        "module('spinner.py', base_path='lib')\n"
+        "include('other')\n"
+        "freeze('$(PORT_DIR)/modules')\n"
+    ))
+
+    pruner = gen_prune.Pruner([manifest])
+
+    for name in ('label', 'keyboard', 'spinner', 'roller'):
+        assert pruner.is_used(name), name
+
+    assert not pruner.is_used('slider')
+    assert pruner.missing == []
+
+
+def test_keep_and_report(tmp_path):
+    main = _write(tmp_path / 'main.py', 'lv.button\n')
+    report = str(tmp_path / 'build' / 'report.txt')
+
+    pruner = gen_prune.Pruner([main, str(tmp_path / 'missing.py')], report)
+
+    assert pruner.keep('widgets', 'lv_button_create', 'button')
+    assert not pruner.keep('widgets', 'lv_chart_create', 'chart')
+    assert pruner.missing == [str(tmp_path / 'missing.py')]
+
+    pruner.write_report()
+
+    with open(report, 'r') as f:
+        data = f.read()
+
+    assert data.startswith('LVGL binding pruning: 1 kept, 1 dropped')
+    assert str(tmp_path / 'missing.py') in data
+    assert '    lv_chart_create (chart)' in data
+
+
+def test_key_follows_the_names(tmp_path):
+    first = _write(tmp_path / 'first.py', 'lv.button\nlv.label\n')
+    second = _write(tmp_path / 'second.py', 'lv.label\nlv.button\n')
+    third = _write(tmp_path / 'third.py', 'lv.chart\n')
+
+    key = gen_prune.Pruner([first]).key()
+    assert key == gen_prune.Pruner([second]).key()
+    assert key != gen_prune.Pruner([first, third]).key()
+
+
+def test_write_spec_and_load(tmp_path, monkeypatch):
+    main = _write(tmp_path / 'main.py', 'lv.button\n')
+    spec_path = str(tmp_path / 'build' / 'prune.json')
+    report = str(tmp_path / 'build' / 'report.txt')
+
+    monkeypatch.delenv(gen_prune.PRUNE_ENV, raising=False)
+    assert gen_prune.load() is None
+
+    gen_prune.write_spec(spec_path, [main], report)
+    monkeypatch.setenv(gen_prune.PRUNE_ENV, spec_path)
+
+    pruner = gen_prune.load()
+    assert pruner.files == [main]
+    assert pruner.report_path == report
+    assert pruner.is_used('button')
@@ -0,0 +1,237 @@
+# Copyright (c) 2024 - 2025 Kevin G. Schlosser
+
+# Runs every display init module before and after it gets converted by
+# builder/init_table.py and checks that the same commands, params and
+# delays get sent. run_init_table is taken from display_driver_framework.py
+# so the tables are read the same way they are on the board.
+
+import ast
+import os
+import sys
+import types
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from builder import init_table  # NOQA
+
+DISPLAY_DIR = os.path.join(ROOT, 'api_drivers', 'common_api_drivers', 'display')
+FRAMEWORK_PATH = os.path.join(
+    ROOT, 'api_drivers', 'py_api_drivers', 'frozen', 'display',
+    'display_driver_framework.py'
+)
+
+
+def _init_modules():
+    paths = []
+    for root, dirs, files in os.walk(DISPLAY_DIR):
+        dirs.sort()
+        for file in sorted(files):
+            if init_table.is_init_module(file):
+                paths.append(os.path.join(root, file))
+    return paths
+
+
+def _run_init_table_source():
+    with open(FRAMEWORK_PATH, 'r') as f:
+        source = f.read()
+
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.FunctionDef) and node.name == 'run_init_table':
+            return ast.unparse(node)
+
+    raise AssertionError('run_init_table not found')
+
+
+class _Pin:
+
+    def value(self, *_):
+        return 0
+
+
+class _Bytearray(bytearray):
+    # MicroPython keeps the low byte of a value that is too large
+
+    def __setitem__(self, index, value):
+        if isinstance(value, int):
+            value &= 0xFF
+        super().__setitem__(index, value)
+
+
+class _I80Bus:
+
+    def __init__(self, events=None):
+        self.events = events
+
+    def get_lane_count(self):
+        return 8
+
+    def tx_param(self, cmd, params=None):
+        self.events.append(('cmd', cmd, None if params is None else bytes(params)))
+
+
+class _SPIBus(_I80Bus):
+    pass
+
+
+class _Driver:
+    # only has what the init modules use
+    _ORIENTATION_TABLE = (0x00, 0x60, 0xC0, 0xA0)
+    _INVOFF = 0x20
+
+    def __init__(self, events, run_init_table):
+        self.events = events
+        self._run_init_table = run_init_table
+
+        self._param_buf = _Bytearray(64)
+        self._param_mv = memoryview(self._param_buf)
+        self._color_space = 2
+        self._color_byte_order = 0
+        self._data_bus = _I80Bus(events)
+        self._wait_pin = _Pin()
+        self._power_pin = None
+        self._reset_pin = None
+        self._rgb565_byte_swap = False
+        self.display_width = 320
+        self.display_height = 240
+        self.width = 320
+        self.height = 240
+
+    def run_init_table(self, table):
+        self._run_init_table(self, table)
+
+    def set_params(self, cmd, params=None):
+        self.events.append(('cmd', cmd, None if params is None else bytes(params)))
+
+    def _write_reg(self, reg, param):
+        self._param_buf[0] = param
+        self.set_params(reg, self._param_mv[:1])
+
+    def reset(self):
+        self.events.append(('reset',))
+
+    def _madctl(self, colormode, rotations, rotation=None):
+        return (colormode | rotations[0]) & 0xFF
+
+
+def _fake_modules(events):
+    def sleep_ms(ms):
+        events.append(('sleep', ms))
+
+    def sleep_us(us):
+        # the tables round up to milliseconds
+        events.append(('sleep', (us + 999) // 1000))
+
+    micropython = types.ModuleType('micropython')
+    micropython.const = lambda value: value
+
+    time = types.ModuleType('time')
+    time.sleep_ms = sleep_ms
+    time.sleep_us = sleep_us
+
+    lvgl = types.ModuleType('lvgl')
+    lvgl.color_format_get_size = lambda color_space: color_space
+    lvgl.COLOR_FORMAT = types.SimpleNamespace(RGB565=2, RGB888=3)
+
+    lcd_bus = types.ModuleType('lcd_bus')
+    lcd_bus.I80Bus = _I80Bus
+    lcd_bus.SPIBus = _SPIBus
+
+    return {
+        'micropython': micropython,
+        'time': time,
+        'lvgl': lvgl,
+        'lcd_bus': lcd_bus
+    }
+
+
+def _merge_sleeps(events):
+    # a table puts the delays of sleeps that follow each other together
+    merged = []
+    for event in events:
+        if event[0] == 'sleep':
+            if not event[1]:
+                continue
+            if merged and merged[-1][0] == 'sleep':
+                merged[-1] = ('sleep', merged[-1][1] + event[1])
+                continue
+        merged.append(event)
+    return merged
+
+
+def _run(source, path, monkeypatch):
+    events = []
+
+    for name, module in _fake_modules(events).items():
+        monkeypatch.setitem(sys.modules, name, module)
+
+    # some init modules import a module that is next to them
+    monkeypatch.syspath_prepend(os.path.dirname(path))
+    for name in list(sys.modules.keys()):
+        if name.startswith('_') and name.endswith('_init'):
+            monkeypatch.delitem(sys.modules, name)
+
+    table_globals = {'time': sys.modules['time'], 'INIT_TABLE_DELAY': init_table.INIT_TABLE_DELAY}
+    exec(_run_init_table_source(), table_globals)
+
+    module_globals = {'__name__': '_init_module', 'bytearray': _Bytearray}
+    exec(compile(source, '<init>', 'exec'), module_globals)
+
+    module_globals['init'](_Driver(events, table_globals['run_init_table']))
+    return _merge_sleeps(events)
+
+
+@pytest.mark.parametrize(
+    'path', _init_modules(), ids=lambda path: os.path.relpath(path, DISPLAY_DIR))
+def test_converted_module_sends_the_same_sequence(path, monkeypatch):
+    with open(path, 'r') as f:
+        source = f.read()
+
+    converted = init_table.convert(source)
+    if converted is None:
+        pytest.skip('nothing to convert')
+
+    assert 'self.run_init_table(' in converted
+    expected = _run(source, path, monkeypatch)
+    assert any(event[0] == 'cmd' for event in expected)
+    assert _run(converted, path, monkeypatch) == expected
+
+
+def test_entry_layout():
+    source = (
+        'import time\n'
+        'def init(self):\n'
+        '    self.set_params(0x11)\n'
+        '    time.sleep_ms(120)\n'
+        '    self.set_params(0x3A, bytearray([0x55]))\n'
+    )
+
+    converted = init_table.convert(source)
+    assert converted is not None
+
+    table = ast.literal_eval(
+        '(' + converted.split('self.run_init_table(')[1].rsplit(')', 1)[0] + ')')
+    assert table == (
+        b'\x00\x11\x00\x00\x78' +
+        b'\x00\x3A\x01\x55\x00\x00'
+    )
+
+
+def test_dynamic_values_stay_python():
+    source = (
+        'def init(self):\n'
+        '    self.set_params(0x11)\n'
+        '    self._param_buf[0] = self.display_width\n'
+        '    self.set_params(0x2A, self._param_mv[:1])\n'
+    )
+
+    converted = init_table.convert(source)
+    assert 'self.run_init_table(' in converted
+    assert 'self._param_buf[0] = self.display_width' in converted
+
+
+def test_nothing_to_convert():
+    assert init_table.convert('def init(self):\n    self.reset()\n') is None
+    assert init_table.convert('# no init function\n') is None
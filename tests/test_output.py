@@ -0,0 +1,161 @@
+# Copyright (c) 2024 - 2025 Kevin G. Schlosser
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import builder  # NOQA
+from builder import output  # NOQA
+
+
+@pytest.mark.parametrize('text, expected', [
+    (
+        'src/main.c:12:5: error: expected \';\' before \'}\' token',
+        ('error', 'src/main.c', 12, 'expected \';\' before \'}\' token')
+    ),
+    (
+        'lib/lvgl/src/core/lv_obj.c:42: warning: unused variable \'x\'',
+        ('warning', 'lib/lvgl/src/core/lv_obj.c', 42, 'unused variable \'x\'')
+    ),
+    (
+        'main.c:1:10: fatal error: lvgl.h: No such file or directory',
+        ('fatal error', 'main.c', 1, 'lvgl.h: No such file or directory')
+    ),
+    (
+        'C:\\build\\lv_binding.c:7:1: error: unknown type name',
+        ('error', 'C:\\build\\lv_binding.c', 7, 'unknown type name')
+    ),
+    (
+        'Error: the board is not supported',
+        ('error', None, None, 'the board is not supported')
+    ),
+    (
+        'cc1: warning: command line option is not valid',
+        None
+    )
+])
+def test_error_sink_parses_the_line(text, expected):
+    sink = output.ErrorSink()
+    sink.line(text, True)
+
+    found = sink.errors + sink.warnings
+    if expected is None:
+        assert found == []
+    else:
+        assert found == [expected]
+        if expected[0] == 'warning':
+            assert sink.errors == []
+        else:
+            assert sink.warnings == []
+
+
+@pytest.mark.parametrize('text', [
+    'In file included from src/main.c:3:',
+    'src/main.c:12:5: note: declared here',
+    '[ 42%] Building C object lv_obj.c.obj',
+    'CC build/lv_obj.o'
+])
+def test_error_sink_skips_other_lines(text):
+    sink = output.ErrorSink()
+    sink.line(text, False)
+    assert sink.errors == []
+    assert sink.warnings == []
+
+
+def test_log_sink(tmp_path):
+    path = tmp_path / 'build.log'
+
+    sink = output.LogSink(str(path))
+    sink.command('make all')
+    sink.line('CC main.c', False)
+    sink.line('main.c:1: warning: x', True)
+    sink.close()
+
+    assert path.read_text() == (
+        '$ make all\n'
+        'CC main.c\n'
+        'E: main.c:1: warning: x\n'
+    )
+
+
+def test_screen_sink_writes_progress_over_itself(capsys):
+    sink = output.ScreenSink(True)
+    sink.line('[1/3] Building lv_obj.c', False)
+    sink.line('[2/3] lv.c', False)
+    sink.line('all done', False)
+    sink.close()
+
+    assert capsys.readouterr().out == (
+        '[1/3] Building lv_obj.c'
+        '\r[2/3] lv.c' + ' ' * 13 +
+        '\nall done\n'
+    )
+
+
+def test_screen_sink_ends_the_progress_line_for_errors(capsys):
+    sink = output.ScreenSink(True)
+    sink.line('[1/3] Building lv_obj.c', False)
+    sink.line('lv_obj.c:1: error: x', True)
+    sink.close()
+
+    captured = capsys.readouterr()
+    assert captured.out == '[1/3] Building lv_obj.c\n'
+    assert captured.err == 'lv_obj.c:1: error: x\n'
+
+
+def _script(tmp_path, source):
+    path = tmp_path / 'script.py'
+    path.write_text(source)
+    return [sys.executable, str(path)]
+
+
+def _process_output(cmd):
+    collect = output.CollectSink()
+    errors = output.ErrorSink()
+
+    proc = subprocess.Popen(
+        cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    builder.process_output(proc, [collect, errors])
+
+    return proc, collect, errors
+
+
+def test_process_output_splits_the_chunks_into_lines(tmp_path):
+    # a line that is split between writes and more output than one read
+    cmd = _script(tmp_path, (
+        'import sys\n'
+        'sys.stdout.write("first ")\n'
+        'sys.stdout.flush()\n'
+        'sys.stdout.write("line\\n\\n")\n'
+        'for i in range(20000):\n'
+        '    sys.stdout.write(f"line {i}\\n")\n'
+        'sys.stdout.flush()\n'
+        'sys.stderr.write("main.c:3:1: error: broken\\n")\n'
+        'sys.stdout.write("no line ending")\n'
+        'sys.exit(2)\n'
+    ))
+
+    proc, collect, errors = _process_output(cmd)
+
+    assert proc.returncode == 2
+    assert collect.lines[0] == 'first line'
+    assert collect.lines[1:20001] == [f'line {i}' for i in range(20000)]
+    assert sorted(collect.lines[20001:]) == [
+        'main.c:3:1: error: broken', 'no line ending'
+    ]
+    assert errors.errors == [('error', 'main.c', 3, 'broken')]
+
+
+def test_process_output_keeps_lines_that_are_not_utf8(tmp_path):
+    cmd = _script(tmp_path, (
+        'import sys\n'
+        'sys.stdout.buffer.write(b"bad \\xff byte\\n")\n'
+    ))
+
+    _, collect, _ = _process_output(cmd)
+    assert collect.lines == ['bad  byte']
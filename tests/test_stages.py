@@ -0,0 +1,98 @@
+# Copyright (c) 2024 - 2025 Kevin G. Schlosser
+
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from builder import stages  # NOQA
+
+
+@pytest.fixture
+def build_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(stages, 'INCREMENTAL', True)
+    monkeypatch.setattr(stages, '_state', None)
+    monkeypatch.setattr(stages, '_timings', [])
+    monkeypatch.setattr(stages, '_trace_events', [])
+    return tmp_path
+
+
+def _runs(name, calls, **kwargs):
+    stages.run(name, lambda: calls.append(name), **kwargs)
+    return len(calls)
+
+
+def test_stage_is_skipped_when_nothing_changed(build_dir):
+    (build_dir / 'input.txt').write_text('a')
+    calls = []
+
+    assert _runs('stage', calls, paths=('input.txt',), values=(1,)) == 1
+    assert _runs('stage', calls, paths=('input.txt',), values=(1,)) == 1
+    assert _runs('stage', calls, paths=('input.txt',), values=(2,)) == 2
+
+    (build_dir / 'input.txt').write_text('ab')
+    assert _runs('stage', calls, paths=('input.txt',), values=(2,)) == 3
+
+    # a missing output makes the stage run
+    assert _runs('stage', calls, values=(2,), outputs=('output.txt',)) == 4
+    assert _runs('stage', calls, values=(2,), outputs=('output.txt',)) == 5
+
+    assert _runs('stage', calls, values=(2,), always=True) == 6
+
+
+def test_failed_stage_removes_the_fingerprints(build_dir):
+    calls = []
+    assert _runs('first', calls) == 1
+
+    def fail():
+        raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        stages.run('second', fail)
+
+    assert _runs('first', calls) == 2
+
+
+def _git(*args):
+    subprocess.check_call(
+        ['git', '-c', 'user.name=test', '-c', 'user.email=test@test'] +
+        list(args),
+        stdout=subprocess.DEVNULL
+    )
+
+
+def _pin_submodule(sha):
+    _git('update-index', '--add', '--cacheinfo', f'160000,{sha},lib/sub')
+    _git('commit', '-q', '-m', sha)
+
+
+@pytest.mark.skipif(shutil.which('git') is None, reason='needs git')
+def test_moved_submodule_runs_the_stage(build_dir):
+    _git('init', '-q')
+    (build_dir / 'lib').mkdir()
+    (build_dir / 'lib' / 'lv_conf.h').write_text('')
+    _git('add', 'lib/lv_conf.h')
+    _pin_submodule('1' * 40)
+
+    revisions = stages.submodule_revisions()
+    assert revisions == (('lib/sub', '1' * 40),)
+
+    calls = []
+    assert _runs('submodules', calls, values=(revisions,)) == 1
+    assert _runs(
+        'submodules', calls, values=(stages.submodule_revisions(),)) == 1
+
+    _pin_submodule('2' * 40)
+    assert _runs(
+        'submodules', calls, values=(stages.submodule_revisions(),)) == 2
+
+
+def test_no_git_repository(build_dir, monkeypatch):
+    monkeypatch.setenv('GIT_CEILING_DIRECTORIES', str(build_dir.parent))
+    assert stages.submodule_revisions() is None